@@ -14,7 +14,9 @@ from app.core.config import settings
 
 # Import all models to ensure they are loaded and registered with Base.metadata
 # This is necessary for autogenerate to work properly
-from app.db.models import profile  # noqa: F401
+from app.db.models import profile, project  # noqa: F401
+from app.db import change_log  # noqa: F401
+from app.db.fingerprint import fingerprint_table, metadata_fingerprint, write_fingerprint
 
 # Import other models as needed
 # from app.db.models import other_model  # noqa: F401
@@ -31,12 +33,17 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the schema fingerprint table (written at startup, not modelled) out of autogenerate."""
+    return not (type_ == "table" and name == fingerprint_table.name)
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -56,11 +63,15 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection, 
             target_metadata=target_metadata,
+            include_object=include_object,
             compare_type=True
         )
 
         with context.begin_transaction():
             context.run_migrations()
+            # Record the migrated schema so application startup can skip create_all
+            revision = context.get_context().get_current_revision()
+            write_fingerprint(connection, metadata_fingerprint(target_metadata, revision), revision)
 
 if context.is_offline_mode():
     run_migrations_offline()
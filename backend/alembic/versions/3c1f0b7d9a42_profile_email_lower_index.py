@@ -0,0 +1,27 @@
+"""Index profiles on lower(email)
+
+The model's idx_profile_email_lower was declared on lower('email'), a
+constant, so databases built with create_all allowed a single profile.
+
+Revision ID: 3c1f0b7d9a42
+Revises: 87e225cfab7e
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f0b7d9a42'
+down_revision = '87e225cfab7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP INDEX IF EXISTS idx_profile_email_lower")
+    op.execute("CREATE UNIQUE INDEX idx_profile_email_lower ON profiles (lower(email))")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_profile_email_lower")
@@ -0,0 +1,42 @@
+"""Add the change log behind GET /api/v1/changes
+
+Revision ID: 5d2e8a41c7b3
+Revises: 3c1f0b7d9a42
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a41c7b3'
+down_revision = '3c1f0b7d9a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # AUTOINCREMENT on SQLite: compaction deletes entries, and versions must never be reused
+    op.create_table('change_log',
+    sa.Column('version', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resource', sa.String(length=20), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('version'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_change_log_resource', 'change_log', ['resource', 'resource_id'], unique=True)
+    # Log every existing row as created, so a client syncing from version 0 gets the whole catalog.
+    # Seeding here, once, keeps concurrent worker startups from racing to do it.
+    for resource in ('projects', 'profiles'):
+        op.execute(
+            f"INSERT INTO change_log (resource, resource_id, op) "
+            f"SELECT '{resource}', id, 'create' FROM {resource} ORDER BY id"
+        )
+
+
+def downgrade():
+    op.drop_index('ix_change_log_resource', table_name='change_log')
+    op.drop_table('change_log')
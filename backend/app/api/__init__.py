@@ -1,10 +1,18 @@
-from fastapi import APIRouter
+from typing import Any
 
-# Create main API router
-api_router = APIRouter()
 
-# Import and include the v1 API router
-from .v1 import api_router as v1_router
+def __getattr__(name: str) -> Any:
+    # Build the combined /api router only when it is asked for, so importing a
+    # submodule such as app.api.v1.api does not construct every route twice
+    if name == "api_router":
+        from fastapi import APIRouter
 
-# Mount the v1 API router with the /api prefix
-api_router.include_router(v1_router, prefix="/v1")
+        # Import and include the v1 API router
+        from .v1 import api_router as v1_router
+
+        # Create main API router and mount the v1 API router with the /api prefix
+        api_router = APIRouter()
+        api_router.include_router(v1_router, prefix="/v1")
+        globals()["api_router"] = api_router
+        return api_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
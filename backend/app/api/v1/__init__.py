@@ -1,17 +1,26 @@
-from fastapi import APIRouter
+from typing import Any
 
-# Import all route modules
-from .routes import health, profile, projects
 
-# Create the API router for v1
-api_router = APIRouter(tags=["v1"])
+def __getattr__(name: str) -> Any:
+    # Built on first access; app.main uses app.api.v1.api.api_router instead
+    if name == "api_router":
+        from fastapi import APIRouter
 
-# Include all v1 endpoints
-api_router.include_router(health.router, prefix="/health", tags=["Health"])
-api_router.include_router(profile.router, prefix="/profile", tags=["Profile"])
-api_router.include_router(projects.router, prefix="/projects", tags=["Projects"])
+        # Import all route modules
+        from .routes import health, profile, projects
 
-# This will create the following endpoints:
-# GET /api/v1/health
-# GET /api/v1/profile
-# GET /api/v1/projects
+        # Create the API router for v1
+        api_router = APIRouter(tags=["v1"])
+
+        # Include all v1 endpoints
+        api_router.include_router(health.router, prefix="/health", tags=["Health"])
+        api_router.include_router(profile.router, prefix="/profile", tags=["Profile"])
+        api_router.include_router(projects.router, prefix="/projects", tags=["Projects"])
+
+        # This will create the following endpoints:
+        # GET /api/v1/health
+        # GET /api/v1/profile
+        # GET /api/v1/projects
+        globals()["api_router"] = api_router
+        return api_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
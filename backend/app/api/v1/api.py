@@ -1,6 +1,5 @@
 from fastapi import APIRouter
-from .routes import health, profile
-from .endpoints import projects  # Keep other endpoint imports as is
+from .routes import batch, changes, debug, events, health, metrics, portfolio, profile, projects
 
 # Create the API router for v1
 api_router = APIRouter(tags=["v1"])
@@ -10,8 +9,20 @@ api_router.include_router(health.router, prefix="/health", tags=["Health"])
 # Include the profile router from routes
 api_router.include_router(profile.router, prefix="/profile", tags=["Profile"])
 api_router.include_router(projects.router, prefix="/projects", tags=["Projects"])
+api_router.include_router(portfolio.router, prefix="/portfolio", tags=["Portfolio"])
+api_router.include_router(changes.router, prefix="/changes", tags=["Changes"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+api_router.include_router(debug.router, prefix="/debug", tags=["Debug"])
 
 # This will create the following endpoints:
 # GET /api/v1/health
 # GET /api/v1/profile
 # GET /api/v1/projects
+# GET /api/v1/portfolio
+# GET /api/v1/changes?since=<version>
+# GET /api/v1/events (Server-Sent Events)
+# POST /api/v1/batch
+# GET /api/v1/metrics
+# GET /api/v1/debug/profiles (admin)
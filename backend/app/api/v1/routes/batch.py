@@ -0,0 +1,147 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_db, shared_session
+from app.schemas.batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+from app.schemas.profile import ErrorResponse
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Request headers passed on to every sub-request
+FORWARDED_HEADERS = {b"host", b"authorization", b"x-api-key", b"x-forwarded-for", b"user-agent"}
+# Response headers reported back for every sub-response
+RETURNED_HEADERS = {"content-type", "etag", "cache-control", "location", "retry-after", "x-ratelimit-remaining"}
+
+
+def sub_request_scope(request: Request, item: BatchRequestItem) -> Dict[str, Any]:
+    path, _, query = item.path.partition("?")
+    parent = request.scope
+    headers = [(name, value) for name, value in parent["headers"] if name in FORWARDED_HEADERS]
+    headers.append((b"accept", b"application/json"))
+    return {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": item.method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": {},
+    }
+
+
+def error_item(item: BatchRequestItem, status_code: int, error: str, error_code: str) -> BatchResponseItem:
+    return BatchResponseItem(
+        id=item.id,
+        status=status_code,
+        headers={"content-type": "application/json"},
+        body={"success": False, "error": error, "error_code": error_code, "details": item.path},
+    )
+
+
+async def run_sub_request(request: Request, item: BatchRequestItem) -> BatchResponseItem:
+    """Run one sub-request through the full application and capture its response."""
+    start: Optional[Dict[str, Any]] = None
+    chunks: List[bytes] = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses stop once they see the client is gone
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal start
+        if message["type"] == "http.response.start":
+            start = message
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(sub_request_scope(request, item), receive, send)
+    except Exception as e:
+        # The server error handler has usually sent a 500 before re-raising
+        logger.error(f"Batch sub-request {item.path} failed: {str(e)}", exc_info=True)
+        if start is None:
+            return error_item(item, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error", "internal_server_error")
+
+    headers = {
+        name.decode("latin-1").lower(): value.decode("latin-1")
+        for name, value in start.get("headers", [])
+        if name.decode("latin-1").lower() in RETURNED_HEADERS
+    }
+    body: Any = b"".join(chunks)
+    if headers.get("content-type", "").startswith("application/json") and body:
+        body = json.loads(body)
+    else:
+        body = body.decode("utf-8", errors="replace") or None
+    return BatchResponseItem(id=item.id, status=start["status"], headers=headers, body=body)
+
+
+@router.post(
+    "/",
+    response_model=BatchResponse,
+    responses={
+        200: {"description": "Sub-requests executed; each carries its own status"},
+        400: {"model": ErrorResponse, "description": "Too many sub-requests"}
+    },
+    summary="Run several read requests in one exchange"
+)
+async def batch(payload: BatchRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    Run several GET sub-requests in one HTTP exchange.
+
+    Sub-requests run in order through the full application (authentication,
+    rate limiting, caching) and share this request's database session, so a
+    page that needs the profile and several projects costs one round trip and
+    one connection checkout. Each result carries its own status, selected
+    headers and decoded body.
+
+    Only paths under the v1 API are allowed, and batches cannot be nested.
+    """
+    if len(payload.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "success": False,
+                "error": "Too many sub-requests",
+                "error_code": "batch_too_large",
+                "details": {"max_requests": settings.BATCH_MAX_REQUESTS}
+            }
+        )
+
+    api_prefix = settings.API_V1_STR + "/"
+    batch_path = request.url.path.rstrip("/")
+    responses = []
+    with shared_session(db):
+        for item in payload.requests:
+            path = item.path.partition("?")[0]
+            if not path.startswith(api_prefix) or path.rstrip("/") == batch_path:
+                responses.append(error_item(item, status.HTTP_400_BAD_REQUEST, "Invalid sub-request path", "invalid_path"))
+                continue
+            response = await run_sub_request(request, item)
+            if response.status in (307, 308) and "location" in response.headers:
+                # Follow the trailing-slash redirect in-process instead of returning it
+                location = urlsplit(response.headers["location"])
+                redirected = item.model_copy(update={"path": location.path + ("?" + location.query if location.query else "")})
+                response = await run_sub_request(request, redirected)
+            if response.status >= 500:
+                # Leave the shared session usable for the remaining sub-requests
+                db.rollback()
+            responses.append(response)
+    return BatchResponse(responses=responses)
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.change_log import is_recording, read_changes
+from app.db.session import get_db
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/", response_model=Dict[str, Any], summary="Changes since a version")
+def read_changes_since(
+    since: int = Query(0, ge=0, description="High-water mark from the previous response; 0 for everything"),
+    limit: int = Query(settings.CHANGE_FEED_PAGE_SIZE, ge=1, le=1000, description="Maximum number of changes to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Projects and profiles created, updated or deleted after version `since`.
+
+    Each change is `{"version", "resource", "id", "op", "data"}`: `data` is the
+    current row, or null for a delete (a tombstone). Pass the response's
+    `version` as `since` on the next call; while `has_more` is true there are
+    more changes to fetch right away. A `version` lower than `since` means the
+    log was reset, and the client should sync from 0.
+    """
+    if not is_recording(db):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "success": False,
+                "error": "Change feed is disabled",
+                "error_code": "CHANGE_FEED_DISABLED",
+                "details": None
+            }
+        )
+    try:
+        changes, version, has_more = read_changes(db, since=since, limit=limit)
+    except Exception as e:
+        logger.error(f"Error reading changes since {since}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "success": False,
+                "error": "Failed to read changes",
+                "error_code": "CHANGE_FEED_ERROR",
+                "details": str(e)
+            }
+        )
+    return {"changes": changes, "version": version, "has_more": has_more}
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.profiling import ProfileStore, get_profile_store, is_admin_token
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Reject callers without the configured ``ADMIN_TOKEN`` in ``X-Admin-Token``."""
+    if not is_admin_token(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "success": False,
+                "error": "Admin token required",
+                "error_code": "ADMIN_REQUIRED",
+                "details": None,
+            },
+        )
+
+
+@router.get("/profiles", response_model=List[Dict[str, Any]], summary="List request profiles", dependencies=[Depends(require_admin)])
+def list_profiles(store: ProfileStore = Depends(get_profile_store)) -> List[Dict[str, Any]]:
+    """
+    List the stored request profiles, newest first.
+
+    Capture one by sending ``X-Profile: 1`` (or ``?_profile=1``) together with
+    ``X-Admin-Token``; the response carries the capture id in ``X-Profile-Id``.
+    """
+    return store.list()
+
+
+@router.get("/profiles/{capture_id}", summary="Download a request profile", dependencies=[Depends(require_admin)])
+def download_profile(capture_id: str, store: ProfileStore = Depends(get_profile_store)):
+    """Download a capture's call stacks in collapsed-stack format, ready for flamegraph tools."""
+    path = store.path(capture_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "error": "Profile not found",
+                "error_code": "PROFILE_NOT_FOUND",
+                "details": capture_id,
+            },
+        )
+    return FileResponse(path, media_type="text/plain", filename=f"{capture_id}.collapsed")
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core.events import get_broadcaster
+
+router = APIRouter()
+
+
+@router.get("/", summary="Stream project and profile changes")
+async def stream_events(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of committed project and profile changes.
+
+    Each `change` event carries `{"resource", "id", "op", "version"}`, where
+    `version` matches the change feed (`/api/v1/changes`) when it is enabled.
+    Comment lines are sent as heartbeats while nothing changes. Reconnect with
+    the `Last-Event-ID` header (browsers' `EventSource` does this
+    automatically) to receive the events missed in between. A `reset` event
+    means they are no longer available and the client should resync.
+    """
+    broadcaster = get_broadcaster()
+    if broadcaster is None or broadcaster.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "success": False,
+                "error": "Event stream unavailable" if broadcaster is None else "Too many event subscribers",
+                "error_code": "EVENTS_UNAVAILABLE",
+                "details": None
+            },
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        broadcaster.stream(last_event_id),
+        media_type="text/event-stream",
+        # Proxies must neither cache nor buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
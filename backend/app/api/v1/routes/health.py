@@ -1,7 +1,15 @@
 from fastapi import APIRouter
 
+from app.core.metrics import threadpool_stats
+from app.db.pool import pool_stats
+
 router = APIRouter()
 
 @router.get("/")
-def health():
-    return {"status": "ok"}
+async def health():
+    # Async so the check itself never waits on (or occupies) the sync threadpool
+    return {
+        "status": "ok",
+        "threadpool": threadpool_stats(),
+        "db_pool": pool_stats(),
+    }
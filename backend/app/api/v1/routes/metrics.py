@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from typing import Dict, Any
+
+from app.core.metrics import collect
+
+router = APIRouter()
+
+@router.get("/", response_model=Dict[str, Any], summary="Runtime metrics")
+async def read_metrics() -> Dict[str, Any]:
+    """
+    Return in-process runtime metrics.
+
+    Includes threadpool saturation (in-flight and queued sync calls) and
+    connection pool usage (checked-out vs idle connections, overflow and
+    checkout wait times) for every registered database engine.
+    """
+    return collect()
@@ -0,0 +1,53 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.crud.portfolio import get_portfolio
+from app.db.session import get_db
+from app.schemas.portfolio import Portfolio
+from app.schemas.profile import ErrorResponse
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get(
+    "/",
+    response_model=Portfolio,
+    responses={
+        200: {"description": "Portfolio retrieved successfully"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    },
+    summary="Get profile, projects and skill counts"
+)
+def read_portfolio(
+    skip: int = Query(0, ge=0, description="Number of projects to skip"),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of projects to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get everything the portfolio page needs in one request.
+
+    Returns the profile, a page of projects (with their skills) and the number
+    of projects per skill across all projects. The document is built with a
+    fixed number of queries; repeat requests are served by the response cache.
+
+    - **skip**: Number of projects to skip (for pagination)
+    - **limit**: Maximum number of projects to return (max 100)
+    """
+    try:
+        # The document is already validated against Portfolio, so skip re-validation
+        return JSONResponse(get_portfolio(db, skip=skip, limit=limit))
+    except Exception as e:
+        logger.error(f"Error retrieving portfolio: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "success": False,
+                "error": "Internal server error",
+                "error_code": "internal_server_error",
+                "details": "An error occurred while retrieving the portfolio"
+            }
+        )
@@ -1,11 +1,12 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.core.snapshots import PROFILE, snapshot_response
 from app.db.session import get_db
 from app.crud.profile import (
-    get_profile, get_profile_by_email, get_profiles,
+    PROFILE_FIELDS, get_profile, get_profile_by_email, get_profile_records,
     create_profile, update_profile, delete_profile
 )
 from app.schemas.profile import Profile, ProfileCreate, ProfileUpdate, ErrorResponse
@@ -13,6 +14,9 @@ from app.schemas.profile import Profile, ProfileCreate, ProfileUpdate, ErrorResp
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. id,name,title"
+INCLUDE_DESCRIPTION = "Comma-separated fields to add to the selection, e.g. about"
+
 @router.get(
     "/", 
     response_model=Profile, 
@@ -23,17 +27,31 @@ logger = logging.getLogger(__name__)
     },
     summary="Get my profile"
 )
-def read_profile(db: Session = Depends(get_db)):
+def read_profile(
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
     """
     Get the current user's profile.
     
     Returns the profile information of the currently authenticated user.
     In a real application, you would get the current user's ID from the auth token.
     For now, we return the first profile or a 404 if none exists.
+    The full profile is served from the pre-rendered snapshot when available.
+
+    - **fields**: Only return (and only load) these fields; `id` is always included
+    - **include**: Fields to add to the selection
     """
+    selection = PROFILE_FIELDS.parse(fields, include)
+    if selection is None:
+        snapshot = snapshot_response(request, PROFILE)
+        if snapshot is not None:
+            return snapshot
     try:
         # Get the first profile
-        profiles = get_profiles(db, skip=0, limit=1)
+        profiles = get_profile_records(db, skip=0, limit=1, selection=selection)
         if not profiles:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -44,6 +62,8 @@ def read_profile(db: Session = Depends(get_db)):
                     "details": "Please create a profile first"
                 }
             )
+        if selection is not None:
+            return PROFILE_FIELDS.response(PROFILE_FIELDS.row(profiles[0], selection), selection, many=False)
         return profiles[0]
     except HTTPException:
         raise
@@ -60,26 +80,47 @@ def read_profile(db: Session = Depends(get_db)):
         )
 
 @router.get("/all", response_model=List[Profile], summary="List all profiles")
-def read_profiles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_profiles(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
     """
     Retrieve all profiles with pagination.
     
     - **skip**: Number of profiles to skip (for pagination)
     - **limit**: Maximum number of profiles to return (max 100)
+    - **fields**: Only return (and only load) these fields; `id` is always included
+    - **include**: Fields to add to the selection
     """
-    profiles = get_profiles(db, skip=skip, limit=min(limit, 100))
+    selection = PROFILE_FIELDS.parse(fields, include)
+    profiles = get_profile_records(db, skip=skip, limit=min(limit, 100), selection=selection)
+    if selection is not None:
+        return PROFILE_FIELDS.response([PROFILE_FIELDS.row(profile, selection) for profile in profiles], selection)
     return profiles
 
 @router.get("/{profile_id}", response_model=Profile, summary="Get profile by ID")
-def read_profile_by_id(profile_id: int, db: Session = Depends(get_db)):
+def read_profile_by_id(
+    profile_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
     """
     Get a specific profile by its ID.
     
     - **profile_id**: The ID of the profile to retrieve
+    - **fields**: Only return (and only load) these fields; `id` is always included
+    - **include**: Fields to add to the selection
     """
-    db_profile = get_profile(db, profile_id=profile_id)
+    selection = PROFILE_FIELDS.parse(fields, include)
+    db_profile = get_profile(db, profile_id=profile_id, selection=selection)
     if db_profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
+    if selection is not None:
+        return PROFILE_FIELDS.response(PROFILE_FIELDS.row(db_profile, selection), selection, many=False)
     return db_profile
 
 @router.post("/", response_model=Profile, status_code=status.HTTP_201_CREATED, summary="Create a new profile")
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 import logging
 
+from app.core.catalog import get_catalog
+from app.core.fieldsets import Selection
+from app.core.snapshots import PROJECTS, PROJECT_LIST_LIMIT, project_snapshot_name, snapshot_response
 from app.db.session import get_db
 from app.crud.project import (
-    get_project, get_projects, create_project, 
+    PROJECT_FIELDS, get_project, get_project_records, get_projects_by_ids, create_project, 
     update_project, delete_project
 )
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate
+from app.schemas.project import Project, ProjectCreate, ProjectMultiGet, ProjectUpdate
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,13 +22,35 @@ def project_matches_skill(project: Project, skill: str) -> bool:
     project_skills = project.skills or []
     return any(skill.lower() in s.lower() for s in project_skills)
 
-@router.get("/", response_model=List[Project], summary="List all projects")
+def parse_ids(ids: str) -> List[int]:
+    """Parse a comma-separated list of project IDs, rejecting invalid or too many IDs."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        parsed = None
+    if not parsed or len(parsed) > PROJECT_LIST_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "success": False,
+                "error": "Invalid ids",
+                "error_code": "invalid_ids",
+                "details": {"ids": ids, "max_ids": PROJECT_LIST_LIMIT}
+            }
+        )
+    return parsed
+
+@router.get("/", response_model=Union[List[Project], ProjectMultiGet], summary="List all projects")
 def read_projects(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of projects to skip"),
     limit: int = Query(100, le=100, description="Maximum number of projects to return"),
     featured: Optional[bool] = Query(None, description="Filter by featured status"),
     status: Optional[str] = Query(None, description="Filter by project status"),
     skill: Optional[str] = Query(None, description="Filter by skill"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,skills"),
+    include: Optional[str] = Query(None, description="Comma-separated fields to add to the selection, e.g. skills"),
+    ids: Optional[str] = Query(None, description="Comma-separated project IDs to fetch, e.g. 1,5,9"),
     db: Session = Depends(get_db)
 ):
     """
@@ -35,21 +61,41 @@ def read_projects(
     - **featured**: Filter by featured status (true/false)
     - **status**: Filter by project status (active/completed/archived)
     - **skill**: Filter by skill name (case-insensitive)
+    - **fields**: Only return (and only load) these fields; `id` is always included
+    - **include**: Fields to add to the selection
+    - **ids**: Fetch these projects in one query instead of a page. The response is
+      `{"items": [...], "missing": [...]}` with items in request order; pagination
+      and filters are ignored
     """
+    selection = PROJECT_FIELDS.parse(fields, include)
+    if ids is not None:
+        return read_projects_by_ids(db, parse_ids(ids), selection)
+
+    # The unfiltered first page is pre-rendered; serve it straight from disk
+    if selection is None and skip == 0 and limit == PROJECT_LIST_LIMIT and featured is None and status is None and not skill:
+        snapshot = snapshot_response(request, PROJECTS)
+        if snapshot is not None:
+            return snapshot
+
     try:
-        projects = get_projects(
-            db=db,
-            skip=skip,
-            limit=limit,
-            featured=featured,
-            status=status
-        )
-        
-        # Apply skill filter if provided
-        if skill:
-            projects = [p for p in projects if project_matches_skill(p, skill)]
-            
-        return projects
+        catalog = get_catalog()
+        if catalog is not None:
+            # Served from the in-memory catalog without touching the database
+            projects = catalog.page(skip=skip, limit=limit, featured=featured, status=status, skill=skill)
+        elif skill:
+            # Skills are a JSON list, so filter in Python before paginating
+            projects = get_project_records(
+                db=db, limit=None, featured=featured, status=status, selection=selection, extra_fields=("skills",)
+            )
+            projects = [p for p in projects if project_matches_skill(p, skill)][skip:skip + limit]
+        else:
+            projects = get_project_records(
+                db=db, skip=skip, limit=limit, featured=featured, status=status, selection=selection
+            )
+
+        if selection is not None:
+            return PROJECT_FIELDS.response([PROJECT_FIELDS.row(p, selection) for p in projects], selection)
+        return [p.to_dict() for p in projects]
         
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}", exc_info=True)
@@ -58,6 +104,24 @@ def read_projects(
             detail="An error occurred while fetching projects"
         )
 
+def read_projects_by_ids(db: Session, project_ids: List[int], selection: Optional[Selection]) -> JSONResponse:
+    try:
+        projects, missing = get_projects_by_ids(db, project_ids, selection=selection)
+    except Exception as e:
+        logger.error(f"Error fetching projects by id: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching projects"
+        )
+    if selection is not None:
+        adapter = PROJECT_FIELDS.adapter(selection)
+        items = adapter.dump_python(
+            adapter.validate_python([PROJECT_FIELDS.row(p, selection) for p in projects]), mode="json"
+        )
+    else:
+        items = ProjectMultiGet(items=[p.to_dict() for p in projects]).model_dump(mode="json")["items"]
+    return JSONResponse({"items": items, "missing": missing})
+
 @router.post("/", response_model=Project, status_code=status.HTTP_201_CREATED, summary="Create a new project")
 def create_new_project(project: ProjectCreate, db: Session = Depends(get_db)):
     """
@@ -74,7 +138,7 @@ def create_new_project(project: ProjectCreate, db: Session = Depends(get_db)):
     - **project_metadata**: Additional metadata (optional)
     """
     try:
-        return create_project(db=db, obj_in=project)
+        return create_project(db=db, obj_in=project).to_dict()
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating project: {str(e)}", exc_info=True)
@@ -84,19 +148,39 @@ def create_new_project(project: ProjectCreate, db: Session = Depends(get_db)):
         )
 
 @router.get("/{project_id}", response_model=Project, summary="Get project by ID")
-def read_project(project_id: int, db: Session = Depends(get_db)):
+def read_project(
+    project_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,skills"),
+    include: Optional[str] = Query(None, description="Comma-separated fields to add to the selection, e.g. skills"),
+    db: Session = Depends(get_db)
+):
     """
     Get a specific project by its ID.
     
     - **project_id**: The ID of the project to retrieve
+    - **fields**: Only return (and only load) these fields; `id` is always included
+    - **include**: Fields to add to the selection
     """
-    db_project = get_project(db, project_id=project_id)
+    selection = PROJECT_FIELDS.parse(fields, include)
+    if selection is None:
+        snapshot = snapshot_response(request, project_snapshot_name(project_id))
+        if snapshot is not None:
+            return snapshot
+
+    catalog = get_catalog()
+    if catalog is not None:
+        db_project = catalog.get(project_id)
+    else:
+        db_project = get_project(db, project_id=project_id, selection=selection)
     if db_project is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
-    return db_project
+    if selection is not None:
+        return PROJECT_FIELDS.response(PROJECT_FIELDS.row(db_project, selection), selection, many=False)
+    return db_project.to_dict()
 
 @router.put("/{project_id}", response_model=Project, summary="Update a project")
 def update_existing_project(
@@ -117,7 +201,9 @@ def update_existing_project(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
-        return update_project(db=db, db_obj=db_project, obj_in=project)
+        return update_project(db=db, db_obj=db_project, obj_in=project).to_dict()
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error updating project {project_id}: {str(e)}", exc_info=True)
@@ -140,7 +226,9 @@ def delete_existing_project(project_id: int, db: Session = Depends(get_db)):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
-        return db_project
+        return db_project.to_dict()
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error deleting project {project_id}: {str(e)}", exc_info=True)
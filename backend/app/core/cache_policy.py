@@ -0,0 +1,195 @@
+"""
+HTTP caching policy per route, with surrogate keys for CDN purging.
+
+``ROUTE_POLICIES`` declares, per GET route template, how browsers and shared
+caches may store the response: ``max-age`` for browsers, ``s-maxage`` for
+CDNs, ``stale-while-revalidate``/``stale-if-error`` and extra ``Vary``
+headers. It also declares the surrogate keys that tag the response.
+``CachePolicyMiddleware`` matches each request path against the templates and
+adds ``Cache-Control``, ``Vary`` and ``Surrogate-Key`` to successful GET
+responses. Responses that already set ``Cache-Control`` keep their own.
+Matching uses the path rather than the resolved route, so responses served
+from the response cache or shared by a coalesced request get the same
+headers.
+
+Surrogate keys name what a response contains: ``projects`` for any project
+list, ``project-<id>`` for one project, ``profile`` and ``portfolio``. After
+every committed write (see ``app.db.signals``) :func:`purge_keys` maps the
+changed rows to the keys to purge and hands them to the configured
+``Purger``. Purgers are called in the committing thread, so one that talks to
+a CDN must queue the keys rather than block. ``LocalPurger`` only records the
+keys, for tests and local development.
+"""
+import importlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import compile_path
+
+from app.core.metrics import register_collector
+from app.db.signals import Change, on_commit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache-Control directives and surrogate keys for one route."""
+    max_age: int = 0
+    s_maxage: Optional[int] = None
+    stale_while_revalidate: Optional[int] = None
+    stale_if_error: Optional[int] = None
+    vary: Tuple[str, ...] = ()
+    surrogate_keys: Tuple[str, ...] = ()  # Formatted with the path parameters, e.g. "project-{project_id}"
+
+    def cache_control(self) -> str:
+        directives = ["public", f"max-age={self.max_age}"]
+        if self.s_maxage is not None:
+            directives.append(f"s-maxage={self.s_maxage}")
+        if self.stale_while_revalidate is not None:
+            directives.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        if self.stale_if_error is not None:
+            directives.append(f"stale-if-error={self.stale_if_error}")
+        return ", ".join(directives)
+
+
+# Browsers revalidate after a minute; CDNs hold responses until purged or for 10 minutes
+_CATALOG = dict(max_age=60, s_maxage=600, stale_while_revalidate=60, stale_if_error=86400, vary=("Accept-Encoding",))
+
+ROUTE_POLICIES: Dict[str, CachePolicy] = {
+    "/api/v1/projects": CachePolicy(**_CATALOG, surrogate_keys=("projects",)),
+    "/api/v1/projects/{project_id:int}": CachePolicy(**_CATALOG, surrogate_keys=("project-{project_id}",)),
+    "/api/v1/profile": CachePolicy(**_CATALOG, surrogate_keys=("profile", "projects")),
+    "/api/v1/profile/all": CachePolicy(**_CATALOG, surrogate_keys=("profile", "projects")),
+    "/api/v1/profile/{profile_id:int}": CachePolicy(**_CATALOG, surrogate_keys=("profile", "projects")),
+    "/api/v1/portfolio": CachePolicy(**_CATALOG, surrogate_keys=("portfolio", "profile", "projects")),
+    "/profile": CachePolicy(**_CATALOG, surrogate_keys=("profile",)),
+}
+
+
+def purge_keys(changes: Iterable[Change]) -> List[str]:
+    """Surrogate keys whose responses ``changes`` made out of date."""
+    keys: Dict[str, None] = {}
+    for change in changes:
+        if change.resource == "projects":
+            keys.update(dict.fromkeys(("projects", f"project-{change.id}", "portfolio")))
+        elif change.resource == "profiles":
+            keys.update(dict.fromkeys(("profile", "portfolio")))
+    return list(keys)
+
+
+class Purger(ABC):
+    """Receives the surrogate keys to purge after each write; must not block."""
+
+    @abstractmethod
+    def purge(self, keys: Sequence[str]) -> None:
+        ...
+
+
+class LocalPurger(Purger):
+    """Records purged keys in memory instead of calling a CDN."""
+
+    def __init__(self) -> None:
+        self.purged: List[str] = []
+        self._lock = threading.Lock()
+
+    def purge(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            self.purged.extend(keys)
+
+    def take(self) -> List[str]:
+        """Return and forget the keys purged so far."""
+        with self._lock:
+            keys, self.purged = self.purged, []
+        return keys
+
+
+def load_purger(spec: str) -> Optional[Purger]:
+    """Build the purger named by ``spec``: "" for none, "local", or "package.module:ClassName"."""
+    if not spec:
+        return None
+    if spec == "local":
+        return LocalPurger()
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+_purger: Optional[Purger] = None
+_listening = False
+_stats = {"purges": 0, "purged_keys": 0, "purge_errors": 0}
+
+
+def _purge(changes: List[Change]) -> None:
+    purger = _purger
+    if purger is None:
+        return
+    keys = purge_keys(changes)
+    if not keys:
+        return
+    try:
+        purger.purge(keys)
+        _stats["purges"] += 1
+        _stats["purged_keys"] += len(keys)
+    except Exception as e:
+        _stats["purge_errors"] += 1
+        logger.error(f"Purging surrogate keys {keys} failed: {str(e)}", exc_info=True)
+
+
+def configure_purging(purger: Purger) -> Purger:
+    """Send the surrogate keys made stale by every committed write to ``purger``."""
+    global _purger, _listening
+    if not _listening:
+        on_commit(_purge)
+        register_collector("surrogate_purge", lambda: {**_stats, "purger": type(_purger).__name__ if _purger else None})
+        _listening = True
+    _purger = purger
+    return purger
+
+
+def disable_purging() -> None:
+    global _purger
+    _purger = None
+
+
+class CachePolicyMiddleware:
+    """Pure ASGI middleware adding Cache-Control, Vary and Surrogate-Key to GET responses."""
+
+    def __init__(self, app, policies: Optional[Dict[str, CachePolicy]] = None):
+        self.app = app
+        self.routes: List[Tuple[Pattern[str], CachePolicy]] = [
+            (compile_path(template)[0], policy) for template, policy in (policies or ROUTE_POLICIES).items()
+        ]
+
+    def match(self, path: str) -> Optional[Tuple[CachePolicy, Dict[str, str]]]:
+        path = path.rstrip("/") or "/"
+        for pattern, policy in self.routes:
+            found = pattern.match(path)
+            if found:
+                return policy, found.groupdict()
+        return None
+
+    async def __call__(self, scope, receive, send):
+        matched = self.match(scope["path"]) if scope["type"] == "http" and scope["method"] in ("GET", "HEAD") else None
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        policy, params = matched
+
+        async def send_with_policy(message):
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                headers = MutableHeaders(scope=message)
+                if "cache-control" not in headers:
+                    headers["cache-control"] = policy.cache_control()
+                    present = {name.strip().lower() for name in headers.get("vary", "").split(",")}
+                    for name in policy.vary:
+                        if name.lower() not in present:
+                            headers.add_vary_header(name)
+                    if policy.surrogate_keys:
+                        headers["surrogate-key"] = " ".join(key.format(**params) for key in policy.surrogate_keys)
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
@@ -0,0 +1,437 @@
+"""
+In-memory project catalog.
+
+The projects table is loaded into ``__slots__`` records (see
+``app.db.records``) plus precomputed lookups: by id, by featured flag, by
+status and by lower-cased skill. The project list, detail and skill-filter
+routes read from it without touching the database.
+
+Each ``CatalogSnapshot`` is immutable once built. Commits that touch projects
+(see ``app.db.signals``) queue the changed ids; a background thread re-reads
+those rows and builds a new snapshot that shares everything else with the
+current one: only the changed records and the index entries listing them are
+copied. It is swapped in with a single assignment, so readers always see a
+complete catalog and never take a lock, and may see the previous snapshot for
+the few milliseconds the update takes.
+Writes made by other workers are picked up from the change log
+(``app.db.change_log``) every ``sync_interval`` seconds, and a full reload
+runs in the background every ``ttl`` seconds.
+
+Snapshots estimate their own size. One that would exceed ``max_bytes`` is not
+served: the routes fall back to the database until a reload fits again.
+"""
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.metrics import register_collector
+from app.db.signals import DELETE, Change, on_commit
+
+logger = logging.getLogger(__name__)
+
+_TRACKED_RESOURCE = "projects"
+_SHARED_STRING_LENGTH = 64
+
+
+def _deep_size(value: Any, seen: set) -> int:
+    """``sys.getsizeof`` of ``value`` and everything it holds, counting shared objects once."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in value)
+    elif hasattr(type(value), "__slots__"):
+        size += sum(_deep_size(getattr(value, slot, None), seen) for slot in type(value).__slots__)
+    return size
+
+
+def _share(value: Any) -> Any:
+    """Intern the short strings of a decoded JSON value: keys, tags and names repeat across rows."""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= _SHARED_STRING_LENGTH else value
+    if isinstance(value, dict):
+        return {sys.intern(key) if isinstance(key, str) else key: _share(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_share(item) for item in value]
+    return value
+
+
+def _compact(record: Any) -> Any:
+    """Share repeated strings between records and freeze the skills list."""
+    record.skills = tuple(sys.intern(skill) for skill in (record.skills or ()) if isinstance(skill, str))
+    if isinstance(record.status, str):
+        record.status = sys.intern(record.status)
+    record.project_metadata = _share(record.project_metadata)
+    return record
+
+
+def _id(record: Any) -> int:
+    return record.id
+
+
+def _index_keys(record: Any) -> Set[Tuple[str, Any]]:
+    """The ``(index, key)`` entries listing ``record``."""
+    keys = {("status", record.status)}
+    keys.update(("skill", sys.intern(skill.lower())) for skill in record.skills)
+    if record.is_featured:
+        keys.add(("featured", True))
+    return keys
+
+
+class CatalogSnapshot:
+    """An immutable view of every project with its lookups."""
+
+    __slots__ = ("by_id", "ordered", "featured", "by_status", "by_skill", "size_bytes", "loaded_at")
+
+    def __init__(self, records: Iterable[Any], loaded_at: float):
+        self.ordered: Tuple[Any, ...] = tuple(sorted(records, key=_id))
+        self.by_id: Dict[int, Any] = {record.id: record for record in self.ordered}
+        featured: List[int] = []
+        by_status: Dict[str, List[int]] = {}
+        by_skill: Dict[str, List[int]] = {}
+        for record in self.ordered:
+            if record.is_featured:
+                featured.append(record.id)
+            by_status.setdefault(record.status, []).append(record.id)
+            for skill in set(skill.lower() for skill in record.skills):
+                by_skill.setdefault(sys.intern(skill), []).append(record.id)
+        # Ids, ascending, so walking one keeps id order
+        self.featured: Tuple[int, ...] = tuple(featured)
+        self.by_status: Dict[str, Tuple[int, ...]] = {name: tuple(ids) for name, ids in by_status.items()}
+        self.by_skill: Dict[str, Tuple[int, ...]] = {name: tuple(ids) for name, ids in by_skill.items()}
+        self.loaded_at = loaded_at
+        self.size_bytes = _deep_size(
+            (self.ordered, self.by_id, self.featured, self.by_status, self.by_skill), set()
+        )
+
+    def with_changes(self, records: Iterable[Any], removed: Iterable[int]) -> "CatalogSnapshot":
+        """
+        A new snapshot with ``records`` upserted and the ``removed`` ids dropped.
+
+        Only the changed records and the index entries listing them are
+        touched; everything else is shared with this snapshot. ``size_bytes``
+        is adjusted by the size of the records swapped in and out, so it
+        drifts slightly from a full count until the next full load.
+        """
+        upserts = {record.id: record for record in records}
+        changed = set(removed) | set(upserts)
+        snapshot = CatalogSnapshot.__new__(CatalogSnapshot)
+        snapshot.loaded_at = self.loaded_at
+        size = self.size_bytes
+        by_id = dict(self.by_id)
+        ordered = list(self.ordered)
+        # Parallel to ordered, for bisecting by id (bisect's key= needs Python 3.10)
+        ids = [record.id for record in ordered]
+        dropped: Dict[Tuple[str, Any], Set[int]] = {}
+        added: Dict[Tuple[str, Any], List[int]] = {}
+        for project_id in sorted(changed):
+            old, new = self.by_id.get(project_id), upserts.get(project_id)
+            old_keys = _index_keys(old) if old is not None else set()
+            new_keys = _index_keys(new) if new is not None else set()
+            for key in old_keys - new_keys:
+                dropped.setdefault(key, set()).add(project_id)
+            for key in new_keys - old_keys:
+                added.setdefault(key, []).append(project_id)
+
+            position = bisect_left(ids, project_id)
+            present = position < len(ids) and ids[position] == project_id
+            if old is not None:
+                size -= _deep_size(old, set())
+            if new is None:
+                by_id.pop(project_id, None)
+                if present:
+                    del ordered[position]
+                    del ids[position]
+                continue
+            size += _deep_size(new, set())
+            by_id[project_id] = new
+            if present:
+                ordered[position] = new
+            else:
+                ordered.insert(position, new)
+                ids.insert(position, project_id)
+
+        indexes = {"featured": {True: self.featured}, "status": dict(self.by_status), "skill": dict(self.by_skill)}
+        for index, key in dropped.keys() | added.keys():
+            gone = dropped.get((index, key), set())
+            ids = [project_id for project_id in indexes[index].get(key, ()) if project_id not in gone]
+            for project_id in added.get((index, key), ()):
+                insort(ids, project_id)
+            if ids:
+                indexes[index][key] = tuple(ids)
+            else:
+                indexes[index].pop(key, None)
+        snapshot.ordered = tuple(ordered)
+        snapshot.by_id = by_id
+        snapshot.featured = indexes["featured"].get(True, ())
+        snapshot.by_status = indexes["status"]
+        snapshot.by_skill = indexes["skill"]
+        snapshot.size_bytes = size
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+    def get(self, project_id: int) -> Optional[Any]:
+        return self.by_id.get(project_id)
+
+    def page(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        featured: Optional[bool] = None,
+        status: Optional[str] = None,
+        skill: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Projects ordered by id, filtered, then paginated.
+
+        ``skill`` matches case-insensitively as a substring of any skill, like
+        the database-backed route.
+        """
+        end = None if limit is None else skip + limit
+        if featured is None and not status and not skill:
+            return list(self.ordered[skip:end])
+
+        # Walk the narrowest index in id order, check the other filters on the
+        # record itself, and stop once the page is full
+        needle = skill.lower() if skill else None
+        indexes: List[Sequence[int]] = []
+        if featured:
+            indexes.append(self.featured)
+        if status:
+            indexes.append(self.by_status.get(status, ()))
+        if needle:
+            indexes.append(sorted(set().union(*(found for name, found in self.by_skill.items() if needle in name))))
+        candidates = map(self.by_id.__getitem__, min(indexes, key=len)) if indexes else self.ordered
+
+        def matches(record: Any) -> bool:
+            return (
+                (featured is None or record.is_featured == featured)
+                and (not status or record.status == status)
+                and (not needle or any(needle in name.lower() for name in record.skills))
+            )
+
+        matching = (record for record in candidates if matches(record))
+        return list(islice(matching, skip, end))
+
+
+class ProjectCatalog:
+    """
+    Holds the current snapshot and patches it after writes.
+
+    With ``sync_interval`` set, reads also poll the change log (see
+    ``app.db.change_log``) every ``sync_interval`` seconds from a background
+    thread and apply the project changes committed by other workers.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], max_bytes: int, ttl: float, sync_interval: float = 0):
+        self.session_factory = session_factory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._attempted_at = 0.0
+        self._synced_at = 0.0
+        # Last change log version applied; None when the log is unavailable
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._reloading = False
+        # Changes committed in this worker, applied by a background thread
+        self._queued: List[Change] = []
+        self._queue_lock = threading.Lock()
+        self._applying = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stats = {"loads": 0, "updates": 0, "syncs": 0, "over_cap": 0, "errors": 0}
+
+    def _read(self, criteria: Tuple[Any, ...] = ()) -> List[Any]:
+        from app.db.models.project import Project
+        from app.db.records import select_records
+
+        db = self.session_factory()
+        try:
+            return [_compact(record) for record in select_records(db, Project, criteria=criteria)]
+        finally:
+            db.close()
+
+    def _read_log(self, since: Optional[int]) -> Tuple[Optional[int], List[Change]]:
+        """The newest change log version and the project changes after ``since``."""
+        from app.db.change_log import read_log
+
+        db = self.session_factory()
+        try:
+            return read_log(db, since, (_TRACKED_RESOURCE,))
+        except DBAPIError:
+            # No change log on this database (e.g. the change feed is disabled)
+            return None, []
+        finally:
+            db.close()
+
+    def _publish(self, snapshot: CatalogSnapshot) -> None:
+        if snapshot.size_bytes > self.max_bytes:
+            self._stats["over_cap"] += 1
+            logger.warning(
+                f"Project catalog needs {snapshot.size_bytes} bytes for {len(snapshot)} projects, "
+                f"over the {self.max_bytes} byte cap; serving projects from the database"
+            )
+            self._snapshot = None
+        else:
+            self._snapshot = snapshot
+
+    def load(self) -> Optional[CatalogSnapshot]:
+        """Read the whole table and publish a fresh snapshot."""
+        with self._lock:
+            self._attempted_at = self._synced_at = time.monotonic()
+            try:
+                # Read the version first: changes committed during the read are applied again by the next sync
+                version = self._read_log(None)[0] if self.sync_interval > 0 else None
+                snapshot = CatalogSnapshot(self._read(), time.monotonic())
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Loading the project catalog failed: {str(e)}", exc_info=True)
+                return self._snapshot
+            self._stats["loads"] += 1
+            self._version = version
+            self._publish(snapshot)
+            return self._snapshot
+
+    def _apply(self, changes: List[Change]) -> bool:
+        from app.db.models.project import Project
+
+        current = self._snapshot
+        if current is None:
+            return False  # Not loaded (or over the cap); the next reload picks the changes up
+        latest = {change.id: change.op for change in changes if change.resource == _TRACKED_RESOURCE}
+        upserts = [project_id for project_id, op in latest.items() if op != DELETE]
+        try:
+            records = self._read((Project.id.in_(upserts),)) if upserts else []
+        except Exception as e:
+            # Serving stale rows until the next reload beats serving no catalog
+            self._stats["errors"] += 1
+            logger.error(f"Updating the project catalog failed: {str(e)}", exc_info=True)
+            return False
+        # Ids that are gone from the table are dropped whatever the logged op
+        self._publish(current.with_changes(records, latest))
+        return True
+
+    def apply(self, changes: List[Change]) -> None:
+        """
+        Queue the changed rows to be re-read and patched into a new snapshot.
+
+        Called from the commit hub, so the read runs in a background thread
+        rather than in the committing one; bursts are applied together.
+        """
+        changes = [change for change in changes if change.resource == _TRACKED_RESOURCE]
+        if not changes:
+            return
+        with self._queue_lock:
+            self._queued.extend(changes)
+            self._idle.clear()
+            if self._applying:
+                return
+            self._applying = True
+        threading.Thread(target=self._apply_queued, name="catalog-update", daemon=True).start()
+
+    def _apply_queued(self) -> None:
+        while True:
+            with self._queue_lock:
+                changes, self._queued = self._queued, []
+                if not changes:
+                    self._applying = False
+                    self._idle.set()
+                    return
+            try:
+                with self._lock:
+                    if self._apply(changes):
+                        self._stats["updates"] += 1
+            except Exception as e:
+                # Keep draining; the next reload repairs whatever this batch missed
+                self._stats["errors"] += 1
+                logger.error(f"Updating the project catalog failed: {str(e)}", exc_info=True)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued change has been applied (mainly for tests)."""
+        return self._idle.wait(timeout)
+
+    def sync(self) -> None:
+        """Apply the project changes logged since the last load or sync."""
+        with self._lock:
+            self._synced_at = time.monotonic()
+            if self._version is None:
+                return
+            newest, changes = self._read_log(self._version)
+            if newest is None:
+                return
+            if not changes or self._apply(changes):
+                self._version = newest
+                self._stats["syncs"] += bool(changes)
+
+    def _reload_in_background(self, reload: Callable[[], Any]) -> None:
+        try:
+            reload()
+        finally:
+            self._reloading = False
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The snapshot to serve from, or None to use the database; starts a reload or sync when due."""
+        if not self._reloading:
+            now = time.monotonic()
+            reload = None
+            if self.ttl > 0 and now - self._attempted_at > self.ttl:
+                reload, self._attempted_at = self.load, now
+            elif self._version is not None and self.sync_interval > 0 and now - self._synced_at > self.sync_interval:
+                reload, self._synced_at = self.sync, now
+            if reload is not None:
+                self._reloading = True
+                threading.Thread(
+                    target=self._reload_in_background, args=(reload,), name="catalog-reload", daemon=True
+                ).start()
+        return self._snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self._stats,
+            "active": snapshot is not None,
+            "projects": len(snapshot) if snapshot is not None else 0,
+            "size_bytes": snapshot.size_bytes if snapshot is not None else 0,
+            "max_bytes": self.max_bytes,
+            "version": self._version,
+        }
+
+
+_catalog: Optional[ProjectCatalog] = None
+_listening = False
+
+
+def configure_catalog(
+    session_factory: Callable[[], Any], max_bytes: int, ttl: float, sync_interval: float = 0
+) -> ProjectCatalog:
+    """Enable the catalog; call ``load()`` on the result to fill it."""
+    global _catalog, _listening
+    if not _listening:
+        on_commit(lambda changes: _catalog.apply(changes) if _catalog else None)
+        register_collector("project_catalog", lambda: _catalog.stats() if _catalog else {"active": False})
+        _listening = True
+    _catalog = ProjectCatalog(session_factory, max_bytes, ttl, sync_interval)
+    return _catalog
+
+
+def disable_catalog() -> None:
+    global _catalog
+    _catalog = None
+
+
+def get_catalog() -> Optional[CatalogSnapshot]:
+    """The current catalog snapshot, or None when the catalog is disabled, not loaded or over its cap."""
+    return _catalog.current() if _catalog is not None else None
@@ -0,0 +1,373 @@
+"""
+Response compression with a precompressed cache for hot payloads.
+
+``CompressionMiddleware`` negotiates ``br`` (when the optional ``brotli``
+package is installed) or ``gzip`` from ``Accept-Encoding`` and compresses
+responses above a size threshold.
+
+GET responses for the configured cached paths (profile, project list,
+openapi.json, ...) are additionally stored with their identity bytes and each
+encoded variant, so a payload is rendered and compressed once per change rather
+than once per request. Heavy compression runs in the threadpool so it never
+blocks the event loop.
+
+Entries are fresh for ``ttl`` seconds (soft expiry), which picks up writes
+made by other workers. For ``stale_ttl`` seconds after that (hard expiry) the
+stale entry is still served at once, with ``Age`` and ``Warning: 110``
+headers, while a single background request refreshes it. So the request that
+happens to arrive at expiry does not pay for the render. A write committed in
+this process (see ``app.db.signals``) makes the entry revalidate before the
+next response instead.
+
+When revalidation fails with a 5xx response or an exception (e.g. the
+database is unreachable), the last good entry is served with ``Age`` and
+``Warning: 111`` for up to ``stale_if_error`` seconds past its soft expiry.
+After that the error is passed through.
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import register_collector
+from app.db.signals import data_version
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+
+# Bodies above this size are compressed in the threadpool regardless of level
+_THREAD_OFFLOAD_SIZE = 256 * 1024
+
+_stats = {
+    "hits": 0, "misses": 0, "not_modified": 0, "compressions": 0,
+    "stale": 0, "stale_on_error": 0, "refreshes": 0, "refresh_errors": 0,
+}
+
+# RFC 7234 warn-codes
+STALE_WARNING = b'110 - "Response is Stale"'
+REVALIDATION_FAILED_WARNING = b'111 - "Revalidation Failed"'
+
+# Headers that make a background refresh conditional on what one client already has
+_CONDITIONAL_HEADERS = {b"if-none-match", b"if-modified-since"}
+
+
+def negotiate_encoding(accept_encoding: str, codings: Optional[Tuple[str, ...]] = None) -> str:
+    """
+    Pick the best supported content coding from an ``Accept-Encoding`` header.
+
+    ``codings`` restricts the choice to the encodings the caller can serve, in
+    order of preference; by default every coding this module can produce.
+    """
+    if not accept_encoding:
+        return IDENTITY
+    preferences: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        preferences[name.strip().lower()] = quality
+
+    wildcard = preferences.get("*", 0.0)
+    supported = codings or (("br", "gzip") if brotli is not None else ("gzip",))
+    # max() keeps the first of equally preferred codings, so br wins ties
+    best = max(supported, key=lambda coding: preferences.get(coding, wildcard))
+    return best if preferences.get(best, wildcard) > 0 else IDENTITY
+
+
+class CachedResponse:
+    """Identity bytes of a response plus lazily computed encoded variants."""
+
+    __slots__ = ("status", "headers", "body", "etag", "version", "stored", "fresh_until", "expires", "variants")
+
+    def __init__(
+        self,
+        status: int,
+        headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+        version: int,
+        stored: float,
+        fresh_until: float,
+        expires: float,
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.version = version
+        self.stored = stored
+        self.fresh_until = fresh_until  # Soft expiry: served stale and refreshed in the background after this
+        self.expires = expires  # Hard expiry: revalidated before serving after this
+        self.variants: Dict[str, bytes] = {}
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware for content negotiation and cached compressed payloads."""
+
+    # Response headers recomputed when serving a cached entry
+    _DROPPED_HEADERS = {b"content-length", b"content-encoding", b"etag", b"vary"}
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cached_paths: Iterable[str] = (),
+        ttl: int = 300,
+        max_entries: int = 256,
+        stale_ttl: int = 0,
+        stale_if_error: int = 0,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cached_paths = {p.rstrip("/") or "/" for p in cached_paths}
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self._cache: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._refreshing: Dict[str, "asyncio.Task[None]"] = {}
+        register_collector("response_cache", self.stats)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._cache), "refreshing": len(self._refreshing), **_stats}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+            elif name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        encoding = negotiate_encoding(accept_encoding)
+
+        path = scope["path"].rstrip("/") or "/"
+        if scope["method"] == "GET" and path in self.cached_paths:
+            await self._serve_cached(scope, receive, send, path, encoding, if_none_match)
+        elif encoding != IDENTITY:
+            await self._serve_compressed(scope, receive, send, encoding)
+        else:
+            await self.app(scope, receive, send)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        _stats["compressions"] += 1
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output deterministic for identical payloads
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def _encode(self, body: bytes, encoding: str) -> bytes:
+        heavy = (
+            len(body) >= _THREAD_OFFLOAD_SIZE
+            or (encoding == "br" and self.brotli_quality > 4)
+            or (encoding == "gzip" and self.gzip_level > 6)
+        )
+        if heavy:
+            return await anyio.to_thread.run_sync(self._compress, body, encoding)
+        return self._compress(body, encoding)
+
+    async def _serve_compressed(self, scope, receive, send, encoding: str) -> None:
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the start message until we know the body size
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            start["headers"] = headers.raw
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._encode(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _serve_cached(self, scope, receive, send, path: str, encoding: str, if_none_match: Optional[str]) -> None:
+        key = path + "?" + scope.get("query_string", b"").decode("latin-1")
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        warning = None
+        if entry is not None and entry.version == data_version() and now < entry.expires:
+            self._cache.move_to_end(key)
+            if now < entry.fresh_until:
+                _stats["hits"] += 1
+            else:
+                _stats["stale"] += 1
+                warning = STALE_WARNING
+                self._refresh(scope, key)
+        else:
+            # Missing, invalidated by a write or past its hard expiry: the old entry is only an error fallback
+            _stats["misses"] += 1
+            entry, warning = await self._revalidate(scope, receive, send, key, entry)
+            if entry is None:
+                return
+        await self._serve_entry(send, entry, encoding, if_none_match, warning)
+
+    async def _serve_entry(
+        self, send, entry: CachedResponse, encoding: str, if_none_match: Optional[str], warning: Optional[bytes]
+    ) -> None:
+        headers = list(entry.headers)
+        headers.append((b"etag", entry.etag.encode()))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if warning is not None:
+            headers.append((b"age", str(int(time.monotonic() - entry.stored)).encode()))
+            headers.append((b"warning", warning))
+
+        if if_none_match and entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+            _stats["not_modified"] += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = entry.body
+        if encoding != IDENTITY and len(body) >= self.minimum_size:
+            variant = entry.variants.get(encoding)
+            if variant is None:
+                variant = entry.variants[encoding] = await self._encode(body, encoding)
+            body = variant
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _capture(self, scope, receive) -> List[Dict]:
+        messages = []
+
+        async def capture(message):
+            messages.append(message)
+
+        await self.app(scope, receive, capture)
+        return messages
+
+    def _store(self, key: str, messages: List[Dict], version: int) -> Optional[CachedResponse]:
+        """Cache the captured response if it is a complete 200; returns the new entry."""
+        start = next((m for m in messages if m["type"] == "http.response.start"), None)
+        headers = start.get("headers", []) if start else []
+        if start is None or start["status"] != 200 or any(
+            name in (b"set-cookie", b"content-encoding") for name, _ in headers
+        ):
+            return None
+
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        kept = [(name, value) for name, value in headers if name.lower() not in self._DROPPED_HEADERS]
+        now = time.monotonic()
+        entry = CachedResponse(
+            start["status"], kept, body, version, now, now + self.ttl, now + self.ttl + self.stale_ttl
+        )
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _usable_on_error(self, entry: Optional[CachedResponse]) -> bool:
+        return entry is not None and time.monotonic() < entry.fresh_until + self.stale_if_error
+
+    async def _revalidate(
+        self, scope, receive, send, key: str, previous: Optional[CachedResponse]
+    ) -> Tuple[Optional[CachedResponse], Optional[bytes]]:
+        """
+        Run the app and cache its response.
+
+        Returns the entry to serve and its warning, or ``(None, None)`` after
+        relaying an uncacheable response as-is. When the app fails and
+        ``previous`` is recent enough, ``previous`` is served instead.
+        """
+        version = data_version()
+        try:
+            messages = await self._capture(scope, receive)
+        except Exception as e:
+            if not self._usable_on_error(previous):
+                raise
+            logger.error(f"Serving stale {key} after an error: {str(e)}", exc_info=True)
+            _stats["stale_on_error"] += 1
+            return previous, REVALIDATION_FAILED_WARNING
+
+        start = next((m for m in messages if m["type"] == "http.response.start"), None)
+        if start is not None and start["status"] >= 500 and self._usable_on_error(previous):
+            _stats["stale_on_error"] += 1
+            return previous, REVALIDATION_FAILED_WARNING
+
+        entry = self._store(key, messages, version)
+        if entry is None:
+            if self._cache.get(key) is previous:
+                self._cache.pop(key, None)
+            for message in messages:
+                await send(message)
+            return None, None
+        return entry, None
+
+    def _refresh(self, scope, key: str) -> None:
+        """Refresh ``key`` in the background unless a refresh is already running."""
+        if key in self._refreshing:
+            return
+        # The client's request may be long gone by then: refresh with an unconditional copy of it
+        refresh_scope = {
+            **scope, "headers": [(name, value) for name, value in scope["headers"] if name not in _CONDITIONAL_HEADERS],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def refresh() -> None:
+            _stats["refreshes"] += 1
+            version = data_version()
+            try:
+                messages = await self._capture(refresh_scope, receive)
+                if self._store(key, messages, version) is None:
+                    _stats["refresh_errors"] += 1  # Keep serving the stale entry until its hard expiry
+            except Exception as e:
+                _stats["refresh_errors"] += 1
+                logger.error(f"Background refresh of {key} failed: {str(e)}", exc_info=True)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from typing import List
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -23,11 +24,14 @@ class Settings(BaseSettings):
     # Database configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
     TEST_DATABASE_URL: str = os.getenv("TEST_DATABASE_URL", "sqlite:///./test.db")
+    # Compare the stored schema fingerprint on startup and create tables only when it differs
+    SCHEMA_CHECK_ON_STARTUP: bool = os.getenv("SCHEMA_CHECK_ON_STARTUP", "True").lower() == "true"
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")  # X-Admin-Token for admin-only endpoints; empty disables them
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -43,13 +47,91 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT: int = int(os.getenv("RATE_LIMIT", "100"))
     RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "900"))  # 15 minutes
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    # Comma-separated "path_prefix=limit/window" rules; a limit of 0 disables limiting for the prefix
+    RATE_LIMIT_OVERRIDES: str = os.getenv("RATE_LIMIT_OVERRIDES", "/health=0/1,/api/v1/health=0/1")
+    RATE_LIMIT_STORE: str = os.getenv("RATE_LIMIT_STORE", "mmap")  # "mmap" (shared across workers) or "memory"
+    RATE_LIMIT_STORE_PATH: str = os.getenv("RATE_LIMIT_STORE_PATH", "")  # Defaults to a file in the temp dir
+    RATE_LIMIT_TRUST_PROXY: bool = os.getenv("RATE_LIMIT_TRUST_PROXY", "False").lower() == "true"
+    RATE_LIMIT_API_KEYS: str = os.getenv("RATE_LIMIT_API_KEYS", "")  # Comma-separated keys limited per key; other callers are limited per IP
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_DIR: str = os.getenv("LOG_DIR", "")  # Also write a rotating <LOG_DIR>/api.log when set
     
     # Caching
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes
+    # After CACHE_TTL, serve the stale entry while one background request refreshes it
+    CACHE_STALE_SECONDS: int = int(os.getenv("CACHE_STALE_SECONDS", "60"))
+    # When refreshing fails (e.g. the database is down), keep serving the last good entry this long
+    CACHE_STALE_IF_ERROR_SECONDS: int = int(os.getenv("CACHE_STALE_IF_ERROR_SECONDS", "600"))
+
+    # Compression
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))  # Bytes
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "5"))
+    # Comma-separated GET paths whose encoded responses are cached until the next write
+    CACHED_RESPONSE_PATHS: str = os.getenv(
+        "CACHED_RESPONSE_PATHS", "/api/v1/profile,/api/v1/projects,/api/v1/portfolio,/openapi.json"
+    )
+
+    # Cache-Control, Vary and Surrogate-Key headers from app.core.cache_policy.ROUTE_POLICIES
+    CACHE_POLICY_ENABLED: bool = os.getenv("CACHE_POLICY_ENABLED", "True").lower() == "true"
+    # Purges surrogate keys after writes: "local", "package.module:ClassName", or empty for none
+    CACHE_PURGER: str = os.getenv("CACHE_PURGER", "")
+
+    # Identical concurrent GETs under these prefixes share one execution (single-flight)
+    COALESCE_ENABLED: bool = os.getenv("COALESCE_ENABLED", "True").lower() == "true"
+    COALESCE_PATHS: str = os.getenv("COALESCE_PATHS", "/api/v1/profile,/api/v1/projects,/api/v1/portfolio")
+    COALESCE_TIMEOUT: float = float(os.getenv("COALESCE_TIMEOUT", "10"))  # Followers then run the request themselves
+
+    # In-memory project catalog serving the project list, detail and skill queries
+    CATALOG_ENABLED: bool = os.getenv("CATALOG_ENABLED", "True").lower() == "true"
+    CATALOG_MAX_BYTES: int = int(os.getenv("CATALOG_MAX_BYTES", str(256 * 1024 * 1024)))  # ~15MiB per 10k projects; larger catalogs use the DB
+    CATALOG_RELOAD_SECONDS: int = int(os.getenv("CATALOG_RELOAD_SECONDS", "300"))  # Full reload, also catches writes made outside the ORM
+    CATALOG_SYNC_SECONDS: float = float(os.getenv("CATALOG_SYNC_SECONDS", "1"))  # Picks up other workers' writes from the change log (needs CHANGE_FEED_ENABLED)
+
+    # Second-level cache of project and profile rows by id and email (see app.db.identity_cache)
+    IDENTITY_CACHE_ENABLED: bool = os.getenv("IDENTITY_CACHE_ENABLED", "False").lower() == "true"
+    IDENTITY_CACHE_MAX_ENTRIES: int = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+    IDENTITY_CACHE_TTL: float = float(os.getenv("IDENTITY_CACHE_TTL", "60"))  # Bounds how long other workers' writes go unseen
+
+    # Change feed (GET /api/v1/changes): project and profile writes logged with a monotonic version
+    CHANGE_FEED_ENABLED: bool = os.getenv("CHANGE_FEED_ENABLED", "True").lower() == "true"
+    CHANGE_FEED_PAGE_SIZE: int = int(os.getenv("CHANGE_FEED_PAGE_SIZE", "500"))  # Default changes per response
+
+    # Server-Sent Events stream of changes (GET /api/v1/events)
+    EVENTS_ENABLED: bool = os.getenv("EVENTS_ENABLED", "True").lower() == "true"
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "64"))  # Events a subscriber may lag before it is dropped
+    EVENTS_BUFFER_SIZE: int = int(os.getenv("EVENTS_BUFFER_SIZE", "1024"))  # Recent events kept for Last-Event-ID resume
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    EVENTS_MAX_SUBSCRIBERS: int = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))  # Per worker
+    EVENTS_POLL_SECONDS: float = float(os.getenv("EVENTS_POLL_SECONDS", "1"))  # Picks up other workers' writes from the change log (needs CHANGE_FEED_ENABLED)
+
+    # Batch endpoint
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))  # Sub-requests per POST /batch
+
+    # Static snapshots
+    SNAPSHOTS_ENABLED: bool = os.getenv("SNAPSHOTS_ENABLED", "True").lower() == "true"
+    SNAPSHOT_DIR: str = os.getenv(
+        "SNAPSHOT_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "static", "snapshots")
+    )
+
+    # Concurrency
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))  # Worker threads for sync routes
+    DB_CLOSE_THREADS: int = int(os.getenv("DB_CLOSE_THREADS", "4"))  # Threads reserved for closing request sessions
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a connection
+
+    # Request profiling (admin callers only; needs ADMIN_TOKEN)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "True").lower() == "true"
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "api-jd-profiles"))
+    PROFILE_RING_SIZE: int = int(os.getenv("PROFILE_RING_SIZE", "50"))  # Captures kept on disk
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))  # Sampling interval
+    PROFILE_MAX_SECONDS: float = float(os.getenv("PROFILE_MAX_SECONDS", "30"))  # Sampling stops after this
     
     def __init__(self, **values):
         # Initialize SQLALCHEMY_DATABASE_URI from DATABASE_URL if not provided
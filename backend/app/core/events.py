@@ -0,0 +1,288 @@
+"""
+Server-Sent Events for project and profile changes.
+
+``EventBroadcaster`` fans committed changes (see ``app.db.signals``) out to
+every ``GET /api/v1/events`` stream in this worker. Each change is encoded to
+SSE bytes once and the same bytes object is queued for every subscriber.
+Commits happen in threadpool workers, so a commit hands its changes to the
+event loop with a single ``call_soon_threadsafe``. All subscriber state is
+then touched only on the loop, without locks.
+
+A worker only sees its own commits. With several workers, call
+:meth:`EventBroadcaster.follow_log` so events come from the change log
+(``app.db.change_log``) instead: a task on the loop reads the entries
+committed by any worker every ``interval`` seconds, in a thread, and a commit
+in this worker wakes it early. Subscribers then get every change whichever
+worker they are connected to.
+
+An idle subscriber costs a small ``__slots__`` object, an empty list and the
+future its stream is waiting on. There are no per-subscriber tasks or timers:
+one shared timer queues a heartbeat comment for every idle stream, so proxies
+keep the connection open and dead clients are noticed.
+
+Queues are bounded. A subscriber that falls ``queue_size`` events behind is
+dropped and its stream ends. The client reconnects with ``Last-Event-ID`` and
+resumes from the last ``buffer_size`` events kept for replay. Event ids are
+``<epoch>-<sequence>``, where the epoch identifies this worker process. An id
+from another worker, an earlier process or beyond the replay buffer gets a
+``reset`` event instead, telling the client to resync (e.g. from
+``/api/v1/changes``).
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.metrics import register_collector
+from app.db.signals import Change, on_commit
+
+logger = logging.getLogger(__name__)
+
+_TRACKED_RESOURCES = {"profiles", "projects"}
+
+HEARTBEAT = b": heartbeat\n\n"
+
+
+def format_event(event_id: str, event: str, data: Dict[str, Any]) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    """One open event stream: the events queued for it and the future it waits on."""
+
+    __slots__ = ("pending", "waiter", "dropped")
+
+    def __init__(self) -> None:
+        self.pending: List[bytes] = []  # Flushed whole, so a list; an empty deque costs ~600 bytes
+        self.waiter: Optional[asyncio.Future] = None
+        self.dropped = False
+
+
+class EventBroadcaster:
+    """Fans change events out to the subscribers of one event loop."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue_size: int = 64,
+        buffer_size: int = 1024,
+        heartbeat: float = 15.0,
+        max_subscribers: int = 10000,
+        retry_ms: int = 3000,
+    ):
+        self.loop = loop
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        self.retry_ms = retry_ms
+        self.epoch = f"{time.time_ns():x}{os.getpid():x}"
+        self._sequence = 0
+        self._recent: Deque[Tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._subscribers: Set[Subscriber] = set()
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._stats = {"published": 0, "dropped": 0, "resumed": 0, "resets": 0, "log_errors": 0}
+        # Set by follow_log: the task reading the change log and the event that wakes it
+        self._follower: Optional[asyncio.Task] = None
+        self._log_changed: Optional[asyncio.Event] = None
+
+    # Publishing
+
+    def publish(self, changes: List[Change]) -> None:
+        """Queue ``changes`` for every subscriber; safe to call from any thread."""
+        tracked = [change for change in changes if change.resource in _TRACKED_RESOURCES]
+        if not tracked:
+            return
+        try:
+            if self._log_changed is not None:
+                # The follower publishes them (with every other worker's) from the log
+                self.loop.call_soon_threadsafe(self._log_changed.set)
+            else:
+                self.loop.call_soon_threadsafe(self._publish, tracked)
+        except RuntimeError:
+            pass  # The loop is closed: the worker is shutting down and nobody is listening
+
+    def _publish(self, changes: List[Change]) -> None:
+        for change in changes:
+            self._sequence += 1
+            payload = format_event(f"{self.epoch}-{self._sequence}", "change", {
+                "resource": change.resource, "id": change.id, "op": change.op, "version": change.version,
+            })
+            self._recent.append((self._sequence, payload))
+            self._stats["published"] += 1
+            for subscriber in list(self._subscribers):
+                if len(subscriber.pending) >= self.queue_size:
+                    self._drop(subscriber)
+                else:
+                    subscriber.pending.append(payload)
+                    self._wake(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        subscriber.dropped = True
+        subscriber.pending.clear()
+        self._subscribers.discard(subscriber)
+        self._stats["dropped"] += 1
+        self._wake(subscriber)
+
+    @staticmethod
+    def _wake(subscriber: Subscriber) -> None:
+        if subscriber.waiter is not None and not subscriber.waiter.done():
+            subscriber.waiter.set_result(None)
+
+    def _beat(self) -> None:
+        self._heartbeat_handle = None
+        for subscriber in self._subscribers:
+            if not subscriber.pending:
+                subscriber.pending.append(HEARTBEAT)
+                self._wake(subscriber)
+        self._schedule_heartbeat()
+
+    def _schedule_heartbeat(self) -> None:
+        if self._subscribers and self._heartbeat_handle is None and self.heartbeat > 0:
+            self._heartbeat_handle = self.loop.call_later(self.heartbeat, self._beat)
+
+    # Following the change log
+
+    def follow_log(self, session_factory: Callable[[], Any], interval: float = 1.0) -> None:
+        """Publish the changes every worker logs instead of this worker's commits; call on the loop."""
+        self._log_changed = asyncio.Event()
+        self._follower = self.loop.create_task(self._follow(session_factory, interval))
+
+    async def _follow(self, session_factory: Callable[[], Any], interval: float) -> None:
+        version: Optional[int] = None
+        while True:
+            # Cleared before the read, so a commit landing during it triggers another one
+            self._log_changed.clear()
+            try:
+                newest, changes = await self.loop.run_in_executor(None, _read_log, session_factory, version)
+            except Exception as e:
+                self._stats["log_errors"] += 1
+                logger.error(f"Reading the change log for events failed: {str(e)}", exc_info=True)
+            else:
+                if changes:
+                    self._publish(changes)
+                version = max(newest, version or 0)
+            try:
+                await asyncio.wait_for(self._log_changed.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self) -> None:
+        """Stop following the change log."""
+        if self._follower is not None:
+            try:
+                self._follower.cancel()
+            except RuntimeError:
+                pass  # The loop is already closed
+            self._follower = None
+
+    # Subscribing
+
+    def is_full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def _replay(self, last_event_id: str) -> Optional[List[bytes]]:
+        """Events after ``last_event_id``, or None when they are no longer known."""
+        epoch, _, sequence = last_event_id.strip().rpartition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        if sequence > self._sequence:
+            return None
+        oldest = self._recent[0][0] if self._recent else self._sequence + 1
+        if sequence < oldest - 1:
+            return None
+        return [payload for number, payload in self._recent if number > sequence]
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscriber:
+        """Register a subscriber, queueing the events it missed since ``last_event_id``; call on the loop."""
+        subscriber = Subscriber()
+        subscriber.pending.append(f"retry: {self.retry_ms}\n\n".encode())
+        if last_event_id:
+            missed = self._replay(last_event_id)
+            if missed is None or len(missed) > self.queue_size:
+                self._stats["resets"] += 1
+                subscriber.pending.append(format_event(
+                    f"{self.epoch}-{self._sequence}", "reset", {"reason": "unknown or expired Last-Event-ID"}
+                ))
+            else:
+                self._stats["resumed"] += 1
+                subscriber.pending.extend(missed)
+        self._subscribers.add(subscriber)
+        self._schedule_heartbeat()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        The SSE body for one client.
+
+        Subscribes on the first iteration, so a response that is never sent
+        never registers. Ends when the subscriber is dropped for falling behind.
+        """
+        subscriber = self.subscribe(last_event_id)
+        try:
+            while True:
+                if subscriber.pending:
+                    chunk = b"".join(subscriber.pending)
+                    subscriber.pending.clear()
+                    yield chunk
+                    continue
+                if subscriber.dropped:
+                    return
+                subscriber.waiter = self.loop.create_future()
+                try:
+                    await subscriber.waiter
+                finally:
+                    subscriber.waiter = None
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "buffered": len(self._recent),
+        }
+
+
+def _read_log(session_factory: Callable[[], Any], since: Optional[int]) -> Tuple[int, List[Change]]:
+    from app.db.change_log import read_log
+
+    db = session_factory()
+    try:
+        return read_log(db, since)
+    finally:
+        db.close()
+
+
+_broadcaster: Optional[EventBroadcaster] = None
+
+
+def configure_events(loop: asyncio.AbstractEventLoop, **options: Any) -> EventBroadcaster:
+    """Enable the event stream on ``loop``; ``options`` are passed to ``EventBroadcaster``."""
+    global _broadcaster
+    if _broadcaster is None:
+        on_commit(lambda changes: _broadcaster.publish(changes) if _broadcaster else None)
+        register_collector("events", lambda: _broadcaster.stats() if _broadcaster else {"subscribers": 0})
+    _broadcaster = EventBroadcaster(loop, **options)
+    return _broadcaster
+
+
+def disable_events() -> None:
+    global _broadcaster
+    if _broadcaster is not None:
+        _broadcaster.close()
+    _broadcaster = None
+
+
+def get_broadcaster() -> Optional[EventBroadcaster]:
+    return _broadcaster
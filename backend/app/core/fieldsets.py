@@ -0,0 +1,109 @@
+"""
+Sparse fieldsets (``?fields=`` and ``?include=``) for read routes.
+
+A :class:`FieldSet` describes which response fields a resource exposes and the
+ORM attribute behind each one. Routes parse the query parameters into a
+:class:`Selection`; the CRUD layer turns it into ``load_only`` so unrequested
+columns are never read from the database, and :meth:`FieldSet.response`
+serializes just the selected fields through a trimmed response model built
+(and cached) from the resource's full schema.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import load_only
+
+
+class Selection:
+    """Fields requested by a client."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+
+
+class FieldSet:
+    """The selectable fields of one resource."""
+
+    def __init__(self, model: Any, schema: Type[BaseModel], attributes: Dict[str, str]):
+        # attributes maps response field name -> ORM attribute name
+        self.model = model
+        self.schema = schema
+        self.attributes = attributes
+
+    def parse(self, fields: Optional[str], include: Optional[str] = None) -> Optional[Selection]:
+        """
+        Parse ``fields`` and ``include`` query values.
+
+        Returns None when neither is given, meaning the full representation.
+        ``include`` names fields to add to the ``fields`` selection (or to the
+        default of all fields). Unknown names raise a 400.
+        """
+        if not fields and not include:
+            return None
+        requested = _split(fields) if fields else list(self.attributes)
+        included = _split(include) if include else []
+
+        unknown = [name for name in requested + included if name not in self.attributes]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "success": False,
+                    "error": "Unknown field",
+                    "error_code": "invalid_fields",
+                    "details": {
+                        "unknown": unknown,
+                        "fields": sorted(self.attributes),
+                    }
+                }
+            )
+
+        selected = ["id"]
+        for name in requested + included:
+            if name not in selected:
+                selected.append(name)
+        return Selection(tuple(selected))
+
+    def load_attributes(self, selection: Optional[Selection], extra: Sequence[str] = ()) -> Optional[List[str]]:
+        """ORM attribute names of the selected fields (plus ``extra`` response fields); None means all."""
+        if selection is None:
+            return None
+        names = list(selection.fields) + [name for name in extra if name not in selection.fields]
+        return [self.attributes[name] for name in names]
+
+    def load_options(self, selection: Optional[Selection], extra: Sequence[str] = ()) -> List[Any]:
+        """Query options loading only the selected columns (plus ``extra`` response fields)."""
+        attributes = self.load_attributes(selection, extra)
+        if attributes is None:
+            return []
+        return [load_only(*(getattr(self.model, attribute) for attribute in attributes))]
+
+    def row(self, obj: Any, selection: Selection) -> Dict[str, Any]:
+        """Read the selected fields from an ORM object without touching deferred columns."""
+        return {name: getattr(obj, self.attributes[name]) for name in selection.fields}
+
+    def adapter(self, selection: Selection, many: bool = True) -> TypeAdapter:
+        return _trimmed_adapter(self.schema, selection.fields, many)
+
+    def response(self, data: Any, selection: Selection, many: bool = True) -> Response:
+        """Validate and encode rows through the trimmed model in a single pass."""
+        adapter = self.adapter(selection, many)
+        return Response(content=adapter.dump_json(adapter.validate_python(data)), media_type="application/json")
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+@lru_cache(maxsize=256)
+def _trimmed_adapter(schema: Type[BaseModel], fields: Tuple[str, ...], many: bool) -> TypeAdapter:
+    # Sparse responses tolerate missing/null values, so every field becomes optional
+    definitions: Dict[str, Any] = {
+        name: (Optional[schema.model_fields[name].annotation], None) for name in fields
+    }
+    trimmed = create_model(f"{schema.__name__}Fields", **definitions)
+    return TypeAdapter(List[trimmed] if many else trimmed)
@@ -1,5 +1,6 @@
 import logging
 import logging.config
+import logging.handlers
 import os
 from pathlib import Path
 import time
@@ -7,27 +8,32 @@ from typing import Callable
 from fastapi import Request, Response
 import json
 from datetime import datetime
+from typing import Optional
 
-# Create logs directory if it doesn't exist
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
+from app.core.config import settings
 
-# Basic logging configuration
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.handlers.RotatingFileHandler(
-            "logs/api.log",
+# Create a logger instance
+logger = logging.getLogger("app")
+
+def configure_logging(log_dir: Optional[str] = None) -> None:
+    """
+    Log to the console and, if ``log_dir`` is given, to a rotating ``<log_dir>/api.log``.
+
+    Called by the server entry point (``server.py``, with ``LOG_DIR``); importing
+    this module does not create the directory or open the file.
+    """
+    handlers: list = [logging.StreamHandler()]
+    if log_dir:
+        # Create logs directory if it doesn't exist
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, "api.log"),
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5
-        )
-    ]
-)
+        ))
 
-# Create a logger instance
-logger = logging.getLogger("app")
+    # Basic logging configuration
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT, handlers=handlers)
 
 # Request logging middleware
 async def log_requests(request: Request, call_next: Callable) -> Response:
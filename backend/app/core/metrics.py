@@ -0,0 +1,98 @@
+"""
+Lightweight in-process metrics registry.
+
+Subsystems register a collector callable under a name; the metrics and
+health endpoints call :func:`collect` to build a JSON-serializable snapshot.
+"""
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+
+import anyio.to_thread
+
+logger = logging.getLogger(__name__)
+
+_collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+# Reference to AnyIO's default thread limiter, captured on startup so that
+# statistics can be read from any thread (the limiter lives in a RunVar).
+_thread_limiter: Optional[Any] = None
+
+
+def register_collector(name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+    """Register (or replace) a metrics collector under the given name."""
+    _collectors[name] = collector
+
+
+def collect() -> Dict[str, Any]:
+    """Run all registered collectors and return their results keyed by name."""
+    snapshot: Dict[str, Any] = {}
+    for name, collector in list(_collectors.items()):
+        try:
+            snapshot[name] = collector()
+        except Exception as e:
+            logger.error(f"Metrics collector '{name}' failed: {str(e)}")
+            snapshot[name] = {"error": str(e)}
+    return snapshot
+
+
+def configure_threadpool(size: int) -> None:
+    """
+    Resize the AnyIO thread limiter used for sync routes and dependencies.
+
+    Must be called from within the running event loop (e.g. a startup handler).
+    """
+    global _thread_limiter
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = size
+    _thread_limiter = limiter
+    logger.info(f"Threadpool size set to {size}")
+
+
+def threadpool_stats() -> Dict[str, Any]:
+    """Return in-flight and queued counts for the sync route threadpool."""
+    if _thread_limiter is None:
+        return {"configured": False}
+    stats = _thread_limiter.statistics()
+    return {
+        "configured": True,
+        "size": stats.total_tokens,
+        "in_flight": stats.borrowed_tokens,
+        "queued": stats.tasks_waiting,
+        "available": stats.total_tokens - stats.borrowed_tokens,
+    }
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Return resident (RSS) and private (USS) memory in bytes for a process.
+
+    Private memory excludes pages still shared copy-on-write with the server
+    master, so it is the real per-worker cost. Reads ``/proc`` on Linux and
+    falls back to psutil elsewhere; values are None when neither is available.
+    """
+    pid = pid or os.getpid()
+    memory: Dict[str, Any] = {"pid": pid, "rss_bytes": None, "private_bytes": None}
+    try:
+        kilobytes: Dict[str, int] = {}
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, separator, value = line.partition(":")
+                if separator and value.strip().endswith("kB"):
+                    kilobytes[name] = int(value.split()[0])
+        memory["rss_bytes"] = kilobytes["Rss"] * 1024
+        memory["private_bytes"] = (kilobytes.get("Private_Clean", 0) + kilobytes.get("Private_Dirty", 0)) * 1024
+        return memory
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_full_info()
+        memory["rss_bytes"], memory["private_bytes"] = info.rss, getattr(info, "uss", None)
+    except Exception:
+        pass
+    return memory
+
+
+register_collector("threadpool", threadpool_stats)
+register_collector("process", process_memory)
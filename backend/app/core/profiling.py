@@ -0,0 +1,279 @@
+"""
+On-demand profiling of single requests for admin callers.
+
+A request carrying ``X-Profile: 1`` (or ``?_profile=1``) together with a valid
+``X-Admin-Token`` runs under a stack sampler: a daemon thread that reads the
+Python stack of every busy thread in the worker every ``interval`` seconds
+until the response has been sent. Samples are aggregated in collapsed-stack
+format (``root;frame;frame count`` per line, as read by flamegraph.pl,
+speedscope and inferno) and stored in a ``ProfileStore``, a bounded on-disk
+ring shared by the workers on the host. The response carries the capture id
+in ``X-Profile-Id``; ``/api/v1/debug/profiles`` lists and downloads captures.
+Without a valid token the flag is ignored and the request is served as usual.
+
+Stacks are rooted at ``event-loop`` for the thread serving the request and
+``worker`` for threadpool threads running sync routes and dependencies. Other
+requests served by the same worker while the capture runs are sampled too, so
+profile on a quiet instance for clean captures.
+
+``ProfilingMiddleware`` is only installed when ``ADMIN_TOKEN`` is set and
+``PROFILING_ENABLED`` is on, so normal requests pay nothing otherwise; when it
+is installed they pay one scan of the headers and query string.
+"""
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl
+
+import anyio.to_thread
+
+from app.core.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_ID = re.compile(r"^\d+-\d+-\d+$")
+
+# Frames deeper than this are cut at the root end
+MAX_DEPTH = 128
+
+# Leaf frames of threads that are parked, not working
+_IDLE_FRAMES = {("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get")}
+
+_counters = {"captures": 0, "denied": 0, "busy": 0}
+
+
+def is_admin_token(token: Optional[str], expected: str) -> bool:
+    """Constant-time check of ``token`` against the configured admin token; never true when none is configured."""
+    return bool(expected) and token is not None and hmac.compare_digest(token.encode(), expected.encode())
+
+
+def _short_path(filename: str) -> str:
+    """``filename`` relative to the longest ``sys.path`` entry containing it (module-style path)."""
+    best = ""
+    for entry in sys.path:
+        entry = os.path.join(os.path.abspath(entry or "."), "")
+        if filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best):]
+
+
+class StackSampler:
+    """Collects collapsed stacks of busy threads from a background thread."""
+
+    def __init__(self, interval: float, max_duration: float, loop_thread: Optional[int] = None):
+        self.interval = interval
+        self.max_duration = max_duration
+        self.loop_thread = loop_thread if loop_thread is not None else threading.get_ident()
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if ident != self.loop_thread:
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                    continue
+            frames = []
+            while frame is not None and len(frames) < MAX_DEPTH:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            frames.append("event-loop" if ident == self.loop_thread else "worker")
+            key = ";".join(reversed(frames))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_duration
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            self.sample()
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, int]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class ProfileStore:
+    """
+    Captures as ``<id>.collapsed`` plus ``<id>.json`` metadata in ``directory``.
+
+    Ids start with the capture time in milliseconds; once more than ``size``
+    captures exist the oldest are deleted.
+    """
+
+    def __init__(self, directory: str, size: int = 50):
+        self.directory = Path(directory)
+        self.size = size
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        with self._lock:
+            self._sequence += 1
+            return f"{int(time.time() * 1000)}-{os.getpid()}-{self._sequence}"
+
+    def save(self, capture_id: str, stacks: Dict[str, int], meta: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}\n" for stack, count in sorted(stacks.items())]
+        # Stacks first: a capture is listed once its metadata exists
+        (self.directory / f"{capture_id}.collapsed").write_text("".join(lines))
+        (self.directory / f"{capture_id}.json").write_text(json.dumps({"id": capture_id, **meta}))
+        self._trim()
+
+    def _ids(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        ids = [path.stem for path in self.directory.glob("*.json") if CAPTURE_ID.match(path.stem)]
+        return sorted(ids, key=lambda capture_id: tuple(int(part) for part in capture_id.split("-")))
+
+    def _trim(self) -> None:
+        ids = self._ids()
+        for capture_id in ids[:max(0, len(ids) - self.size)]:
+            for suffix in (".json", ".collapsed"):
+                (self.directory / f"{capture_id}{suffix}").unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of the stored captures, newest first."""
+        captures = []
+        for capture_id in reversed(self._ids()):
+            try:
+                captures.append(json.loads((self.directory / f"{capture_id}.json").read_text()))
+            except (OSError, ValueError):
+                continue  # Trimmed by another worker meanwhile
+        return captures
+
+    def path(self, capture_id: str) -> Optional[Path]:
+        """Path of the collapsed stacks for ``capture_id``, or ``None`` if unknown."""
+        if not CAPTURE_ID.match(capture_id):
+            return None
+        path = self.directory / f"{capture_id}.collapsed"
+        return path if path.exists() else None
+
+
+_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """The process-wide store configured by ``PROFILE_DIR``/``PROFILE_RING_SIZE``."""
+    global _store
+    if _store is None:
+        from app.core.config import settings
+
+        _store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_RING_SIZE)
+    return _store
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling requests that ask for it with a valid admin token; others pass through."""
+
+    def __init__(self, app, token: str, store: ProfileStore, interval: float = 0.001, max_duration: float = 30.0):
+        self.app = app
+        self.token = token
+        self.store = store
+        self.interval = interval
+        self.max_duration = max_duration
+        self._active = False
+        register_collector("profiling", lambda: {**_counters, "active": self._active})
+
+    @staticmethod
+    def _requested(scope) -> Optional[str]:
+        """``None`` if no profile was asked for, else the admin token sent (empty if missing)."""
+        query_string = scope.get("query_string", b"")
+        # Cheap substring test first; only parse query strings that may carry the flag
+        flagged = b"_profile=" in query_string and any(
+            name == "_profile" and value in ("1", "true")
+            for name, value in parse_qsl(query_string.decode("latin-1"))
+        )
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                flagged = flagged or value in (b"1", b"true")
+            elif name == b"x-admin-token":
+                token = value.decode("latin-1")
+        return (token or "") if flagged else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = self._requested(scope)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not is_admin_token(token, self.token):
+            # Not an admin: ignore the flag rather than fail a request that would otherwise succeed
+            _counters["denied"] += 1
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            # One capture at a time per worker; serve this one normally
+            _counters["busy"] += 1
+            await self.app(scope, receive, self._with_header(send, b"x-profile", b"busy"))
+            return
+
+        capture_id = self.store.new_id()
+        status = {"code": 500}
+
+        async def send_profiled(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", capture_id.encode())]
+            await send(message)
+
+        self._active = True
+        started = time.perf_counter()
+        sampler = StackSampler(self.interval, self.max_duration).start()
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            stacks = sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._active = False
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status["code"],
+                "duration_ms": round(duration_ms, 2),
+                "samples": sampler.samples,
+                "interval_ms": self.interval * 1000,
+                "created_at": time.time(),
+            }
+            try:
+                await anyio.to_thread.run_sync(self.store.save, capture_id, stacks, meta)
+                _counters["captures"] += 1
+            except OSError as e:
+                logger.error(f"Failed to store profile {capture_id}: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(name, value)]
+            await send(message)
+        return send_with_header
@@ -0,0 +1,294 @@
+"""
+Rate limiting middleware enforcing ``RATE_LIMIT`` requests per ``RATE_LIMIT_WINDOW``.
+
+Requests are keyed by API key (``X-API-Key``) when the key is one of the
+configured ``api_keys``, otherwise by client IP: an unchecked key would let a
+client pick a fresh bucket per request. Behind a trusted proxy the client IP
+is the rightmost ``X-Forwarded-For`` entry, the one the proxy appended. Limits use a sliding-window counter: the previous window's count is
+weighted by how much of it still overlaps the sliding window, which gives a
+smooth limit with two integers of state per key.
+
+State lives in a store. ``MmapRateLimitStore`` keeps it in a memory-mapped file
+so that every uvicorn worker on the host shares the same counters; each slot is
+guarded by its own ``fcntl`` byte-range lock, so there is no global lock on the
+hot path. ``MemoryRateLimitStore`` is a per-process fallback.
+"""
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.metrics import register_collector
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Result of a hit: (allowed, remaining, retry_after_seconds)
+HitResult = Tuple[bool, int, int]
+
+_counters = {"allowed": 0, "limited": 0}
+
+
+def _sliding_window(
+    start: int, current: int, previous: int, limit: int, window: int, now: float
+) -> Tuple[int, int, int, HitResult]:
+    """
+    Apply one hit to a sliding-window counter.
+
+    Returns the new ``(start, current, previous)`` state and the hit result.
+    """
+    window_start = int(now) - int(now) % window
+    if start != window_start:
+        previous = current if start == window_start - window else 0
+        current = 0
+        start = window_start
+
+    elapsed = now - window_start
+    weight = (window - elapsed) / window
+    estimate = previous * weight + current
+
+    if estimate + 1 > limit:
+        if current + 1 > limit or previous == 0:
+            retry_after = window - elapsed
+        else:
+            # Time until the previous window's weight has decayed enough for one more request
+            retry_after = (window - elapsed) - (limit - current - 1) * window / previous
+        return start, current, previous, (False, 0, max(1, math.ceil(retry_after)))
+
+    current += 1
+    return start, current, previous, (True, max(0, int(limit - estimate - 1)), 0)
+
+
+class MemoryRateLimitStore:
+    """Per-process rate limit store. Counters are not shared between workers."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._state: Dict[str, List[int]] = {}
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> HitResult:
+        state = self._state.get(key)
+        if state is None:
+            if len(self._state) >= self.max_keys:
+                self._evict(now)
+            state = self._state[key] = [0, 0, 0, window]
+        start, current, previous, result = _sliding_window(
+            state[0], state[1], state[2], limit, window, now
+        )
+        state[0], state[1], state[2] = start, current, previous
+        return result
+
+    def _evict(self, now: float) -> None:
+        """Drop keys whose state is older than two windows (or everything if none are)."""
+        stale = [k for k, s in self._state.items() if s[0] + 2 * s[3] <= now]
+        for key in stale or list(self._state):
+            del self._state[key]
+
+
+class MmapRateLimitStore:
+    """
+    Rate limit store backed by a memory-mapped file shared by all local workers.
+
+    The file is a fixed-size open-addressed table. Each 32-byte slot holds the
+    key hash, window start, current and previous counts and the window length,
+    and is locked individually with ``fcntl.lockf`` while it is updated.
+    """
+
+    SLOT = struct.Struct("<QqIII4x")
+    PROBES = 4
+
+    def __init__(self, path: str, slots: int = 8192):
+        if fcntl is None:
+            raise RuntimeError("MmapRateLimitStore requires fcntl (POSIX only)")
+        self.path = path
+        self.slots = slots
+        size = slots * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes (unlike hash()); 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def _hit_slot(
+        self, offset: int, key_hash: int, limit: int, window: int, now: float, claim: str
+    ) -> Tuple[Optional[HitResult], bool]:
+        """
+        Apply the hit to the slot at ``offset`` while holding its lock.
+
+        The slot is used if it holds ``key_hash``; otherwise it is claimed
+        when ``claim`` is ``"free"`` and the slot is empty or expired, or
+        always when ``claim`` is ``"evict"``. Returns the hit result (None if
+        the slot was left alone) and whether the slot is free.
+        """
+        slot_size = self.SLOT.size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, slot_size, offset)
+        try:
+            stored_hash, start, current, previous, stored_window = self.SLOT.unpack_from(self._mm, offset)
+            if stored_hash != key_hash:
+                free = stored_hash == 0 or start + 2 * stored_window <= now
+                if not (claim == "evict" or (claim == "free" and free)):
+                    return None, free
+                start, current, previous = 0, 0, 0
+            start, current, previous, result = _sliding_window(start, current, previous, limit, window, now)
+            self.SLOT.pack_into(self._mm, offset, key_hash, start, current, previous, window)
+            return result, False
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, slot_size, offset)
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> HitResult:
+        key_hash = self._hash(key)
+        base = key_hash % self.slots
+        offsets = [((base + probe) % self.slots) * self.SLOT.size for probe in range(self.PROBES)]
+        # Look for the key in every probe before claiming one: claiming a free slot
+        # ahead of the key's live slot would give it a second slot and reset its count
+        free = []
+        for offset in offsets:
+            result, is_free = self._hit_slot(offset, key_hash, limit, window, now, claim="none")
+            if result is not None:
+                return result
+            if is_free:
+                free.append(offset)
+        # Claim a free slot (re-checked under its lock: another worker may have taken it),
+        # or evict the last probe when every slot is taken
+        for offset in free:
+            result, _ = self._hit_slot(offset, key_hash, limit, window, now, claim="free")
+            if result is not None:
+                return result
+        return self._hit_slot(offsets[-1], key_hash, limit, window, now, claim="evict")[0]
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
+
+
+def parse_overrides(spec: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``"prefix=limit/window,..."`` into ``(prefix, limit, window)`` rules.
+
+    Rules are returned longest prefix first so the most specific one wins.
+    """
+    rules = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            prefix, rule = item.split("=", 1)
+            limit, window = rule.split("/", 1)
+            rules.append((prefix.strip(), int(limit), int(window)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit override: {item!r}")
+    return sorted(rules, key=lambda r: len(r[0]), reverse=True)
+
+
+def create_rate_limit_store(kind: str, path: Optional[str] = None):
+    """Build the configured store, falling back to memory where mmap is unavailable."""
+    if kind == "mmap":
+        if fcntl is None:
+            logger.warning("fcntl unavailable; rate limits will not be shared between workers")
+            return MemoryRateLimitStore()
+        return MmapRateLimitStore(path or os.path.join(tempfile.gettempdir(), "api-jd-ratelimit.bin"))
+    return MemoryRateLimitStore()
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware returning 429 with ``Retry-After`` when a client exceeds its limit."""
+
+    def __init__(
+        self,
+        app,
+        store,
+        limit: int,
+        window: int,
+        overrides: Optional[List[Tuple[str, int, int]]] = None,
+        trust_proxy: bool = False,
+        api_keys: Iterable[str] = (),
+    ):
+        self.app = app
+        self.store = store
+        self.limit = limit
+        self.window = window
+        self.overrides = overrides or []
+        self.trust_proxy = trust_proxy
+        self.api_keys = frozenset(key.encode("latin-1") for key in api_keys)
+
+    def _rule_for(self, path: str) -> Tuple[str, int, int]:
+        for prefix, limit, window in self.overrides:
+            if path.startswith(prefix):
+                return prefix, limit, window
+        return "*", self.limit, self.window
+
+    def _client_key(self, scope) -> str:
+        forwarded = None
+        for name, value in scope["headers"]:
+            if name == b"x-api-key" and value in self.api_keys:
+                return "key:" + value.decode("latin-1")
+            if name == b"x-forwarded-for":
+                forwarded = value
+        if self.trust_proxy and forwarded:
+            # Entries to the left were sent by the client and can be anything
+            return "ip:" + forwarded.rsplit(b",", 1)[-1].strip().decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule, limit, window = self._rule_for(scope["path"])
+        if limit <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, remaining, retry_after = self.store.hit(
+            f"{rule}|{self._client_key(scope)}", limit, window, time.time()
+        )
+        limit_headers = [
+            (b"x-ratelimit-limit", str(limit).encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+        ]
+
+        if not allowed:
+            _counters["limited"] += 1
+            body = json.dumps({
+                "success": False,
+                "error": "Rate limit exceeded",
+                "error_code": "RATE_LIMIT_EXCEEDED",
+                "details": {"retry_after": retry_after},
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    *limit_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        _counters["allowed"] += 1
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+register_collector("rate_limit", lambda: dict(_counters))
@@ -0,0 +1,132 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When a cache entry expires or a worker cold-starts, many identical GETs can
+arrive before the first one finishes. Each would run the same query and
+serialize the same payload in its own threadpool thread. ``SingleFlight``
+runs the first call for a key (the leader). Concurrent calls with the same key
+(followers) await the leader's result on the event loop instead of taking
+threadpool threads of their own. The leader's work is shielded, so a leader
+that disconnects still completes the result for its followers.
+
+Followers get the leader's exception if it fails. A follower that waits longer
+than ``timeout`` stops waiting (``FlightTimeout``). ``CoalescingMiddleware``
+then runs the request on its own, so a stuck leader slows its followers
+instead of failing them.
+
+``CoalescingMiddleware`` keys GETs under the configured path prefixes by
+normalized path plus sorted query parameters. It replays the captured response
+messages to every follower. Requests carrying credentials or conditional and
+range headers are never shared.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Tuple, TypeVar
+from urllib.parse import parse_qsl
+
+from app.core.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FlightTimeout(Exception):
+    """A follower gave up waiting for the leader's result."""
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats = {"leaders": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._flights)}
+
+    def _finished(self, key: Hashable, flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled() and flight.exception() is not None:
+            self._stats["errors"] += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()``, sharing one call among concurrent callers with the same key.
+
+        Raises:
+            FlightTimeout: This caller was a follower and the leader took longer than ``timeout``
+        """
+        flight = self._flights.get(key)
+        # A flight left behind by a closed event loop (e.g. between test clients) can never finish
+        if flight is None or flight.done() or flight.get_loop() is not asyncio.get_running_loop():
+            self._stats["leaders"] += 1
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finished(key, done))
+            return await asyncio.shield(flight)
+
+        self._stats["coalesced"] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise FlightTimeout(key) from None
+
+
+def request_key(scope: Dict[str, Any]) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """``(method, path, query)`` with the trailing slash dropped and query parameters sorted."""
+    query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    return scope["method"], scope["path"].rstrip("/") or "/", tuple(sorted(query))
+
+
+class CoalescingMiddleware:
+    """Pure ASGI middleware sharing one response among identical concurrent GETs."""
+
+    # Requests whose response may differ per caller, or is not a plain full 200
+    _UNSHARED_HEADERS = {
+        b"authorization", b"cookie", b"x-admin-token", b"x-profile", b"if-none-match", b"if-modified-since", b"range",
+    }
+
+    def __init__(self, app, paths: Iterable[str] = (), timeout: float = 10.0):
+        self.app = app
+        self.prefixes = tuple({p.rstrip("/") or "/" for p in paths if p})
+        self.flights = SingleFlight(timeout)
+        register_collector("singleflight", self.flights.stats)
+
+    def _shared(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        path = scope["path"].rstrip("/") or "/"
+        if not any(path == prefix or path.startswith(prefix + "/") for prefix in self.prefixes):
+            return False
+        return not any(name in self._UNSHARED_HEADERS for name, _ in scope["headers"])
+
+    async def __call__(self, scope, receive, send):
+        if not self._shared(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def capture() -> List[Dict[str, Any]]:
+            messages: List[Dict[str, Any]] = []
+
+            async def collect(message):
+                messages.append(message)
+
+            await self.app(scope, receive, collect)
+            return messages
+
+        try:
+            messages = await self.flights.do(request_key(scope), capture)
+        except FlightTimeout:
+            await self.app(scope, receive, send)
+            return
+        for message in messages:
+            # Outer middleware may edit messages in place, so every caller gets its own copy
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", []))}
+            else:
+                message = dict(message)
+            await send(message)
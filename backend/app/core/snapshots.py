@@ -0,0 +1,380 @@
+"""
+Pre-rendered JSON snapshots of the profile and project catalog.
+
+The generator renders the profile, the project list and every project detail
+to canonical JSON (plus a gzip variant) under ``SNAPSHOT_DIR``. Files are
+content-addressed (``projects.<hash>.json``) and never modified once written;
+``manifest.json`` maps each snapshot name to its current file and ETag and is
+replaced atomically, so a regeneration switches the whole set at once and
+readers in any worker never see a half-written file.
+
+Read endpoints call :func:`snapshot_response`, which serves the file with a
+zero-copy ``FileResponse`` (or a 304) and returns None when no snapshot exists
+so the caller can fall back to the database. After a commit that touches
+profiles or projects, a background thread re-renders only what the changed
+rows appear in (the profile, the project list and each changed project's
+detail) and publishes a manifest patched with them; the first generation, and
+any without a manifest to patch, renders everything.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+
+from app.core.compression import negotiate_encoding
+from app.db.signals import Change, on_commit
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+_LOCK = ".manifest.lock"
+PROFILE = "profile"
+PROJECTS = "projects"
+PROJECT_LIST_LIMIT = 100  # Matches the default page size of the project list route
+
+# Unreferenced snapshot files are kept this long for readers that are mid-response
+_CLEANUP_GRACE_SECONDS = 60
+
+_TRACKED_RESOURCES = {"profiles", "projects"}
+
+
+def project_snapshot_name(project_id: Any) -> str:
+    return f"{PROJECTS}/{project_id}"
+
+
+def _canonical_json(data: Any) -> bytes:
+    return json.dumps(jsonable_encoder(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _render_profile(db) -> Optional[Dict[str, Any]]:
+    """The first profile as the v1 profile route returns it, or None if there is none (or it is invalid)."""
+    from pydantic import ValidationError
+    from app.db.models.profile import Profile
+    from app.schemas.profile import Profile as ProfileSchema
+
+    profile = db.query(Profile).order_by(Profile.id).first()
+    if profile is None:
+        return None
+    try:
+        return ProfileSchema.model_validate(profile.to_dict()).model_dump(mode="json")
+    except ValidationError as e:
+        # Serve it from the database instead, where the route reports the error
+        logger.warning(f"Profile {profile.id} does not match the response model, not snapshotting it: {str(e)}")
+        return None
+
+
+def _render_projects(query) -> List[Dict[str, Any]]:
+    from app.schemas.project import Project as ProjectSchema
+
+    return [ProjectSchema.model_validate(project.to_dict()).model_dump(mode="json") for project in query]
+
+
+def render_snapshots(db) -> Dict[str, Any]:
+    """Query the database and return snapshot name -> JSON-serializable payload."""
+    from app.db.models.project import Project
+
+    payloads: Dict[str, Any] = {}
+
+    profile = _render_profile(db)
+    if profile is not None:
+        payloads[PROFILE] = profile
+
+    projects = _render_projects(db.query(Project).order_by(Project.id))
+    payloads[PROJECTS] = projects[:PROJECT_LIST_LIMIT]
+    for project in projects:
+        payloads[project_snapshot_name(project["id"])] = project
+    return payloads
+
+
+def render_changed_snapshots(db, changes: Iterable[Tuple[str, Any]]) -> Tuple[Dict[str, Any], Set[str]]:
+    """
+    Re-render the snapshots the changed ``(table, id)`` rows appear in.
+
+    Returns the new payloads and the names of snapshots to drop (deleted projects,
+    or a profile that no longer renders).
+    """
+    from app.db.models.project import Project
+
+    payloads: Dict[str, Any] = {}
+    removed: Set[str] = set()
+    project_ids = {row_id for resource, row_id in changes if resource == "projects"}
+
+    if any(resource == "profiles" for resource, _ in changes):
+        profile = _render_profile(db)
+        if profile is not None:
+            payloads[PROFILE] = profile
+        else:
+            removed.add(PROFILE)
+
+    if project_ids:
+        payloads[PROJECTS] = _render_projects(db.query(Project).order_by(Project.id).limit(PROJECT_LIST_LIMIT))
+        for project in _render_projects(db.query(Project).filter(Project.id.in_(project_ids))):
+            payloads[project_snapshot_name(project["id"])] = project
+        removed.update(name for name in map(project_snapshot_name, project_ids) if name not in payloads)
+    return payloads, removed
+
+
+@contextmanager
+def _manifest_lock(directory: str) -> Iterator[None]:
+    # Writers in several workers patch the same manifest; serialize their read-modify-write
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(os.path.join(directory, _LOCK), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """The published manifest, or None if there is none (or it cannot be read)."""
+    try:
+        with open(os.path.join(directory, MANIFEST), "rb") as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read snapshot manifest: {str(e)}")
+        return None
+
+
+def write_snapshots(
+    directory: str,
+    payloads: Dict[str, Any],
+    base: Optional[Dict[str, Dict[str, str]]] = None,
+    removed: Iterable[str] = (),
+) -> Dict[str, Dict[str, str]]:
+    """
+    Write payloads as content-addressed files and atomically publish a new manifest.
+
+    The manifest lists exactly ``payloads`` unless ``base`` is given, in which
+    case it is ``base`` with ``payloads`` updated and ``removed`` dropped.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest: Dict[str, Dict[str, str]] = dict(base) if base is not None else {}
+    for name in removed:
+        manifest.pop(name, None)
+    for name, payload in payloads.items():
+        body = _canonical_json(payload)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        filename = f"{name.replace('/', '-')}.{digest}.json"
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            _atomic_write(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+            _atomic_write(path, body)
+        manifest[name] = {"file": filename, "gzip": filename + ".gz", "etag": f'"{digest}"'}
+
+    _atomic_write(os.path.join(directory, MANIFEST), json.dumps(manifest, sort_keys=True).encode())
+    _cleanup(directory, manifest)
+    return manifest
+
+
+def _cleanup(directory: str, manifest: Dict[str, Dict[str, str]]) -> None:
+    referenced = {MANIFEST, _LOCK}
+    for entry in manifest.values():
+        referenced.update((entry["file"], entry["gzip"]))
+    cutoff = time.time() - _CLEANUP_GRACE_SECONDS
+    for filename in os.listdir(directory):
+        if filename in referenced:
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def generate_snapshots(db, directory: str) -> Dict[str, Dict[str, str]]:
+    """Render and publish a full set of snapshots from the given session."""
+    payloads = render_snapshots(db)
+    os.makedirs(directory, exist_ok=True)
+    with _manifest_lock(directory):
+        manifest = write_snapshots(directory, payloads)
+    logger.info(f"Wrote {len(manifest)} snapshots to {directory}")
+    return manifest
+
+
+def update_snapshots(db, directory: str, changes: Iterable[Tuple[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """Re-render the snapshots affected by ``changes`` and patch the manifest; a full run if there is none."""
+    changes = list(changes)
+    os.makedirs(directory, exist_ok=True)
+    with _manifest_lock(directory):
+        base = read_manifest(directory)
+        if base is not None:
+            payloads, removed = render_changed_snapshots(db, changes)
+            manifest = write_snapshots(directory, payloads, base, removed)
+            logger.debug(f"Updated {len(payloads)} and removed {len(removed)} snapshots in {directory}")
+            return manifest
+    return generate_snapshots(db, directory)
+
+
+class SnapshotStore:
+    """Reads the manifest (reloading it when it changes on disk) and serves snapshot files."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._manifest: Dict[str, Dict[str, str]] = {}
+        self._manifest_stamp: Optional[Tuple[int, int]] = None
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            stat_result = os.stat(os.path.join(self.directory, MANIFEST))
+        except FileNotFoundError:
+            self._manifest, self._manifest_stamp = {}, None
+            return self._manifest
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+        if stamp != self._manifest_stamp:
+            manifest = read_manifest(self.directory)
+            if manifest is None:
+                return {}
+            self._manifest, self._manifest_stamp = manifest, stamp
+        return self._manifest
+
+    def lookup(self, name: str) -> Optional[Dict[str, str]]:
+        return self._load_manifest().get(name)
+
+    def response(self, request: Request, name: str) -> Optional[Response]:
+        entry = self.lookup(name)
+        if entry is None:
+            return None
+
+        etag = entry["etag"]
+        headers = {"etag": etag, "vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        filename = entry["file"]
+        # Snapshots are only pre-compressed with gzip
+        if negotiate_encoding(request.headers.get("accept-encoding", ""), codings=("gzip",)) == "gzip":
+            filename = entry["gzip"]
+            headers["content-encoding"] = "gzip"
+        path = os.path.join(self.directory, filename)
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return FileResponse(path, headers=headers, media_type="application/json", stat_result=stat_result)
+
+
+class SnapshotWriter:
+    """Regenerates snapshots in a background thread, coalescing bursts of writes."""
+
+    def __init__(self, directory: str, session_factory: Callable[[], Any]):
+        self.directory = directory
+        self.session_factory = session_factory
+        # Rows changed since the last run; None means render everything
+        self._changes: Optional[Set[Tuple[str, Any]]] = None
+        # Set when a run failed: the changes it dropped are only recovered by a full run
+        self._stale = False
+        self._pending = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def schedule(self, changes: Optional[Iterable[Tuple[str, Any]]] = None) -> None:
+        """Regenerate in the background: the snapshots of the changed ``(table, id)`` rows, or all."""
+        with self._lock:
+            if changes is None or (self._changes is None and self._pending.is_set()):
+                self._changes = None
+            else:
+                self._changes = (self._changes if self._pending.is_set() else set()) | set(changes)
+            self._idle.clear()
+            self._pending.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread.start()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no regeneration is pending (mainly for tests)."""
+        return self._idle.wait(timeout)
+
+    def generate(self, changes: Optional[Iterable[Tuple[str, Any]]] = None) -> None:
+        db = self.session_factory()
+        try:
+            if changes is None:
+                generate_snapshots(db, self.directory)
+            else:
+                update_snapshots(db, self.directory, changes)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while True:
+            if not self._pending.wait(timeout=5):
+                # Exit when idle, unless a write slipped in while we were timing out
+                with self._lock:
+                    if not self._pending.is_set():
+                        self._thread = None
+                        self._idle.set()
+                        return
+                continue
+            with self._lock:
+                self._pending.clear()
+                changes, self._changes = (None if self._stale else self._changes), None
+            try:
+                self.generate(changes)
+                self._stale = False
+            except Exception as e:
+                self._stale = True
+                logger.error(f"Snapshot generation failed: {str(e)}", exc_info=True)
+            with self._lock:
+                if not self._pending.is_set():
+                    self._idle.set()
+
+    def on_changes(self, changes: "list[Change]") -> None:
+        changed = [(change.resource, change.id) for change in changes if change.resource in _TRACKED_RESOURCES]
+        if changed:
+            self.schedule(changed)
+
+
+_store: Optional[SnapshotStore] = None
+_writer: Optional[SnapshotWriter] = None
+
+
+def configure_snapshots(directory: str, session_factory: Callable[[], Any]) -> SnapshotWriter:
+    """Enable snapshot serving from ``directory`` and regeneration after writes."""
+    global _store, _writer
+    _store = SnapshotStore(directory)
+    if _writer is None:
+        on_commit(lambda changes: _writer.on_changes(changes) if _writer else None)
+    _writer = SnapshotWriter(directory, session_factory)
+    return _writer
+
+
+def snapshot_response(request: Request, name: str) -> Optional[Response]:
+    """Serve the named snapshot, or return None if snapshots are disabled or missing."""
+    if _store is None:
+        return None
+    return _store.response(request, name)
@@ -0,0 +1,37 @@
+from collections import Counter
+from typing import Any, Dict
+from sqlalchemy.orm import Session
+
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.schemas.portfolio import Portfolio
+
+def get_portfolio(db: Session, *, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """
+    Build the portfolio document: profile, a page of projects and skill counts.
+
+    Skills are stored inline on each project row, so the whole document takes
+    exactly three queries (first profile, the page of projects, every project's
+    skills) however many projects exist. Skill counts and ``total_projects``
+    cover all projects, not just the page.
+    """
+    profile = db.query(Profile).order_by(Profile.id).first()
+    projects = db.query(Project).order_by(Project.id).offset(skip).limit(limit).all()
+
+    skill_counts: Counter = Counter()
+    total_projects = 0
+    for (skills,) in db.query(Project.skills):
+        total_projects += 1
+        # Count each skill once per project, ignoring case differences
+        skill_counts.update({skill.strip().lower() for skill in skills or [] if skill.strip()})
+
+    portfolio = Portfolio(
+        profile=profile.to_dict() if profile else None,
+        projects=[project.to_dict() for project in projects],
+        total_projects=total_projects,
+        skills=[
+            {"name": name, "count": count}
+            for name, count in sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))
+        ],
+    )
+    return portfolio.model_dump(mode="json")
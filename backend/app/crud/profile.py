@@ -1,23 +1,52 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from fastapi.encoders import jsonable_encoder
 
+from app.core.fieldsets import FieldSet, Selection
+from app.db.identity_cache import cached_get, cached_get_by
 from app.db.models.profile import Profile
-from app.schemas.profile import ProfileCreate, ProfileUpdate
+from app.db.records import select_records
+from app.schemas.profile import Profile as ProfileSchema, ProfileCreate, ProfileUpdate
 
-def get_profile(db: Session, profile_id: int) -> Optional[Profile]:
-    """Get a profile by ID."""
-    return db.query(Profile).filter(Profile.id == profile_id).first()
+# Fields selectable with ?fields= and ?include= on profile routes
+PROFILE_FIELDS = FieldSet(
+    Profile,
+    ProfileSchema,
+    {
+        name: name for name in (
+            "id", "name", "email", "title", "location", "about", "github_url", "linkedin_url",
+            "twitter_url", "profile_picture_url", "created_at", "updated_at",
+        )
+    },
+)
+
+def get_profile(db: Session, profile_id: int, selection: Optional[Selection] = None) -> Optional[Profile]:
+    """
+    Get a profile by ID, loading only the selected columns if a selection is given.
+
+    Served from the identity cache when it is enabled; cached profiles have every column loaded.
+    """
+    return cached_get(
+        db, Profile, profile_id,
+        lambda: db.query(Profile).options(*PROFILE_FIELDS.load_options(selection)).filter(Profile.id == profile_id).first()
+    )
 
 def get_profile_by_email(db: Session, email: str) -> Optional[Profile]:
-    """Get a profile by email (case-insensitive)."""
-    return db.query(Profile).filter(Profile.email.ilike(email)).first()
+    """Get a profile by email (case-insensitive), from the identity cache when it is enabled."""
+    return cached_get_by(db, Profile, "email", email, lambda: db.query(Profile).filter(Profile.email.ilike(email)).first())
 
 def get_profiles(
-    db: Session, *, skip: int = 0, limit: int = 100
+    db: Session, *, skip: int = 0, limit: int = 100, selection: Optional[Selection] = None
 ) -> list[Profile]:
-    """Get multiple profiles with pagination."""
-    return db.query(Profile).offset(skip).limit(limit).all()
+    """Get multiple profiles with pagination, loading only the selected columns if given."""
+    query = db.query(Profile).options(*PROFILE_FIELDS.load_options(selection)).order_by(Profile.id)
+    return query.offset(skip).limit(limit).all()
+
+def get_profile_records(
+    db: Session, *, skip: int = 0, limit: int = 100, selection: Optional[Selection] = None
+) -> List[Any]:
+    """Read-only ``get_profiles``: the same rows as ``__slots__`` records built from a Core query."""
+    return select_records(db, Profile, PROFILE_FIELDS.load_attributes(selection), skip=skip, limit=limit)
 
 def create_profile(db: Session, *, obj_in: ProfileCreate) -> Profile:
     """Create a new profile."""
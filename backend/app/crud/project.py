@@ -1,13 +1,38 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from sqlalchemy.orm import Session
-from fastapi.encoders import jsonable_encoder
 
+from app.core.fieldsets import FieldSet, Selection
+from app.db.identity_cache import cached_get
 from app.db.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.db.records import select_records
+from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
 
-def get_project(db: Session, project_id: int) -> Optional[Project]:
-    """Get a project by ID."""
-    return db.query(Project).filter(Project.id == project_id).first()
+# Fields selectable with ?fields= on project routes (response name -> model attribute)
+PROJECT_FIELDS = FieldSet(Project, ProjectSchema, {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "skills": "skills",
+    "github_url": "github_url",
+    "demo_url": "demo_url",
+    "image_url": "image_url",
+    "is_featured": "is_featured",
+    "status": "status",
+    "metadata": "project_metadata",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+})
+
+def get_project(db: Session, project_id: int, selection: Optional[Selection] = None) -> Optional[Project]:
+    """
+    Get a project by ID, loading only the selected columns if a selection is given.
+
+    Served from the identity cache when it is enabled; cached projects have every column loaded.
+    """
+    return cached_get(
+        db, Project, project_id,
+        lambda: db.query(Project).options(*PROJECT_FIELDS.load_options(selection)).filter(Project.id == project_id).first()
+    )
 
 def get_projects(
     db: Session, 
@@ -15,23 +40,77 @@ def get_projects(
     skip: int = 0, 
     limit: int = 100,
     featured: Optional[bool] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    selection: Optional[Selection] = None,
+    extra_fields: Sequence[str] = ()
 ) -> List[Project]:
-    """Get multiple projects with optional filtering and pagination."""
-    query = db.query(Project)
+    """
+    Get multiple projects with optional filtering and pagination.
+
+    With a selection only the selected columns (plus ``extra_fields``) are loaded.
+    """
+    query = db.query(Project).options(*PROJECT_FIELDS.load_options(selection, extra_fields))
     
     if featured is not None:
         query = query.filter(Project.is_featured == featured)
     if status:
         query = query.filter(Project.status == status)
         
-    return query.offset(skip).limit(limit).all()
+    return query.order_by(Project.id).offset(skip).limit(limit).all()
+
+def get_project_records(
+    db: Session,
+    *,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    featured: Optional[bool] = None,
+    status: Optional[str] = None,
+    selection: Optional[Selection] = None,
+    extra_fields: Sequence[str] = ()
+) -> List[Any]:
+    """
+    Read-only ``get_projects``: the same rows as lightweight ``__slots__`` records.
+
+    Selects the needed columns through SQLAlchemy Core, bypassing ORM instance
+    construction. Use it for responses that only read the rows.
+    """
+    criteria = []
+    if featured is not None:
+        criteria.append(Project.is_featured == featured)
+    if status:
+        criteria.append(Project.status == status)
+    return select_records(
+        db, Project, PROJECT_FIELDS.load_attributes(selection, extra_fields), criteria, skip=skip, limit=limit
+    )
+
+def get_projects_by_ids(
+    db: Session, ids: Sequence[int], selection: Optional[Selection] = None
+) -> Tuple[List[Project], List[int]]:
+    """
+    Get projects by ID with a single IN query.
+
+    Returns the found projects in the order of ``ids`` (duplicates removed) and
+    the IDs that do not exist.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return [], []
+    query = db.query(Project).options(*PROJECT_FIELDS.load_options(selection)).filter(Project.id.in_(unique_ids))
+    by_id = {project.id: project for project in query.all()}
+    found = [by_id[project_id] for project_id in unique_ids if project_id in by_id]
+    missing = [project_id for project_id in unique_ids if project_id not in by_id]
+    return found, missing
+
+def _column_values(obj_in: Any) -> Dict[str, Any]:
+    """Schema values as column values: URLs and enums as strings, ``metadata`` as ``project_metadata``."""
+    data = obj_in.model_dump(mode="json", exclude_unset=True)
+    if "metadata" in data:
+        data["project_metadata"] = data.pop("metadata")
+    return data
 
 def create_project(db: Session, *, obj_in: ProjectCreate) -> Project:
     """Create a new project."""
-    db_obj = Project(
-        **obj_in.model_dump(exclude_unset=True),
-    )
+    db_obj = Project(**_column_values(obj_in))
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
@@ -40,13 +119,9 @@ def create_project(db: Session, *, obj_in: ProjectCreate) -> Project:
 def update_project(
     db: Session, *, db_obj: Project, obj_in: ProjectUpdate
 ) -> Project:
-    """Update a project."""
-    obj_data = jsonable_encoder(db_obj)
-    update_data = obj_in.model_dump(exclude_unset=True)
-    
-    for field in obj_data:
-        if field in update_data:
-            setattr(db_obj, field, update_data[field])
+    """Update a project with the fields set on ``obj_in``."""
+    for field, value in _column_values(obj_in).items():
+        setattr(db_obj, field, value)
     
     db.add(db_obj)
     db.commit()
@@ -1,8 +1,10 @@
-from typing import Any, Dict, Type, TypeVar
+from typing import Any, Callable, Dict, Type, TypeVar
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 from sqlalchemy import Column, Integer, DateTime, func
 from sqlalchemy.orm.decl_api import DeclarativeAttributeIntercept
 
+from app.db.serializers import build_serializer
+
 ModelType = TypeVar("ModelType", bound="Base")
 
 class Base(DeclarativeBase):
@@ -19,8 +21,18 @@ class Base(DeclarativeBase):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    def to_dict(self) -> dict:
-        """Convert model instance to dictionary."""
-        return {
-            c.name: getattr(self, c.name) for c in self.__table__.columns
-        }
+    # Options for the generated serializers, e.g. {"keys": {"project_metadata": "metadata"}}
+    # (see app.db.serializers.build_serializer)
+    __serializer_args__: Dict[str, Any] = {}
+
+    # Unique keys the identity cache indexes, with the function normalizing their values,
+    # e.g. {"email": str.lower} (see app.db.identity_cache)
+    __cache_keys__: Dict[str, Callable[[Any], Any]] = {}
+
+    def __init_subclass__(cls, **kw: Any) -> None:
+        super().__init_subclass__(**kw)
+        if "__mapper__" in cls.__dict__:
+            serializer = build_serializer(cls, **cls.__serializer_args__)
+            # Mapped models get to_dict() and to_json() from their generated serializer
+            cls.to_dict = serializer.to_dict
+            cls.to_json = serializer.to_json
@@ -0,0 +1,199 @@
+"""
+Change log for incremental sync.
+
+Every flush that writes a project or profile also writes, in the same
+transaction, a ``change_log`` row with a new monotonic ``version``. The log is
+compacted as it goes: a row's previous entry is replaced, so the log holds one
+entry per project or profile that ever existed, and deleted rows stay in it
+as tombstones. :func:`read_changes` pages through entries with a version above
+the caller's last one using the primary key index, so a client syncs in
+O(changes) rather than re-reading the catalog.
+
+``version`` is an AUTOINCREMENT key on SQLite so versions are never reused,
+even after compaction deletes the newest entry. Writes are serialized there,
+so versions become visible in order. On databases with concurrent writers a
+transaction can commit a lower version after a higher one is visible. Clients
+on such databases should re-read from a little before their high-water mark.
+
+Recording is enabled per engine (:func:`enable_change_log`), so sessions on
+other databases, such as test fixtures without the table, are unaffected.
+Rows written without the ORM (bulk loads, raw SQL) are not logged.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Table, delete, event, func, insert, inspect, literal, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.base_class import Base
+from app.db.signals import CREATE, DELETE, Change, flushed_changes, set_change_versions
+
+logger = logging.getLogger(__name__)
+
+change_log_table = Table(
+    "change_log",
+    Base.metadata,
+    Column("version", Integer, primary_key=True, autoincrement=True),
+    Column("resource", String(20), nullable=False),
+    Column("resource_id", Integer, nullable=False),
+    Column("op", String(10), nullable=False),
+    Column("changed_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Index("ix_change_log_resource", "resource", "resource_id", unique=True),
+    sqlite_autoincrement=True,
+)
+
+TRACKED_RESOURCES = ("projects", "profiles")
+
+_engines: Set[Engine] = set()
+
+
+def enable_change_log(engine: Engine) -> None:
+    """
+    Record project and profile writes made through ``engine``.
+
+    Creates the table if needed. An empty log is seeded with a create entry
+    for every existing row, so a client syncing from version 0 gets the whole
+    catalog (the migration seeds it too). Every worker runs this at startup,
+    so both steps tolerate another worker doing the same at the same time.
+    """
+    with engine.begin() as connection:
+        connection.execute(CreateTable(change_log_table, if_not_exists=True))
+        for index in change_log_table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    try:
+        with engine.begin() as connection:
+            if connection.execute(select(change_log_table.c.version).limit(1)).first() is None:
+                seed_change_log(connection)
+    except IntegrityError:
+        # Another worker seeded the same rows between our check and insert
+        logger.info("Change log was seeded by another worker")
+    _engines.add(engine)
+
+
+def seed_change_log(connection: Connection) -> None:
+    """Log a create entry for every existing project and profile that has no entry yet."""
+    existing = set(inspect(connection).get_table_names())
+    for resource, model in _models().items():
+        table = model.__table__
+        if table.name not in existing:
+            continue
+        logged = select(change_log_table.c.version).where(
+            change_log_table.c.resource == resource, change_log_table.c.resource_id == table.c.id
+        )
+        connection.execute(
+            insert(change_log_table).from_select(
+                ["resource", "resource_id", "op"],
+                select(literal(resource), table.c.id, literal(CREATE)).where(~logged.exists()).order_by(table.c.id),
+            )
+        )
+
+
+def disable_change_log() -> None:
+    _engines.clear()
+
+
+def is_recording(db: Session) -> bool:
+    return bool(_engines) and db.get_bind() in _engines
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session: Session, flush_context: Any) -> None:
+    if not is_recording(session):
+        return
+    latest: Dict[Tuple[str, Any], str] = {
+        key: op for key, op in flushed_changes(session) if key[0] in TRACKED_RESOURCES
+    }
+    if not latest:
+        return
+    connection = session.connection()
+    for resource in TRACKED_RESOURCES:
+        ids = [pk for (name, pk) in latest if name == resource]
+        if ids:
+            connection.execute(
+                delete(change_log_table).where(
+                    change_log_table.c.resource == resource, change_log_table.c.resource_id.in_(ids)
+                )
+            )
+    inserted = connection.execute(
+        insert(change_log_table).returning(
+            change_log_table.c.resource, change_log_table.c.resource_id, change_log_table.c.version,
+            sort_by_parameter_order=True,
+        ),
+        [{"resource": resource, "resource_id": pk, "op": op} for (resource, pk), op in latest.items()],
+    )
+    # Commit listeners (e.g. the event stream) report the same versions as the feed
+    set_change_versions(session, {(row.resource, row.resource_id): row.version for row in inserted})
+
+
+def _models() -> Dict[str, Any]:
+    from app.db.models.profile import Profile
+    from app.db.models.project import Project
+
+    return {Project.__tablename__: Project, Profile.__tablename__: Profile}
+
+
+def read_log(
+    db: Session, since: Optional[int], resources: Sequence[str] = TRACKED_RESOURCES
+) -> Tuple[int, List[Change]]:
+    """
+    The newest logged version and the ``resources`` entries above ``since``, oldest first.
+
+    Used by workers to pick up writes committed by other workers. With
+    ``since`` None only the newest version is read.
+    """
+    newest = db.execute(select(func.max(change_log_table.c.version))).scalar() or 0
+    if since is None or newest <= since:
+        return newest, []
+    entries = db.execute(
+        select(change_log_table.c.resource, change_log_table.c.resource_id, change_log_table.c.op, change_log_table.c.version)
+        .where(change_log_table.c.version > since, change_log_table.c.resource.in_(resources))
+        .order_by(change_log_table.c.version)
+    ).all()
+    return newest, [Change(entry.resource, entry.resource_id, entry.op, entry.version) for entry in entries]
+
+
+def read_changes(db: Session, since: int = 0, limit: int = 500) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """
+    Entries with a version above ``since``, oldest first.
+
+    Returns ``(changes, version, has_more)``. Each change carries the current
+    row as ``data``, or None for a tombstone. ``version`` is the high-water
+    mark to pass as ``since`` next time: the last returned version, or the
+    newest in the log when nothing changed.
+    """
+    from app.db.records import select_records
+
+    entries = db.execute(
+        select(change_log_table)
+        .where(change_log_table.c.version > since)
+        .order_by(change_log_table.c.version)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        newest = db.execute(select(func.max(change_log_table.c.version))).scalar()
+        return [], newest or 0, False
+
+    rows: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for resource, model in _models().items():
+        ids = [entry.resource_id for entry in entries if entry.resource == resource and entry.op != DELETE]
+        if ids:
+            for record in select_records(db, model, criteria=(model.id.in_(ids),)):
+                rows[resource, record.id] = record.to_dict()
+
+    changes = []
+    for entry in entries:
+        data = rows.get((entry.resource, entry.resource_id))
+        changes.append({
+            "version": entry.version,
+            "resource": entry.resource,
+            "id": entry.resource_id,
+            # A row missing from its table was deleted outside the ORM; report it as gone
+            "op": entry.op if data is not None or entry.op == DELETE else DELETE,
+            "data": data,
+        })
+    return changes, entries[-1].version, has_more
@@ -1,19 +1,25 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.exc import SQLAlchemyError
 import os
 import logging
-from typing import Generator, Any, Optional
+import threading
+from typing import Generator, Any
 from contextlib import contextmanager
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, register_engine
+from app.db.session import LazySessionmaker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_engine = None
+_engine_lock = threading.Lock()
+
 # Create engine with configuration based on environment
-def get_engine():
+def create_database_engine():
     """Create and return a database engine based on the current configuration."""
     connect_args = {}
     
@@ -31,21 +37,35 @@ def get_engine():
         engine = create_engine(
             settings.SQLALCHEMY_DATABASE_URI,
             connect_args=connect_args,
+            poolclass=InstrumentedQueuePool,
             pool_pre_ping=True,
-            pool_size=10 if not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else 1,
-            max_overflow=20 if not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else 0,
+            pool_size=settings.DB_POOL_SIZE if not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else 1,
+            max_overflow=settings.DB_MAX_OVERFLOW if not settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite") else 0,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
             echo=os.getenv("SQL_ECHO", "false").lower() == "true"
         )
-        return engine
+        return register_engine("default", engine)
     except Exception as e:
         logger.error(f"Error creating database engine: {e}")
         raise
 
-# Create engine
-engine = get_engine()
+def get_engine():
+    """Return the shared engine, creating it on first use rather than at import."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_database_engine()
+    return _engine
+
+def __getattr__(name: str) -> Any:
+    # ``from app.db.database import engine`` keeps working, building the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(get_engine, autocommit=False, autoflush=False)
 Base: Any = declarative_base()
 
 @contextmanager
@@ -83,18 +103,14 @@ def get_db() -> Generator:
 def init_db() -> None:
     """Initialize the database by creating all tables and seeding initial data.
     
-    This should be called during application startup.
+    This should be called during application startup. Tables are only created
+    and seeded when the stored schema fingerprint differs from the models (see
+    app.db.fingerprint), so an unchanged database costs one query.
     """
-    from .init_db import init_db as init_db_tables
-    from .init_db import seed_initial_data
+    from app.db.init_db import init_db as init_db_tables
     
     try:
-        # Initialize database tables
         init_db_tables()
-        
-        # Seed initial data
-        seed_initial_data()
-        
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
@@ -0,0 +1,195 @@
+"""
+Schema fingerprint.
+
+A SHA-256 over the SQLAlchemy metadata (tables, columns, types, keys and
+indexes) and the Alembic revision the code expects is stored in a one-row
+``schema_fingerprint`` table. At startup ``ensure_schema`` reads that row with
+a single query: when it matches, table reflection, ``create_all`` and seeding
+are skipped entirely. When the stored revision is an ancestor of the code's
+Alembic head the database is behind the code and startup fails with
+``SchemaOutOfDateError`` instead of serving against a stale schema.
+
+Alembic's ``env.py`` stamps the fingerprint after every online migration, so
+``alembic upgrade head`` is all it takes to clear the error. A schema built
+here from the metadata is stamped at the Alembic head in the same transaction
+as its fingerprint, so later migrations start from the right revision. Older
+databases built that way without a stamp (``alembic_version`` empty) cannot
+be upgraded by Alembic; they are brought up to the metadata instead (missing
+tables and indexes are created) and stamped.
+"""
+import hashlib
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent.parent / "alembic.ini"
+
+# Kept out of the application metadata so it never feeds its own hash
+fingerprint_metadata = MetaData()
+fingerprint_table = Table(
+    "schema_fingerprint",
+    fingerprint_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("revision", String(32), nullable=True),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
+# Alembic's own version table, written when the schema is built from the metadata
+alembic_version_table = Table(
+    "alembic_version",
+    fingerprint_metadata,
+    Column("version_num", String(32), primary_key=True),
+)
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database schema is older than the code; migrations must run first."""
+
+
+def metadata_fingerprint(metadata: MetaData, revision: Optional[str]) -> str:
+    """Hash the parts of ``metadata`` that shape the database, plus ``revision``."""
+    digest = hashlib.sha256(f"revision={revision or ''}\n".encode())
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        digest.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            server_default = getattr(column.server_default, "arg", None)
+            digest.update(
+                f"  column {column.name} {column.type!r} nullable={column.nullable} "
+                f"pk={column.primary_key} unique={column.unique} default={server_default}\n".encode()
+            )
+        for fk in sorted(table.foreign_keys, key=lambda fk: fk.parent.name):
+            digest.update(f"  fk {fk.parent.name} -> {fk.target_fullname} ondelete={fk.ondelete}\n".encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            expressions = ",".join(str(expression) for expression in index.expressions)
+            digest.update(f"  index {index.name} unique={index.unique} on {expressions}\n".encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def alembic_revisions() -> Tuple[str, ...]:
+    """Revisions from base to head, or an empty tuple when Alembic is unavailable."""
+    try:
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+    except ImportError:
+        logger.warning("Alembic is not installed; schema fingerprint covers the metadata only")
+        return ()
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return tuple(reversed([script.revision for script in ScriptDirectory.from_config(config).walk_revisions()]))
+
+
+def read_fingerprint(engine: Engine) -> Optional[Tuple[str, Optional[str]]]:
+    """Return the stored ``(fingerprint, revision)``, or None if none is stored yet."""
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(
+                select(fingerprint_table.c.fingerprint, fingerprint_table.c.revision)
+                .where(fingerprint_table.c.id == 1)
+            ).first()
+    except DBAPIError:
+        # The table does not exist yet: a new database or one from before fingerprints
+        return None
+    return (row.fingerprint, row.revision) if row else None
+
+
+def read_alembic_revision(engine: Engine) -> Optional[str]:
+    """Return the revision stamped in ``alembic_version``, or None if it is missing or empty."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(alembic_version_table.c.version_num)).scalar()
+    except DBAPIError:
+        return None
+
+
+def stamp_alembic(connection: Connection, revision: str) -> None:
+    """Record ``revision`` as the current Alembic revision, like ``alembic stamp``."""
+    alembic_version_table.create(bind=connection, checkfirst=True)
+    connection.execute(delete(alembic_version_table))
+    connection.execute(insert(alembic_version_table).values(version_num=revision))
+
+
+def write_fingerprint(connection: Connection, fingerprint: str, revision: Optional[str]) -> None:
+    fingerprint_table.create(bind=connection, checkfirst=True)
+    connection.execute(delete(fingerprint_table))
+    connection.execute(insert(fingerprint_table).values(
+        id=1, fingerprint=fingerprint, revision=revision, updated_at=datetime.now(timezone.utc)
+    ))
+
+
+def ensure_schema(
+    engine: Engine,
+    metadata: MetaData,
+    seed: Optional[Callable[[Session], None]] = None,
+    revisions: Optional[List[str]] = None,
+) -> bool:
+    """
+    Create tables and seed data only when the stored fingerprint differs.
+
+    Args:
+        engine: Engine for the application database
+        metadata: Metadata describing the tables the code expects
+        seed: Optional callable that seeds initial data in a session it does not commit
+        revisions: Alembic revisions from base to head (read from the migration scripts by default)
+
+    Returns:
+        bool: True if the schema was (re)created, False if the fingerprint matched
+
+    Raises:
+        SchemaOutOfDateError: If the database was migrated to an older revision than the code's head
+            (databases created here and never stamped are brought up to date instead)
+    """
+    revisions = list(alembic_revisions() if revisions is None else revisions)
+    head = revisions[-1] if revisions else None
+    expected = metadata_fingerprint(metadata, head)
+
+    stored = read_fingerprint(engine)
+    if stored is not None:
+        fingerprint, revision = stored
+        if fingerprint == expected:
+            logger.info(f"Schema fingerprint {expected[:12]} matches; skipping table creation and seeding")
+            return False
+        if revision != head and revision in revisions:
+            if read_alembic_revision(engine) is not None:
+                raise SchemaOutOfDateError(
+                    f"Database schema is at revision {revision} but the code expects {head}; "
+                    f"run 'alembic upgrade head' before starting the application"
+                )
+            # Built by create_all and never stamped: Alembic would replay every migration
+            # onto the existing tables, so create what the newer revisions add instead
+            logger.warning(f"Unstamped database schema is at revision {revision}; updating it from the models")
+        if revision is not None and revision not in revisions:
+            # Migrated by newer code (e.g. during a rollback); leave its schema alone
+            logger.warning(f"Database schema revision {revision} is unknown to this code; skipping table creation")
+            return False
+
+    logger.info(f"Schema fingerprint changed (expected {expected[:12]}); creating tables")
+    existing = set(inspect(engine).get_table_names())
+    metadata.create_all(bind=engine)
+    # create_all skips existing tables, including indexes added to them since. Expression
+    # indexes cannot be reflected on every backend, so let the database skip existing ones
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if table.name in existing:
+                for index in table.indexes:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+    if seed is not None:
+        with Session(bind=engine) as db:
+            seed(db)
+            db.commit()
+    with engine.begin() as connection:
+        write_fingerprint(connection, expected, head)
+        if head is not None:
+            stamp_alembic(connection, head)
+    return True
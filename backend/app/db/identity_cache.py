@@ -0,0 +1,262 @@
+"""
+Second-level cache of rows by identity.
+
+Lookups by primary key (``BaseRepository.get``, ``get_project``,
+``get_profile``) and by unique key (profile email) run a query on every call,
+even for hot rows that rarely change. With the cache enabled,
+:func:`cached_get` and :func:`cached_get_by` keep a snapshot of each row's
+column values read that way, keyed by ``(table, primary key)``, plus an index
+from the model's unique keys (``__cache_keys__``, e.g. the lower-cased email
+of a profile) to the primary key.
+
+A hit returns the instance the caller's session already holds for the row,
+if any; otherwise it builds one from the snapshot and attaches it with
+``Session.merge(load=False)``, without a query. It is a regular
+persistent instance, so callers can update or delete it as before. Mutable
+JSON values are copied, and sessions never share instances.
+
+Entries are dropped when a flush writes their row (``after_flush``) and again
+once the transaction commits (``app.db.signals``), so a read that raced the
+commit cannot keep the old values. Rows read by a session that has flushed
+but not committed writes are not cached, since they may hold uncommitted
+values. The cache is bounded by ``max_entries`` (least recently used entries
+are evicted first) and by ``ttl`` seconds, which bounds how long writes made
+by other workers go unseen. Statistics per table are exported as the
+``identity_cache`` metrics collector.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.metrics import register_collector
+from app.db.signals import Change, flushed_changes, on_commit
+
+_FLUSHED_KEY = "identity_cache_flushed"
+
+Key = Tuple[str, Any]
+
+
+class _Entry(NamedTuple):
+    key: Key
+    model: Any
+    values: Dict[str, Any]
+    unique_keys: Tuple[Tuple[str, str, Any], ...]
+    expires_at: float
+
+
+def _copy(value: Any) -> Any:
+    # JSON columns hold dicts and lists that callers may change in place
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+def _new_stats() -> Dict[str, int]:
+    return {"hits": 0, "misses": 0, "puts": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+
+class IdentityCache:
+    """LRU of row snapshots by ``(table, primary key)``, with a unique-key index."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._unique: Dict[Tuple[str, str, Any], Any] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a read that started before one is not cached
+        self.generation = 0
+
+    def _count(self, table: str, name: str) -> None:
+        stats = self._stats.get(table)
+        if stats is None:
+            stats = self._stats[table] = _new_stats()
+        stats[name] += 1
+
+    def _drop(self, key: Key) -> None:
+        entry = self._entries.pop(key)
+        for unique_key in entry.unique_keys:
+            if self._unique.get(unique_key) == key[1]:
+                del self._unique[unique_key]
+
+    def _lookup(self, key: Key) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            self._count(key[0], "expirations")
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, table: str, pk: Any) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._lookup((table, pk))
+            self._count(table, "hits" if entry is not None else "misses")
+            return entry
+
+    def get_by(self, table: str, name: str, value: Any) -> Optional[_Entry]:
+        with self._lock:
+            pk = self._unique.get((table, name, value))
+            entry = self._lookup((table, pk)) if pk is not None else None
+            self._count(table, "hits" if entry is not None else "misses")
+            return entry
+
+    def put(self, obj: Any, generation: int) -> bool:
+        """Store ``obj``'s column values; False if they may be stale or incomplete."""
+        state = inspect(obj)
+        mapper = state.mapper
+        keys = [attr.key for attr in mapper.column_attrs]
+        if state.key is None or state.modified or state.unloaded.intersection(keys):
+            return False
+        model = mapper.class_
+        table = model.__tablename__
+        pk = state.key[1][0] if len(state.key[1]) == 1 else state.key[1]
+        values = {key: _copy(state.dict[key]) for key in keys}
+        unique_keys = tuple(
+            (table, name, normalize(values[name]))
+            for name, normalize in model.__cache_keys__.items() if values[name] is not None
+        )
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if (table, pk) in self._entries:
+                self._drop((table, pk))
+            self._entries[(table, pk)] = _Entry((table, pk), model, values, unique_keys, time.monotonic() + self.ttl)
+            for unique_key in unique_keys:
+                self._unique[unique_key] = pk
+            self._count(table, "puts")
+            while len(self._entries) > self.max_entries:
+                evicted = next(iter(self._entries))
+                self._drop(evicted)
+                self._count(evicted[0], "evictions")
+        return True
+
+    def invalidate(self, keys: List[Key]) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if key in self._entries:
+                    self._drop(key)
+                    self._count(key[0], "invalidations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._unique.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries: Dict[str, int] = {}
+            for table, _ in self._entries:
+                entries[table] = entries.get(table, 0) + 1
+            tables = {table: {**stats, "entries": entries.get(table, 0)} for table, stats in self._stats.items()}
+            return {
+                "active": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "tables": tables,
+            }
+
+
+def _attach(db: Session, entry: _Entry) -> Any:
+    """A persistent instance of the cached row in ``db``, built without a query."""
+    mapper = entry.model.__mapper__
+    pk = entry.key[1]
+    # An instance the session already holds wins: merging over it would discard its unflushed edits
+    existing = db.identity_map.get(mapper.identity_key_from_primary_key(pk if isinstance(pk, tuple) else (pk,)))
+    if existing is not None:
+        return existing
+    obj = mapper.class_manager.new_instance()
+    for key, value in entry.values.items():
+        set_committed_value(obj, key, _copy(value))
+    make_transient_to_detached(obj)
+    return db.merge(obj, load=False)
+
+
+def _writes_pending(db: Session, key: Optional[Key] = None) -> bool:
+    flushed = db.info.get(_FLUSHED_KEY)
+    return bool(flushed) and (key is None or key in flushed)
+
+
+def _load(db: Session, cache: IdentityCache, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    generation = cache.generation
+    obj = load()
+    if obj is not None and not _writes_pending(db):
+        cache.put(obj, generation)
+    return obj
+
+
+def cached_get(db: Session, model: Any, pk: Any, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """The ``model`` row with primary key ``pk`` from the cache, or from ``load()`` (then cached)."""
+    cache = _cache
+    if cache is None or _writes_pending(db, (model.__tablename__, pk)):
+        return load()
+    entry = cache.get(model.__tablename__, pk)
+    if entry is not None:
+        return _attach(db, entry)
+    return _load(db, cache, load)
+
+
+def cached_get_by(db: Session, model: Any, name: str, value: Any, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Like :func:`cached_get`, by a unique key listed in ``model.__cache_keys__``."""
+    cache = _cache
+    if cache is None or value is None:
+        return load()
+    entry = cache.get_by(model.__tablename__, name, model.__cache_keys__[name](value))
+    if entry is not None and not _writes_pending(db, entry.key):
+        return _attach(db, entry)
+    return _load(db, cache, load)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any) -> None:
+    keys = [key for key, _ in flushed_changes(session)]
+    if not keys:
+        return
+    session.info.setdefault(_FLUSHED_KEY, set()).update(keys)
+    if _cache is not None:
+        _cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_flushed(session: Session) -> None:
+    session.info.pop(_FLUSHED_KEY, None)
+
+
+def _invalidate_committed(changes: List[Change]) -> None:
+    if _cache is not None:
+        _cache.invalidate([(change.resource, change.id) for change in changes])
+
+
+_cache: Optional[IdentityCache] = None
+_listening = False
+
+
+def configure_identity_cache(max_entries: int, ttl: float) -> IdentityCache:
+    """Enable the cache, replacing (and emptying) any previous one."""
+    global _cache, _listening
+    if not _listening:
+        on_commit(_invalidate_committed)
+        register_collector("identity_cache", lambda: _cache.stats() if _cache else {"active": False})
+        _listening = True
+    _cache = IdentityCache(max_entries, ttl)
+    return _cache
+
+
+def disable_identity_cache() -> None:
+    global _cache
+    _cache = None
+
+
+def get_identity_cache() -> Optional[IdentityCache]:
+    return _cache
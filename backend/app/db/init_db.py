@@ -1,140 +1,93 @@
 import logging
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
-from app.db.database import engine, Base, SessionLocal
-from app.models.skill import Skill
-from app.models.project import Project
-from app.models.profile import Profile
+from app.db.models.profile import Profile
+from app.db.models.project import Project
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def init_db():
-    """Initialize the database by creating all tables."""
-    try:
-        # Import all models to ensure they are registered with SQLAlchemy
-        from app import models  # noqa: F401
-        
-        logger.info("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-        
-    except Exception as e:
-        logger.error(f"Error initializing database: {e}")
-        raise
+def init_db() -> bool:
+    """
+    Create the tables and seed them unless the stored schema fingerprint matches.
 
-def seed_initial_data():
-    """Seed the database with initial data."""
-    db = SessionLocal()
-    
-    try:
-        logger.info("Checking if database needs seeding...")
-        
-        # Check if we already have data
-        if db.query(Project).count() > 0 or db.query(Skill).count() > 0:
-            logger.info("Database already contains data, skipping seeding")
-            return
-            
-        logger.info("Seeding database with initial data...")
-        
-        # Create skills (all lowercase for consistency)
-        python = Skill(name="python")
-        fastapi = Skill(name="fastapi")
-        sqlalchemy = Skill(name="sqlalchemy")
-        javascript = Skill(name="javascript")
-        react = Skill(name="react")
-        ml = Skill(name="machine learning")
-        docker = Skill(name="docker")
-        rag = Skill(name="rag")
-        streamlit = Skill(name="streamlit")
-        
-        # Create profile
-        profile = Profile(
-            name="Ishu Raj",
-            email="ishuraj176@gmail.com",
-            education="Bachelor's in Computer Science",
-            headline="Full Stack Developer",
-            location="India",
-            bio="Passionate developer building amazing things with code.",
-            links={
-                'github': 'https://github.com/IshuRaj441',
-                'linkedin': '',
-                'portfolio': '',
-                'twitter': ''
-            }
-        )
-        
-        # Create projects
-        project1 = Project(
+    Returns True if the schema was (re)created (see app.db.fingerprint).
+    """
+    from app.db.session import init_db as init_db_tables
+
+    return init_db_tables(seed=seed_initial_data)
+
+def seed_initial_data(db: Session) -> None:
+    """
+    Seed an empty database with the default profile and projects.
+
+    Runs when the schema is (re)created; the caller commits. Databases that
+    already hold a profile or a project are left alone.
+    """
+    logger.info("Checking if database needs seeding...")
+
+    # Check if we already have data
+    if db.query(Profile.id).first() is not None or db.query(Project.id).first() is not None:
+        logger.info("Database already contains data, skipping seeding")
+        return
+
+    logger.info("Seeding database with initial data...")
+
+    db.add(Profile(
+        name="Ishu Raj",
+        email="ishuraj176@gmail.com",
+        title="Full Stack Developer",
+        location="India",
+        about="Passionate developer building amazing things with code.",
+        github_url="https://github.com/IshuRaj441",
+        linkedin_url="https://www.linkedin.com/in/ishu-raj-13b840291/",
+    ))
+
+    # Skills are stored lowercase for consistency
+    db.add_all([
+        Project(
             title="Me-API Playground",
             description="Backend assessment project for showcasing skills and projects",
-            links="https://github.com/ishuraj/me-api",
-            profile=profile
-        )
-        project1.skills = [python, fastapi, sqlalchemy]
-        
-        project2 = Project(
+            skills=["python", "fastapi", "sqlalchemy"],
+            github_url="https://github.com/ishuraj/me-api",
+            is_featured=True,
+        ),
+        Project(
             title="E-commerce Platform",
             description="Full-stack e-commerce platform with React and FastAPI",
-            links="https://github.com/ishuraj/ecommerce",
-            profile=profile
-        )
-        project2.skills = [python, javascript, react]
-        
-        # Add Python API Playground project
-        python_project = Project(
+            skills=["python", "javascript", "react"],
+            github_url="https://github.com/ishuraj/ecommerce",
+        ),
+        Project(
             title="Python API Playground",
             description="A collection of Python projects and examples including FastAPI backends, data processing scripts, and API integrations. Demonstrates clean code, testing, and best practices.",
-            links="https://github.com/IshuRaj441/api-jd",
-            profile=profile
-        )
-        python_project.skills = [python, fastapi]
-        
-        # Create Python projects
-        python_project1 = Project(
+            skills=["python", "fastapi"],
+            github_url="https://github.com/IshuRaj441/api-jd",
+        ),
+        Project(
             title="Python API Project",
             description="A RESTful API built with FastAPI and SQLAlchemy",
-            links="https://github.com/ishuraj/python-api-project"
-        )
-        python_project1.skills = [python, fastapi, sqlalchemy]
-        
-        python_project2 = Project(
+            skills=["python", "fastapi", "sqlalchemy"],
+            github_url="https://github.com/ishuraj/python-api-project",
+        ),
+        Project(
             title="Machine Learning Model",
             description="A machine learning model for image classification",
-            links="https://github.com/ishuraj/ml-project"
-        )
-        python_project2.skills = [python, ml]
-        
-        # Add a test project with python skill
-        test_project = Project(
+            skills=["python", "machine learning"],
+            github_url="https://github.com/ishuraj/ml-project",
+        ),
+        Project(
             title="Python Test Project",
             description="A test project to verify Python skill filtering",
-            links="https://github.com/ishuraj/python-test",
-            profile=profile
-        )
-        test_project.skills = [python]
-        
-        # Add all to session and commit
-        db.add_all([
-            python, fastapi, sqlalchemy, javascript, react, ml, docker, rag, streamlit,
-            project1, project2, python_project, python_project1, python_project2, test_project
-        ])
-        db.commit()
-        print("Database seeded successfully with projects and skills")
-        
-    except Exception as e:
-        print(f"Error seeding database: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            skills=["python"],
+            github_url="https://github.com/ishuraj/python-test",
+        ),
+    ])
+    logger.info("Database seeded with the default profile and projects")
 
 def seed_db():
     """Wrapper function to initialize and seed the database."""
-    init_db()
-    seed_initial_data()
+    return init_db()
 
 # Initialize the database
 if __name__ == "__main__":
-    seed_db()
\ No newline at end of file
+    seed_db()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Index, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, JSON, literal_column
 from sqlalchemy.sql import func
 from typing import Dict, Any, Optional
 
@@ -12,9 +12,16 @@ class Profile(Base):
     including contact details, social media links, and profile metadata.
     """
     __tablename__ = "profiles"
+    # "metadata" repeats profile_metadata for older clients
+    __serializer_args__ = {
+        "aliases": {"profile_metadata": ("metadata",)},
+        "defaults": {"profile_metadata": dict},
+    }
+    # Emails are unique case-insensitively (idx_profile_email_lower)
+    __cache_keys__ = {"email": str.lower}
     __table_args__ = (
-        # Add a composite index for common query patterns
-        Index('idx_profile_email_lower', func.lower('email'), unique=True),
+        # Case-insensitive uniqueness on email (lower('email') would index a constant)
+        Index('idx_profile_email_lower', func.lower(literal_column('email')), unique=True),
         {
             'comment': 'Stores user profile information',
             'postgresql_partition_by': 'HASH (id)'  # Optional: For very large tables
@@ -112,31 +119,6 @@ class Profile(Base):
         """String representation of the Profile instance."""
         return f"<Profile(id={self.id}, name='{self.name}', email='{self.email}')>"
 
-    def to_dict(self) -> Dict[str, Any]:
-        """
-        Convert the Profile instance to a dictionary.
-        
-        Returns:
-            Dict containing the profile data with ISO-formatted datetimes
-        """
-        return {
-            "id": self.id,
-            "name": self.name,
-            "email": self.email,
-            "title": self.title,
-            "location": self.location,
-            "about": self.about,
-            "github_url": self.github_url,
-            "linkedin_url": self.linkedin_url,
-            "twitter_url": self.twitter_url,
-            "profile_picture_url": self.profile_picture_url,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "profile_metadata": self.profile_metadata or {},
-            # For backward compatibility
-            "metadata": self.profile_metadata or {}
-        }
-        
     def update_from_dict(self, data: Dict[str, Any]) -> None:
         """
         Update profile fields from a dictionary.
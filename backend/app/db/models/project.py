@@ -10,6 +10,7 @@ from app.db.base_class import Base
 class Project(Base):
     """Project model for storing project information."""
     __tablename__ = "projects"
+    __serializer_args__ = {"keys": {"project_metadata": "metadata"}}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
@@ -26,19 +27,3 @@ class Project(Base):
 
     def __repr__(self):
         return f"<Project(title='{self.title}')>"
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert model instance to dictionary."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "skills": self.skills,
-            "github_url": self.github_url,
-            "demo_url": self.demo_url,
-            "image_url": self.image_url,
-            "is_featured": self.is_featured,
-            "metadata": self.project_metadata,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
@@ -0,0 +1,105 @@
+"""
+Instrumented connection pool.
+
+``InstrumentedQueuePool`` behaves exactly like SQLAlchemy's ``QueuePool`` but
+records how long callers wait for a connection, how often the pool overflows
+and the peak number of checked-out connections. Engines built with it are
+registered by name so their statistics show up on the metrics surface.
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import register_collector
+
+_engines: Dict[str, Engine] = {}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that keeps checkout wait-time and saturation counters."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._peak_checked_out = 0
+        self._peak_overflow = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        checked_out = self.checkedout()
+        overflow = max(self.overflow(), 0)
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+            if checked_out > self._peak_checked_out:
+                self._peak_checked_out = checked_out
+            if overflow > self._peak_overflow:
+                self._peak_overflow = overflow
+        return conn
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the pool's current state and counters."""
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "peak_checked_out": self._peak_checked_out,
+                "peak_overflow": self._peak_overflow,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_ms_avg": round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+
+def register_engine(name: str, engine: Engine) -> Engine:
+    """Track an engine so its pool statistics are reported under ``name``."""
+    _engines[name] = engine
+    return engine
+
+
+def dispose_engines() -> None:
+    """
+    Forget connections inherited from a parent process.
+
+    Called in each forked server worker: pooled connections opened before the
+    fork are dropped without being closed, so the parent's sockets stay intact.
+    """
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Return statistics for every registered engine's pool."""
+    stats: Dict[str, Any] = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            stats[name] = pool.stats()
+        else:
+            stats[name] = {"pool": type(pool).__name__, "status": pool.status()}
+    return stats
+
+
+register_collector("db_pool", pool_stats)
@@ -0,0 +1,76 @@
+"""
+Read-only query results as lightweight records.
+
+List endpoints only read rows and serialize them, so building full ORM
+instances (identity map entries, instrumented attributes, change tracking) is
+wasted work. :func:`select_records` runs a Core SELECT of just the wanted
+columns through the session and maps each row straight into a ``__slots__``
+record: one plain attribute per mapped column, named like the ORM attribute,
+plus the model's ``to_dict`` and ``to_json``, so code written against ORM
+objects (field selections, ``to_dict``, response models reading attributes)
+works unchanged.
+
+Records are detached snapshots. Nothing is lazy-loaded and slots of columns
+that were not selected stay unset, so reading them raises ``AttributeError``.
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+
+@lru_cache(maxsize=None)
+def record_class(model: Any) -> type:
+    """The ``__slots__`` record type for ``model``, built once per model."""
+    keys = tuple(attr.key for attr in inspect(model).column_attrs)
+    namespace = {
+        "__slots__": keys,
+        "__module__": __name__,
+        "__doc__": f"Read-only snapshot of a {model.__name__} row.",
+        "__repr__": lambda self: f"<{type(self).__name__}(id={getattr(self, 'id', None)})>",
+    }
+    # The generated serializers only read attributes, so they work on records as-is
+    for name in ("to_dict", "to_json"):
+        if name in vars(model):
+            namespace[name] = vars(model)[name]
+    return type(f"{model.__name__}Record", (), namespace)
+
+
+def select_records(
+    db: Session,
+    model: Any,
+    attributes: Optional[Sequence[str]] = None,
+    criteria: Sequence[Any] = (),
+    skip: int = 0,
+    limit: Optional[int] = None,
+    order_by: Optional[Sequence[Any]] = None,
+) -> List[Any]:
+    """
+    Load rows of ``model`` as records.
+
+    Args:
+        attributes: ORM attribute names to select; all mapped columns if None
+        criteria: WHERE clauses, combined with AND
+        skip, limit: OFFSET/LIMIT, as with ``Query.offset().limit()``
+        order_by: ORDER BY clauses; the primary key if None, so pages are stable
+    """
+    cls = record_class(model)
+    mapper = inspect(model)
+    keys = cls.__slots__ if attributes is None else tuple(dict.fromkeys(attributes))
+    statement = select(*(mapper.column_attrs[key].columns[0] for key in keys)).where(*criteria)
+    statement = statement.order_by(*(mapper.primary_key if order_by is None else order_by))
+    if skip:
+        statement = statement.offset(skip)
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    setters = [getattr(cls, key).__set__ for key in keys]
+    new = object.__new__
+    records = []
+    for row in db.execute(statement):
+        record = new(cls)
+        for setter, value in zip(setters, row):
+            setter(record, value)
+        records.append(record)
+    return records
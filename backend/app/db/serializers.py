@@ -0,0 +1,161 @@
+"""
+Row serializers generated from the mapper.
+
+``Base.to_dict`` used to walk ``__table__.columns`` with ``getattr`` for
+every row, and the models hand-wrote their own variants. :func:`build_serializer`
+instead reads a model's mapped columns once, when the class is created, and
+generates two straight-line functions for it:
+
+- ``to_dict(obj)``: a dict of Python values, keyed by attribute name
+- ``to_json(obj)``: the same object pre-encoded as a compact JSON string, for
+  responses and payloads built by joining fragments without another
+  ``json.dumps`` pass
+
+Columns are handled by type:
+
+- ``DateTime``/``Date``: ISO 8601 strings (``None`` stays ``None``)
+- ``JSON``: returned as stored; ``defaults`` replaces ``None`` (e.g. with ``{}``)
+- URL columns (``String`` columns named ``*_url``): plain strings, also when
+  a schema assigned a Pydantic ``Url`` object that has not been flushed yet
+
+``Base`` builds both for every mapped model and installs them as its
+``to_dict`` and ``to_json`` methods. Models tune the output with
+``__serializer_args__``:
+``keys`` renames attributes in the output, ``aliases`` repeats a value under
+extra keys (encoded once), ``defaults`` gives factories for ``None`` JSON
+values and ``exclude`` drops attributes. The functions only read attributes,
+so they also serialize the ``__slots__`` records from ``app.db.records``.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Integer, String, inspect
+from sqlalchemy.types import TypeEngine
+
+_encode_str = json.encoder.encode_basestring
+
+
+def _unserializable(value: Any) -> Any:
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Same output as FastAPI's JSONResponse (compact, ensure_ascii=False, allow_nan=False).
+# JSONEncoder.encode builds a new C encoder on every call; build it once instead.
+if json.encoder.c_make_encoder is not None:
+    _c_encode = json.encoder.c_make_encoder(None, _unserializable, _encode_str, None, ":", ",", False, False, False)
+
+    def _encode(value: Any) -> str:
+        return "".join(_c_encode(value, 0))
+else:  # pragma: no cover - interpreters without the C accelerator
+    _encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+class Field(NamedTuple):
+    attribute: str
+    key: str
+    kind: str  # "datetime", "json", "url", "str", "int", "bool" or "value"
+
+
+def _kind(key: str, column_type: TypeEngine) -> str:
+    if isinstance(column_type, (DateTime, Date)):
+        return "datetime"
+    if isinstance(column_type, JSON):
+        return "json"
+    if isinstance(column_type, String):
+        return "url" if key.endswith("_url") else "str"
+    if isinstance(column_type, Boolean):
+        return "bool"
+    if isinstance(column_type, Integer):
+        return "int"
+    return "value"
+
+
+# JSON expressions per kind for a non-None value ``{v}``, inlined into the generated code.
+# isoformat() only produces digits, letters and punctuation, so it needs no escaping.
+_JSON_EXPRESSIONS = {
+    "datetime": '\'"\' + {v}.isoformat() + \'"\'',
+    "url": "_encode_str({v} if {v}.__class__ is _str else _str({v}))",
+    "str": "_encode_str({v})",
+    "int": "_str({v})",
+    "bool": "'true' if {v} else 'false'",
+    "json": "_encode({v})",
+    "value": "_encode({v})",
+}
+
+
+def model_fields(model: Any, keys: Mapping[str, str] = {}, exclude: Iterable[str] = ()) -> List[Field]:
+    """
+    The serialized fields of ``model``, in table column order.
+
+    Only looks up the column properties, which exist as soon as the class is
+    mapped, so it does not trigger mapper configuration from inside a class
+    definition.
+    """
+    mapper = inspect(model)
+    excluded = set(exclude)
+    fields = []
+    for column in mapper.local_table.columns:
+        key = mapper.get_property_by_column(column).key
+        if key not in excluded:
+            fields.append(Field(key, keys.get(key, key), _kind(key, column.type)))
+    return fields
+
+
+class Serializer(NamedTuple):
+    fields: Tuple[Field, ...]
+    to_dict: Callable[[Any], Dict[str, Any]]
+    to_json: Callable[[Any], str]
+
+
+def build_serializer(
+    model: Any,
+    keys: Mapping[str, str] = {},
+    aliases: Mapping[str, Sequence[str]] = {},
+    defaults: Mapping[str, Callable[[], Any]] = {},
+    exclude: Iterable[str] = (),
+) -> Serializer:
+    """Generate ``to_dict`` and ``to_json`` for ``model`` (see the module docstring for the options)."""
+    fields = tuple(model_fields(model, keys, exclude))
+    namespace: Dict[str, Any] = {"_str": str, "_encode": _encode, "_encode_str": _encode_str}
+    loads, encoded_values, dict_items, json_items = [], [], [], []
+    for index, field in enumerate(fields):
+        value, attribute = f"v{index}", f"obj.{field.attribute}"
+        loads.append(f"    {value} = {attribute}")
+        null = "'null'"
+        encoded = _JSON_EXPRESSIONS[field.kind].format(v=value)
+        # to_dict reads each attribute inline, binding it with := only where it is used twice
+        if field.kind == "datetime":
+            python = f"None if ({value} := {attribute}) is None else {value}.isoformat()"
+        elif field.kind == "url":
+            python = f"{value} if ({value} := {attribute}) is None or {value}.__class__ is _str else _str({value})"
+        elif field.attribute in defaults:
+            namespace[f"_default{index}"] = defaults[field.attribute]
+            namespace[f"_encoded_default{index}"] = _encode(defaults[field.attribute]())
+            null = f"_encoded_default{index}"
+            python = f"_default{index}() if ({value} := {attribute}) is None else {value}"
+        else:
+            python = attribute
+        encoded_values.append(f"    e{index} = {null} if {value} is None else {encoded}")
+
+        extra_keys = aliases.get(field.attribute, ())
+        dict_items.append(f"{field.key!r}: (p{index} := {python})" if extra_keys else f"{field.key!r}: {python}")
+        dict_items.extend(f"{key!r}: p{index}" for key in extra_keys)
+        # The JSON keys are literal text in one f-string, so their braces are doubled
+        json_items.extend(
+            _encode_str(key).replace("{", "{{").replace("}", "}}") + f":{{e{index}}}"
+            for key in (field.key, *extra_keys)
+        )
+
+    source = "\n".join([
+        "def to_dict(obj):",
+        f"    return {{{', '.join(dict_items)}}}",
+        "def to_json(obj):", *loads, *encoded_values,
+        f"    return f{'{{' + ','.join(json_items) + '}}'!r}",
+    ])
+    exec(compile(source, f"<serializers for {model.__name__}>", "exec"), namespace)
+    return Serializer(fields, namespace["to_dict"], namespace["to_json"])
+
+
+def encode_many(rows: Iterable[Any], to_json: Callable[[Any], str]) -> bytes:
+    """A JSON array of ``rows`` encoded with ``to_json``, as UTF-8 bytes."""
+    return ("[" + ",".join(map(to_json, rows)) + "]").encode("utf-8")
@@ -1,23 +1,121 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+import anyio
+from anyio.lowlevel import RunVar
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
 
 from app.core.config import settings
+from app.core.metrics import register_collector
 from app.db.base_class import Base
+from app.db.pool import InstrumentedQueuePool, register_engine
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """Return the shared engine, creating it on first use rather than at import."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Create the SQLAlchemy engine with SQLite-specific settings
+                _engine = register_engine("session", create_engine(
+                    settings.DATABASE_URL,
+                    connect_args={"check_same_thread": False} if "sqlite" in str(settings.DATABASE_URL) else {},
+                    poolclass=InstrumentedQueuePool,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    echo=settings.DEBUG
+                ))
+    return _engine
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to its engine when the first session is created."""
 
-# Create the SQLAlchemy engine with SQLite-specific settings
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in str(settings.DATABASE_URL) else {},
-    echo=settings.DEBUG
-)
+    def __init__(self, engine_factory: Callable[[], Engine], **kw: Any):
+        super().__init__(**kw)
+        self.engine_factory = engine_factory
+
+    def __call__(self, **local_kw: Any) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=self.engine_factory())
+        return super().__call__(**local_kw)
+
+def __getattr__(name: str) -> Any:
+    # ``from app.db.session import engine`` keeps working, building the engine on access
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create a session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(get_engine, autocommit=False, autoflush=False)
 
 # We're using Base from app.db.base_class instead of creating a new one here
 
-def get_db() -> Session:
+# Session handed out by get_db while set (e.g. to every sub-request of a batch)
+_shared_session: ContextVar[Optional["LazySession"]] = ContextVar("shared_session", default=None)
+
+@contextmanager
+def shared_session(db: "LazySession") -> Iterator["LazySession"]:
+    """Make get_db yield ``db`` (without closing it) within this context."""
+    token = _shared_session.set(db)
+    try:
+        yield db
+    finally:
+        _shared_session.reset(token)
+
+class LazySession:
+    """
+    Stands in for a Session until the request first uses it.
+
+    Any attribute access (``db.query``, ``db.add``, ...) creates the session
+    from ``factory`` and forwards to it; closing a session that was never used
+    does nothing. Requests answered from a cache therefore never build a
+    session.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session]):
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+            _session_stats["started"] += 1
+        return getattr(self._session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+_session_stats = {"requests": 0, "started": 0}
+register_collector("db_sessions", lambda: dict(_session_stats))
+
+# Threads that close request sessions, kept apart from AnyIO's default limiter (one per event loop)
+_close_limiter: RunVar[anyio.CapacityLimiter] = RunVar("db_close_limiter")
+
+def _get_close_limiter() -> anyio.CapacityLimiter:
+    try:
+        return _close_limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(settings.DB_CLOSE_THREADS)
+        _close_limiter.set(limiter)
+        return limiter
+
+async def get_db() -> AsyncIterator[LazySession]:
     """
     Dependency function that yields database sessions.
 
@@ -28,21 +126,40 @@ def get_db() -> Session:
         items = db.query(Item).all()
         return items
     ```
+
+    Yields a ``LazySession``: the session and its connection are only created
+    by the first query, and the dependency is async, so a request that never
+    queries costs no threadpool hop. A used session is closed once the route
+    has returned, before the response is sent, in a thread of its own small
+    limiter (``DB_CLOSE_THREADS``) so the rollback does not block the event
+    loop. Closing on AnyIO's default limiter instead can deadlock: when every
+    thread is blocked waiting for a pooled connection, the connection held by
+    a finished request never gets a thread to be released on.
     """
-    db = SessionLocal()
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+    _session_stats["requests"] += 1
+    db = LazySession(SessionLocal)
     try:
         yield db
     finally:
-        db.close()
+        if db.started:
+            # Shielded so a cancelled request still returns its connection
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(db.close, limiter=_get_close_limiter())
 
-def init_db() -> None:
-    """Initialize database tables."""
+def init_db(seed: Optional[Callable[[Session], None]] = None) -> bool:
+    """
+    Create the database tables (and seed them) unless the stored schema fingerprint matches.
+
+    Costs a single query when nothing changed. Raises SchemaOutOfDateError if
+    the database is on an older Alembic revision than the code.
+    """
     # Import all models here to ensure they are registered with SQLAlchemy
-    from app.db.models import profile  # noqa: F401
-    
-    Base.metadata.create_all(bind=engine)
-    
-    # Log database initialization
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info("Database tables created")
+    from app.db import change_log  # noqa: F401
+    from app.db.models import profile, project  # noqa: F401
+    from app.db.fingerprint import ensure_schema
+
+    return ensure_schema(get_engine(), Base.metadata, seed=seed)
@@ -0,0 +1,111 @@
+"""
+Commit-time change notifications.
+
+Every ORM session flush records which rows were created, updated or deleted;
+once the transaction commits, registered listeners are called with the list of
+changes and a process-wide data version is bumped. Caches use the version to
+know when their contents are out of date, and listeners can react to specific
+rows (e.g. invalidate a project's cache entry).
+
+Listeners run synchronously in the committing thread and must be quick;
+exceptions are logged and never propagate to the writer.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+@dataclass(frozen=True)
+class Change:
+    """A committed change to a single row."""
+    resource: str  # Table name, e.g. "projects"
+    id: Any
+    op: str
+    version: Optional[int] = None  # Change-feed version, when the change log recorded the row
+
+
+Listener = Callable[[List[Change]], None]
+
+_listeners: List[Listener] = []
+_version = 0
+_version_lock = threading.Lock()
+
+_PENDING_KEY = "pending_changes"
+_VERSIONS_KEY = "change_versions"
+
+
+def on_commit(listener: Listener) -> Listener:
+    """Register a listener called with the committed changes. Usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def data_version() -> int:
+    """Return a counter that increases every time a transaction with changes commits."""
+    return _version
+
+
+def _identity(obj: Any) -> Tuple[str, Any]:
+    table = getattr(obj, "__tablename__", type(obj).__name__.lower())
+    # Identity keys of new objects are only assigned after after_flush, so read the
+    # primary key straight from the instance (it is populated by the INSERT)
+    pk = inspect(obj).mapper.primary_key_from_instance(obj)
+    return table, pk[0] if len(pk) == 1 else tuple(pk)
+
+
+def flushed_changes(session: Session) -> Iterator[Tuple[Tuple[str, Any], str]]:
+    """``((table, pk), op)`` for every row written by the flush in progress; call from ``after_flush``."""
+    for objects, op in ((session.new, CREATE), (session.dirty, UPDATE), (session.deleted, DELETE)):
+        for obj in objects:
+            if op == UPDATE and not session.is_modified(obj, include_collections=False):
+                continue
+            yield _identity(obj), op
+
+
+def set_change_versions(session: Session, versions: Dict[Tuple[str, Any], int]) -> None:
+    """Attach versions to this transaction's changes, keyed like ``flushed_changes``."""
+    session.info.setdefault(_VERSIONS_KEY, {}).update(versions)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    pending: Dict[Tuple[str, Any], str] = session.info.setdefault(_PENDING_KEY, {})
+    for key, op in flushed_changes(session):
+        previous = pending.get(key)
+        # A row created and then updated in the same transaction is still a create
+        if previous == CREATE and op == UPDATE:
+            continue
+        pending[key] = op
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    global _version
+    pending = session.info.pop(_PENDING_KEY, None)
+    versions = session.info.pop(_VERSIONS_KEY, {})
+    if not pending:
+        return
+    with _version_lock:
+        _version += 1
+    changes = [Change(resource, pk, op, versions.get((resource, pk))) for (resource, pk), op in pending.items()]
+    for listener in list(_listeners):
+        try:
+            listener(changes)
+        except Exception as e:
+            logger.error(f"Commit listener {getattr(listener, '__name__', listener)} failed: {str(e)}", exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_VERSIONS_KEY, None)
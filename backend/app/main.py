@@ -1,9 +1,9 @@
-from fastapi import FastAPI, status, Request, Response, Depends, HTTPException
+from fastapi import FastAPI, status, Request
 from fastapi.responses import JSONResponse, FileResponse
+import asyncio
 import logging
 import time
-from typing import Callable, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Callable, Dict, Any, Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,17 +13,11 @@ from fastapi.staticfiles import StaticFiles
 import os
 from pathlib import Path
 
-# Import the v1 API router and profile function
-from app.api.v1.api import api_router
-from app.api.v1.routes.profile import get_profile as v1_get_profile
-from app.db.session import get_db
-
-app = FastAPI(title="API JD")
+from app.core.config import settings
+from app.db.session import SessionLocal
+from starlette.concurrency import run_in_threadpool
 
 # Configure CORS with environment variables
-import os
-from typing import List
-
 # Get allowed origins from environment variable or use defaults
 ALLOWED_ORIGINS = os.getenv(
     "ALLOWED_ORIGINS",
@@ -36,26 +30,38 @@ ALLOWED_ORIGIN_REGEX = os.getenv(
     r"https?://(localhost|api-jd.*\.vercel\.app|api-jd-ishuraj441.*\.vercel\.app|api-jd\.onrender\.com)"
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
-    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["Content-Disposition"],
-    max_age=600
-)
+static_dir = os.path.join(Path(__file__).parent.parent, "static")
+
 
 # Legacy profile endpoint for backward compatibility - must be defined before other routes
-@app.get("/profile")
-async def legacy_profile():
+def load_first_profile() -> Optional[Dict[str, Any]]:
+    """Load the first profile from the database as a dictionary."""
+    from app.db.models.profile import Profile
+
+    db = SessionLocal()
+    try:
+        profile = db.query(Profile).order_by(Profile.id).first()
+        return profile.to_dict() if profile else None
+    finally:
+        db.close()
+
+async def legacy_profile(request: Request):
     """
     Legacy profile endpoint that returns the same data as the v1 profile endpoint.
     Maintained for backward compatibility with existing frontend clients.
+
+    Served from the pre-rendered snapshot when available, falling back to the
+    database and finally to the default profile.
     """
+    from app.core.snapshots import PROFILE, snapshot_response
+
+    snapshot = snapshot_response(request, PROFILE)
+    if snapshot is not None:
+        return snapshot
     try:
-        # Directly return the profile data instead of trying to call the endpoint
+        profile = await run_in_threadpool(load_first_profile)
+        if profile is not None:
+            return profile
         return {
             "id": 1,
             "name": "Ishu Raj",
@@ -80,40 +86,33 @@ async def legacy_profile():
             }
         )
 
-# Mount static files
-static_dir = os.path.join(Path(__file__).parent.parent, "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
-
-# Add request logging middleware
-@app.middleware("http")
+# Request logging middleware
 async def log_requests(request: Request, call_next: Callable):
     start_time = time.time()
-    
+
     # Log the incoming request
     logger.info(f"Incoming request: {request.method} {request.url}")
-    
+
     # Process the request
     response = await call_next(request)
-    
+
     # Calculate response time
     process_time = (time.time() - start_time) * 1000
-    
+
     # Log the response
     logger.info(
         f"Request processed: {request.method} {request.url} "
         f"Status: {response.status_code} "
         f"Time: {process_time:.2f}ms"
     )
-    
+
     return response
 
 
 # Root endpoint
-@app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     return FileResponse(os.path.join(static_dir, "favicon.ico"))
 
-@app.get("/")
 async def root():
     return {
         "message": "API JD backend running",
@@ -125,7 +124,6 @@ async def root():
     }
 
 # Direct health check endpoint
-@app.get("/health")
 async def health_check():
     return {
         "status": "ok",
@@ -134,7 +132,6 @@ async def health_check():
     }
 
 # Test endpoint
-@app.get("/test")
 async def test_endpoint():
     return {
         "status": "success",
@@ -145,25 +142,115 @@ async def test_endpoint():
         }
     }
 
+# Create or verify the database schema; one fingerprint query when nothing changed
+def check_schema() -> None:
+    if settings.SCHEMA_CHECK_ON_STARTUP and not settings.TESTING:
+        from app.db.init_db import init_db
+
+        # Creates and seeds the schema only when the stored fingerprint differs
+        init_db()
+
+async def setup_schema():
+    check_schema()
+
+# Size the threadpool that runs sync routes and dependencies
+async def setup_threadpool():
+    from app.core.metrics import configure_threadpool
+
+    configure_threadpool(settings.THREADPOOL_SIZE)
+
+# Serve pre-rendered snapshots and keep them fresh after writes
+async def setup_snapshots():
+    if settings.SNAPSHOTS_ENABLED:
+        from app.core.snapshots import configure_snapshots
+
+        configure_snapshots(settings.SNAPSHOT_DIR, SessionLocal).schedule()
+
+async def setup_catalog():
+    if settings.CATALOG_ENABLED:
+        from app.core.catalog import configure_catalog
+
+        catalog = configure_catalog(
+            SessionLocal, settings.CATALOG_MAX_BYTES, settings.CATALOG_RELOAD_SECONDS, settings.CATALOG_SYNC_SECONDS
+        )
+        await run_in_threadpool(catalog.load)
+
+async def teardown_catalog():
+    from app.core.catalog import disable_catalog
+
+    disable_catalog()
+
+# Serve repeated lookups of rows by id or email without a query
+async def setup_identity_cache():
+    if settings.IDENTITY_CACHE_ENABLED:
+        from app.db.identity_cache import configure_identity_cache
+
+        configure_identity_cache(settings.IDENTITY_CACHE_MAX_ENTRIES, settings.IDENTITY_CACHE_TTL)
+
+async def teardown_identity_cache():
+    from app.db.identity_cache import disable_identity_cache
+
+    disable_identity_cache()
+
+# Log project and profile writes for the change feed (creates its table, so not under tests)
+async def setup_change_feed():
+    if settings.CHANGE_FEED_ENABLED and not settings.TESTING:
+        from app.db.change_log import enable_change_log
+        from app.db.session import get_engine
+
+        await run_in_threadpool(enable_change_log, get_engine())
+
+async def teardown_change_feed():
+    from app.db.change_log import disable_change_log
+
+    disable_change_log()
+
+# Stream committed changes to Server-Sent Events subscribers on this worker's loop
+async def setup_events():
+    if settings.EVENTS_ENABLED:
+        from app.core.events import configure_events
+
+        broadcaster = configure_events(
+            asyncio.get_running_loop(),
+            queue_size=settings.EVENTS_QUEUE_SIZE,
+            buffer_size=settings.EVENTS_BUFFER_SIZE,
+            heartbeat=settings.EVENTS_HEARTBEAT_SECONDS,
+            max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+        )
+        # Every worker streams every worker's writes, read from the change log
+        if settings.CHANGE_FEED_ENABLED and not settings.TESTING:
+            broadcaster.follow_log(SessionLocal, settings.EVENTS_POLL_SECONDS)
+
+async def teardown_events():
+    from app.core.events import disable_events
+
+    disable_events()
+
+# Purge the CDN's copies of responses made stale by each write
+async def setup_purging():
+    if settings.CACHE_PURGER:
+        from app.core.cache_policy import configure_purging, load_purger
+
+        configure_purging(load_purger(settings.CACHE_PURGER))
+
+async def teardown_purging():
+    from app.core.cache_policy import disable_purging
+
+    disable_purging()
+
 # Log all registered routes
-@app.on_event("startup")
-async def log_routes():
+def log_routes(app: FastAPI) -> None:
     logger.info("Registered routes:")
     for route in app.routes:
         if hasattr(route, "methods") and hasattr(route, "path"):
             methods = ", ".join(route.methods) if hasattr(route, "methods") else ""
             logger.info(f"{methods} {route.path}")
 
-# Include the v1 API router with the /api/v1 prefix
-app.include_router(api_router, prefix="/api/v1")
-
-
-# Add a simple route to list all available API endpoints
-@app.get("/api")
-async def list_endpoints():
+# List all available API endpoints
+async def list_endpoints(request: Request):
     """List all available API endpoints"""
     endpoints = []
-    for route in app.routes:
+    for route in request.app.routes:
         if hasattr(route, "methods") and hasattr(route, "path"):
             methods = ", ".join(route.methods) if hasattr(route, "methods") else ""
             # Only include API endpoints (not static files, etc.)
@@ -175,3 +262,124 @@ async def list_endpoints():
                     "tags": getattr(route, "tags", [])
                 })
     return {"endpoints": endpoints}
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application.
+
+    Optional subsystems are only imported when enabled, the database engine is
+    created by the first session rather than at import, and the schema check,
+    snapshot writer and threadpool sizing run on startup, so building the app
+    stays cheap for cold starts.
+    """
+    app = FastAPI(title="API JD")
+
+    # Share one execution among identical concurrent reads. Innermost, so response
+    # cache misses are coalesced too and followers never hold a threadpool thread.
+    if settings.COALESCE_ENABLED:
+        from app.core.singleflight import CoalescingMiddleware
+        app.add_middleware(
+            CoalescingMiddleware,
+            paths=settings.COALESCE_PATHS.split(","),
+            timeout=settings.COALESCE_TIMEOUT,
+        )
+
+    # Negotiate gzip/brotli and keep precompressed copies of hot GET payloads.
+    # Added right after coalescing so cached entries never contain CORS headers.
+    from app.core.compression import CompressionMiddleware
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+        cached_paths=settings.CACHED_RESPONSE_PATHS.split(","),
+        ttl=settings.CACHE_TTL,
+        stale_ttl=settings.CACHE_STALE_SECONDS,
+        stale_if_error=settings.CACHE_STALE_IF_ERROR_SECONDS,
+    )
+
+    # Tell browsers and CDNs how long each read may be cached and tag it with surrogate
+    # keys. Outside compression, so cached and coalesced responses are tagged as well.
+    if settings.CACHE_POLICY_ENABLED:
+        from app.core.cache_policy import CachePolicyMiddleware
+        app.add_middleware(CachePolicyMiddleware)
+
+    # Enforce RATE_LIMIT per RATE_LIMIT_WINDOW. Added before CORS so that CORS wraps it
+    # and 429 responses still carry the CORS headers the frontend needs to read Retry-After.
+    if settings.RATE_LIMIT_ENABLED and not settings.TESTING:
+        from app.core.rate_limit import RateLimitMiddleware, create_rate_limit_store, parse_overrides
+        app.add_middleware(
+            RateLimitMiddleware,
+            store=create_rate_limit_store(settings.RATE_LIMIT_STORE, settings.RATE_LIMIT_STORE_PATH),
+            limit=settings.RATE_LIMIT,
+            window=settings.RATE_LIMIT_WINDOW,
+            overrides=parse_overrides(settings.RATE_LIMIT_OVERRIDES),
+            trust_proxy=settings.RATE_LIMIT_TRUST_PROXY,
+            api_keys=[key.strip() for key in settings.RATE_LIMIT_API_KEYS.split(",") if key.strip()],
+        )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=ALLOWED_ORIGINS,
+        allow_origin_regex=ALLOWED_ORIGIN_REGEX,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Content-Disposition", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-Profile-Id"],
+        max_age=600
+    )
+
+    # Profile single requests for admin callers. Only installed when an admin token is
+    # configured, so normal requests pay nothing otherwise; outermost so it sees the whole stack.
+    if settings.PROFILING_ENABLED and settings.ADMIN_TOKEN:
+        from app.core.profiling import ProfilingMiddleware, get_profile_store
+        app.add_middleware(
+            ProfilingMiddleware,
+            token=settings.ADMIN_TOKEN,
+            store=get_profile_store(),
+            interval=settings.PROFILE_INTERVAL_MS / 1000,
+            max_duration=settings.PROFILE_MAX_SECONDS,
+        )
+
+    # Legacy profile endpoint must be registered before other routes
+    app.add_api_route("/profile", legacy_profile, methods=["GET"])
+
+    # Mount static files
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+    # Add request logging middleware
+    app.middleware("http")(log_requests)
+
+    app.add_api_route("/favicon.ico", favicon, methods=["GET"], include_in_schema=False)
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/test", test_endpoint, methods=["GET"])
+
+    app.add_event_handler("startup", setup_schema)
+    app.add_event_handler("startup", setup_threadpool)
+    app.add_event_handler("startup", setup_snapshots)
+    # The change log exists before the catalog loads, so the catalog can follow it
+    app.add_event_handler("startup", setup_change_feed)
+    app.add_event_handler("shutdown", teardown_change_feed)
+    app.add_event_handler("startup", setup_catalog)
+    app.add_event_handler("shutdown", teardown_catalog)
+    app.add_event_handler("startup", setup_identity_cache)
+    app.add_event_handler("shutdown", teardown_identity_cache)
+    app.add_event_handler("startup", setup_events)
+    app.add_event_handler("shutdown", teardown_events)
+    app.add_event_handler("startup", setup_purging)
+    app.add_event_handler("shutdown", teardown_purging)
+    app.add_event_handler("startup", lambda: log_routes(app))
+
+    # Include the v1 API router with the /api/v1 prefix
+    from app.api.v1.api import api_router
+    app.include_router(api_router, prefix="/api/v1")
+
+    # Add a simple route to list all available API endpoints
+    app.add_api_route("/api", list_endpoints, methods=["GET"])
+
+    return app
+
+
+app = create_app()
@@ -3,6 +3,8 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.db.identity_cache import cached_get
+
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
@@ -15,8 +17,8 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        """Get a single record by ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+        """Get a single record by ID (from the identity cache when it is enabled)."""
+        return cached_get(db, self.model, id, lambda: db.query(self.model).filter(self.model.id == id).first())
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException, status
 import logging
 
+from app.db.identity_cache import cached_get_by
 from app.db.models.profile import Profile
 from app.schemas.profile import ProfileCreate, ProfileUpdate
 from .base import BaseRepository
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 class ProfileRepository(BaseRepository[Profile, ProfileCreate, ProfileUpdate]):
     def get_by_email(self, db: Session, email: str) -> Optional[Profile]:
         """
-        Retrieve a profile by email address.
+        Retrieve a profile by email address (from the identity cache when it is enabled).
         
         Args:
             db: Database session
@@ -26,7 +27,12 @@ class ProfileRepository(BaseRepository[Profile, ProfileCreate, ProfileUpdate]):
             HTTPException: If there's an error accessing the database
         """
         try:
-            return db.query(self.model).filter(Profile.email == email).first()
+            profile = cached_get_by(
+                db, self.model, "email", email,
+                lambda: db.query(self.model).filter(Profile.email == email).first()
+            )
+            # The cache matches emails case-insensitively, this lookup is exact
+            return profile if profile is not None and profile.email == email else None
         except SQLAlchemyError as e:
             logger.error(f"Error fetching profile by email {email}: {str(e)}", exc_info=True)
             raise HTTPException(
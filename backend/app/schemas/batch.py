@@ -0,0 +1,24 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchRequestItem(BaseModel):
+    """A read sub-request, e.g. ``{"path": "/api/v1/projects?ids=1,5,9"}``."""
+    id: Optional[str] = Field(None, description="Client-chosen identifier echoed in the response")
+    method: Literal["GET"] = Field("GET", description="Only read requests are supported")
+    path: str = Field(..., description="API path including the query string")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1, description="Sub-requests, run in order")
+
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
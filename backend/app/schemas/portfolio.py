@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from .project import Project
+
+
+class SkillCount(BaseModel):
+    """A skill and the number of projects that use it."""
+    name: str
+    count: int = Field(..., description="Number of projects using this skill")
+
+
+class Portfolio(BaseModel):
+    """Profile, projects and skill counts in a single document."""
+    profile: Optional[Dict[str, Any]] = Field(None, description="The portfolio owner's profile, if one exists")
+    projects: List[Project] = Field(default_factory=list, description="A page of projects, ordered by ID")
+    total_projects: int = Field(0, description="Number of projects across all pages")
+    skills: List[SkillCount] = Field(default_factory=list, description="Skills ordered by project count")
@@ -1,7 +1,6 @@
 from pydantic import BaseModel, EmailStr, HttpUrl, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 from datetime import datetime
-from .project import Project
 
 class ProfileBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Full name of the user")
@@ -40,8 +39,8 @@ class ProfileInDBBase(ProfileBase):
         }
 
 class Profile(ProfileInDBBase):
-    projects: List[Project] = Field(default_factory=list, description="List of projects associated with the profile")
-    
+    # Projects are not embedded; they are paginated under /projects (or bundled by /portfolio)
+
     class Config:
         json_encoders = {
             'Profile': lambda p: {
@@ -57,15 +56,6 @@ class Profile(ProfileInDBBase):
                 'profile_picture_url': str(p.profile_picture_url) if p.profile_picture_url else None,
                 'created_at': p.created_at.isoformat() if p.created_at else None,
                 'updated_at': p.updated_at.isoformat() if p.updated_at else None,
-                'projects': [
-                    {
-                        'id': proj.id,
-                        'title': proj.title,
-                        'description': proj.description,
-                        'links': proj.links,
-                        'skills': [{'id': s.id, 'name': s.name} for s in proj.skills]
-                    } for proj in p.projects
-                ] if hasattr(p, 'projects') else []
             }
         }
 
@@ -73,3 +73,8 @@ class ProjectResponse(BaseModel):
     success: bool
     message: str
     data: Optional[Project] = None
+
+class ProjectMultiGet(BaseModel):
+    """Projects requested by ID, in request order, plus the IDs that were not found."""
+    items: List[Project]
+    missing: List[int] = Field(default_factory=list, description="Requested IDs that do not exist")
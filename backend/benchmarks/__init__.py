@@ -0,0 +1,12 @@
+"""
+Benchmark suite.
+
+Times the layers of a request separately, so a regression can be pinned to the
+layer that caused it: the crud functions, ``BaseRepository``, the models'
+``to_dict``, Pydantic response serialization and full in-process ASGI requests.
+Every case runs against seeded datasets of several sizes built with
+``scripts.generate_dataset``.
+
+Run with: python -m benchmarks run [--sizes 1000 10000 100000] [--output results.json]
+Compare with: python -m benchmarks compare baseline.json results.json [--threshold 0.10]
+"""
@@ -0,0 +1,96 @@
+"""
+Run the benchmark suite or compare two result files.
+
+    python -m benchmarks run [--sizes 1000 10000 100000] [--filter crud.*] [--output results.json] [--baseline baseline.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.10] [--metric median_us]
+
+``run`` and ``compare`` exit with status 1 when a benchmark is slower than the
+baseline by more than the threshold.
+"""
+import argparse
+import fnmatch
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.harness import (  # noqa: E402
+    COMPARED, compare, configure_environment, load_results, measure, print_comparison, save_results,
+)
+
+configure_environment()
+
+
+def run(args: argparse.Namespace) -> int:
+    from benchmarks.cases import CASES, Context, dataset
+
+    # Per-request INFO logging would dominate the ASGI timings
+    logging.disable(logging.INFO)
+    selected = [(name, factory) for name, factory in CASES if any(fnmatch.fnmatch(name, p) for p in args.filter)]
+    results = {}
+    for size in args.sizes:
+        print(f"dataset: {size:,} projects", flush=True)
+        context = Context(size, dataset(size, args.seed), args.seed)
+        try:
+            for name, factory in selected:
+                stats = measure(factory(context), min_time=args.min_time, min_ops=args.min_ops)
+                results[f"{size}/{name}"] = stats
+                print(
+                    f"  {name:<48} median {stats['median_us']:>10.1f}us  p95 {stats['p95_us']:>10.1f}us  "
+                    f"({stats['ops']} ops)",
+                    flush=True,
+                )
+        finally:
+            context.close()
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_results(output, results, {"sizes": args.sizes, "seed": args.seed, "min_time": args.min_time})
+    print(f"\nresults written to {output}")
+
+    if args.baseline:
+        rows, missing, added = compare(load_results(args.baseline), load_results(output), args.threshold)
+        print()
+        print_comparison(rows, missing, added, args.threshold)
+        return 1 if any(row["regression"] for row in rows) else 0
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    rows, missing, added = compare(load_results(args.baseline), load_results(args.current), args.threshold, args.metric)
+    print_comparison(rows, missing, added, args.threshold)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark suite with regression gates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and store the results as JSON")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Dataset sizes (projects)")
+    run_parser.add_argument("--filter", nargs="+", default=["*"], help="Glob patterns of case names to run")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to time each case for")
+    run_parser.add_argument("--min-ops", type=int, default=20, help="Minimum timed calls per case")
+    run_parser.add_argument("--output", type=Path, default=None, help=f"Defaults to a timestamped file in {RESULTS_DIR}")
+    run_parser.add_argument("--baseline", type=Path, default=None, help="Compare against this result file afterwards")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, e.g. 0.10 for 10%%")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, e.g. 0.10 for 10%%")
+    compare_parser.add_argument("--metric", choices=COMPARED, default="median_us")
+    compare_parser.set_defaults(handler=compare_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
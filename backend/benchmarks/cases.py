@@ -0,0 +1,287 @@
+"""
+Benchmark cases.
+
+Each case is a factory that takes a ``Context`` (one seeded dataset) and
+returns the operation to time. Database cases open a fresh session per call,
+as a request would; list cases time one 100-row page.
+"""
+import itertools
+import os
+import random
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud import profile as crud_profile
+from app.crud import project as crud_project
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.db.repositories.base import BaseRepository
+from app.db.serializers import encode_many
+
+DATA_DIR = Path(__file__).parent / ".data"
+PAGE_SIZE = 100
+
+CASES: List[Tuple[str, Callable[["Context"], Callable[[], Any]]]] = []
+
+
+def case(name: str):
+    """Register a benchmark case under ``name``."""
+    def register(factory):
+        CASES.append((name, factory))
+        return factory
+    return register
+
+
+def dataset(size: int, seed: int = 42, directory: Path = DATA_DIR, workers: Optional[int] = None) -> Path:
+    """Path to a SQLite dataset with ``size`` projects, generating it on first use."""
+    from scripts.generate_dataset import generate
+
+    path = directory / f"dataset-{size}-seed{seed}.db"
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        generate(
+            f"sqlite:///{partial}", profiles=max(10, size // 100), projects=size, seed=seed,
+            workers=workers or os.cpu_count() or 1,
+        )
+        partial.rename(path)
+    return path
+
+
+class Context:
+    """An open dataset plus deterministic inputs for the cases."""
+
+    def __init__(self, size: int, path: Path, seed: int = 42):
+        self.size = size
+        self.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.rng = random.Random(seed)
+        with self.session() as db:
+            self.project_ids = [project_id for (project_id,) in db.query(Project.id).order_by(Project.id)]
+            self.profile_ids = [profile_id for (profile_id,) in db.query(Profile.id).order_by(Profile.id)]
+        self._app = None
+
+    def session(self) -> Session:
+        return self.SessionLocal()
+
+    def cycle(self, population: Sequence[Any], count: int = 1000) -> Iterator[Any]:
+        return itertools.cycle([self.rng.choice(population) for _ in range(count)])
+
+    def offsets(self) -> Iterator[int]:
+        return self.cycle(range(0, max(1, len(self.project_ids) - PAGE_SIZE + 1), PAGE_SIZE))
+
+    def page(self, model) -> List[Any]:
+        with self.session() as db:
+            objects = db.query(model).order_by(model.id).limit(PAGE_SIZE).all()
+            db.expunge_all()
+        return objects
+
+    def app(self):
+        """The full application with its database dependency pointed at this dataset."""
+        if self._app is None:
+            from app.db.session import get_db
+            from app.main import create_app
+
+            def override_get_db():
+                db = self.SessionLocal()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            self._app = create_app()
+            self._app.dependency_overrides[get_db] = override_get_db
+        return self._app
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+# crud
+
+@case("crud.get_project")
+def crud_get_project(ctx: Context):
+    ids = ctx.cycle(ctx.project_ids)
+
+    def operation():
+        with ctx.session() as db:
+            return crud_project.get_project(db, next(ids))
+    return operation
+
+
+@case("crud.get_projects[limit=100]")
+def crud_get_projects(ctx: Context):
+    offsets = ctx.offsets()
+
+    def operation():
+        with ctx.session() as db:
+            return crud_project.get_projects(db, skip=next(offsets), limit=PAGE_SIZE)
+    return operation
+
+
+@case("crud.get_projects[limit=100,fields=id,title]")
+def crud_get_projects_sparse(ctx: Context):
+    offsets = ctx.offsets()
+    selection = crud_project.PROJECT_FIELDS.parse("id,title", None)
+
+    def operation():
+        with ctx.session() as db:
+            return crud_project.get_projects(db, skip=next(offsets), limit=PAGE_SIZE, selection=selection)
+    return operation
+
+
+@case("crud.get_project_records[limit=100]")
+def crud_get_project_records(ctx: Context):
+    offsets = ctx.offsets()
+
+    def operation():
+        with ctx.session() as db:
+            return crud_project.get_project_records(db, skip=next(offsets), limit=PAGE_SIZE)
+    return operation
+
+
+@case("crud.get_projects_by_ids[20]")
+def crud_get_projects_by_ids(ctx: Context):
+    batches = itertools.cycle([ctx.rng.sample(ctx.project_ids, min(20, len(ctx.project_ids))) for _ in range(100)])
+
+    def operation():
+        with ctx.session() as db:
+            return crud_project.get_projects_by_ids(db, next(batches))
+    return operation
+
+
+@case("crud.get_profile")
+def crud_get_profile(ctx: Context):
+    ids = ctx.cycle(ctx.profile_ids)
+
+    def operation():
+        with ctx.session() as db:
+            return crud_profile.get_profile(db, next(ids))
+    return operation
+
+
+# BaseRepository
+
+@case("repository.get")
+def repository_get(ctx: Context):
+    repository = BaseRepository(Project)
+    ids = ctx.cycle(ctx.project_ids)
+
+    def operation():
+        with ctx.session() as db:
+            return repository.get(db, next(ids))
+    return operation
+
+
+@case("repository.get_multi[limit=100]")
+def repository_get_multi(ctx: Context):
+    repository = BaseRepository(Project)
+    offsets = ctx.offsets()
+
+    def operation():
+        with ctx.session() as db:
+            return repository.get_multi(db, skip=next(offsets), limit=PAGE_SIZE)
+    return operation
+
+
+# Model serialization
+
+@case("model.Project.to_dict[x100]")
+def project_to_dict(ctx: Context):
+    projects = ctx.page(Project)
+    return lambda: [project.to_dict() for project in projects]
+
+
+@case("model.Profile.to_dict[x100]")
+def profile_to_dict(ctx: Context):
+    profiles = ctx.page(Profile)
+    return lambda: [profile.to_dict() for profile in profiles]
+
+
+@case("model.Project.to_json[x100]")
+def project_to_json(ctx: Context):
+    projects = ctx.page(Project)
+    return lambda: encode_many(projects, Project.to_json)
+
+
+# Pydantic response serialization
+
+@case("schema.Project.validate+dump_json[x100]")
+def project_schema(ctx: Context):
+    from pydantic import TypeAdapter
+    from app.schemas.project import Project as ProjectSchema
+
+    adapter = TypeAdapter(List[ProjectSchema])
+    rows = [project.to_dict() for project in ctx.page(Project)]
+    return lambda: adapter.dump_json(adapter.validate_python(rows))
+
+
+@case("schema.Profile.validate+dump_json[x100]")
+def profile_schema(ctx: Context):
+    from pydantic import TypeAdapter
+    from app.schemas.profile import Profile as ProfileSchema
+
+    adapter = TypeAdapter(List[ProfileSchema])
+    rows = [profile.to_dict() for profile in ctx.page(Profile)]
+    return lambda: adapter.dump_json(adapter.validate_python(rows))
+
+
+# Rate limiting (the budget is 20µs per hit, so 2ms per case call)
+
+@case("rate_limit.MmapRateLimitStore.hit[x100]")
+def rate_limit_mmap_hit(ctx: Context):
+    import tempfile
+    import time
+    from app.core.rate_limit import MmapRateLimitStore
+
+    store = MmapRateLimitStore(os.path.join(tempfile.mkdtemp(prefix="ratelimit-"), "ratelimit.bin"))
+    clients = ctx.cycle([f"ip:10.0.{i // 256}.{i % 256}" for i in range(1000)], count=100000)
+
+    def operation():
+        now = time.time()
+        return [store.hit(next(clients), 1_000_000, 60, now) for _ in range(100)]
+    return operation
+
+
+# Full in-process ASGI requests
+
+def asgi_get(ctx: Context, paths: Iterator[str]):
+    import httpx
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=ctx.app()), base_url="http://benchmark")
+
+    async def operation():
+        response = await client.get(next(paths))
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.request.url} returned {response.status_code}")
+        return response
+    return operation
+
+
+@case("asgi.GET /api/v1/health/")
+def asgi_health(ctx: Context):
+    return asgi_get(ctx, itertools.repeat("/api/v1/health/"))
+
+
+@case("asgi.GET /api/v1/projects/?limit=100")
+def asgi_projects(ctx: Context):
+    return asgi_get(ctx, (f"/api/v1/projects/?skip={skip}&limit={PAGE_SIZE}" for skip in ctx.offsets()))
+
+
+@case("asgi.GET /api/v1/projects/{id}")
+def asgi_project(ctx: Context):
+    from fastapi.testclient import TestClient
+
+    # Ids come from the mounted list route, so this follows whichever projects router is mounted
+    response = TestClient(ctx.app()).get(f"/api/v1/projects/?limit={PAGE_SIZE}")
+    ids = [project["id"] for project in response.json()]
+    return asgi_get(ctx, (f"/api/v1/projects/{project_id}" for project_id in ctx.cycle(ids)))
+
+
+@case("asgi.GET /api/v1/profile/{id}")
+def asgi_profile(ctx: Context):
+    return asgi_get(ctx, (f"/api/v1/profile/{profile_id}" for profile_id in ctx.cycle(ctx.profile_ids)))
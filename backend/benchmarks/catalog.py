@@ -0,0 +1,132 @@
+"""
+Memory and query cost of the in-memory project catalog.
+
+For each dataset size, loads the catalog from the generated database and
+reports:
+
+- the catalog's own size estimate (``CatalogSnapshot.size_bytes``) and the
+  bytes ``tracemalloc`` sees retained after the load, both per 10k projects
+- median time of a few list queries served from the catalog vs the database
+  (``get_project_records``), records only, without serialization
+
+The JSON output (``--output``) carries a ``results`` section in the benchmark
+format, so ``python -m benchmarks compare`` can diff two branches.
+
+Run with: python -m benchmarks.catalog [--sizes 10000 100000] [--repeat 50] [--output catalog.json]
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+
+configure_environment()
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.catalog import ProjectCatalog  # noqa: E402
+from app.crud.project import get_project_records  # noqa: E402
+
+# name -> keyword arguments for CatalogSnapshot.page / get_project_records
+QUERIES: Dict[str, Dict[str, Any]] = {
+    "page": {"skip": 0, "limit": 100},
+    "featured": {"skip": 0, "limit": 100, "featured": True},
+    "status": {"skip": 0, "limit": 100, "status": "archived"},
+}
+
+
+def _median_us(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def measure_memory(SessionLocal) -> Tuple[ProjectCatalog, Dict[str, float]]:
+    """Load a catalog under tracemalloc and report what it keeps."""
+    project_catalog = ProjectCatalog(SessionLocal, max_bytes=sys.maxsize, ttl=0)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    snapshot = project_catalog.load()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    per_10k = 10000 / max(1, len(snapshot))
+    return project_catalog, {
+        "projects": len(snapshot),
+        "estimated_mib_per_10k": snapshot.size_bytes * per_10k / 2**20,
+        "retained_mib_per_10k": retained * per_10k / 2**20,
+    }
+
+
+def run(path: Path, repeat: int) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    try:
+        project_catalog, memory = measure_memory(SessionLocal)
+        snapshot = project_catalog.current()
+        results = {}
+        for name, query in QUERIES.items():
+            def from_database(query=query):
+                with SessionLocal() as db:
+                    return get_project_records(db, **query)
+
+            results[f"catalog/{name}.catalog"] = {"ops": repeat, "median_us": _median_us(lambda: snapshot.page(**query), repeat)}
+            results[f"catalog/{name}.database"] = {"ops": repeat, "median_us": _median_us(from_database, repeat)}
+        return memory, results
+    finally:
+        engine.dispose()
+
+
+def print_results(size: int, memory: Dict[str, float], results: Dict[str, Dict[str, float]], out=sys.stdout) -> None:
+    print(
+        f"{size} projects: {memory['estimated_mib_per_10k']:.2f}MiB estimated, "
+        f"{memory['retained_mib_per_10k']:.2f}MiB retained per 10k projects",
+        file=out,
+    )
+    for name in QUERIES:
+        cached = results[f"catalog/{name}.catalog"]["median_us"]
+        database = results[f"catalog/{name}.database"]["median_us"]
+        print(f"  {name:<10} catalog {cached:>9.1f}us  database {database:>9.1f}us", file=out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.catalog", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Projects in the generated datasets")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    from benchmarks.cases import dataset
+
+    memory: Dict[int, Dict[str, float]] = {}
+    results: Dict[str, Dict[str, float]] = {}
+    for size in args.sizes:
+        memory[size], timings = run(dataset(size, args.seed), args.repeat)
+        print_results(size, memory[size], timings)
+        results.update({f"{name}[size={size}]": stats for name, stats in timings.items()})
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**environment(), "sizes": args.sizes, "repeat": args.repeat, "seed": args.seed}
+        payload = {"meta": meta, "memory": {str(size): stats for size, stats in memory.items()}, "results": results}
+        args.output.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
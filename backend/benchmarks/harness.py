@@ -0,0 +1,159 @@
+"""Timing, result storage and regression comparison for the benchmark suite."""
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+Operation = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+# Result fields compared against the baseline; lower is better for all of them
+COMPARED = ("median_us", "p95_us")
+
+
+def configure_environment(database_url: Optional[str] = None) -> None:
+    """
+    Default the settings that would skew measurements; call before importing the app.
+
+    Settings are read at import: time the request path itself, not the rate
+    limiter, response cache or startup work, and never touch the application
+    database unless asked to.
+    """
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("SNAPSHOTS_ENABLED", "false")
+    os.environ.setdefault("SCHEMA_CHECK_ON_STARTUP", "false")
+    os.environ.setdefault("CACHED_RESPONSE_PATHS", "")
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(__file__).parent / '.data' / 'unused.db'}")
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Per-operation statistics in microseconds."""
+    timings = sorted(timings)
+    return {
+        "ops": len(timings),
+        "median_us": statistics.median(timings) * 1e6,
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e6,
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "min_us": timings[0] * 1e6,
+    }
+
+
+def measure(operation: Operation, min_time: float = 1.0, min_ops: int = 20, warmup: int = 3) -> Dict[str, float]:
+    """
+    Time ``operation`` until both ``min_time`` seconds and ``min_ops`` calls are reached.
+
+    Coroutine functions are awaited in a single event loop, so in-process ASGI
+    requests are timed without per-call loop setup.
+    """
+    if asyncio.iscoroutinefunction(operation):
+        return asyncio.run(_measure_async(operation, min_time, min_ops, warmup))
+
+    for _ in range(warmup):
+        operation()
+    timings: List[float] = []
+    gc.collect()
+    started = time.perf_counter()
+    while len(timings) < min_ops or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+async def _measure_async(operation, min_time: float, min_ops: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        await operation()
+    timings: List[float] = []
+    gc.collect()
+    started = time.perf_counter()
+    while len(timings) < min_ops or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        await operation()
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).parent,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_results(path: Union[str, Path], results: Dict[str, Dict[str, float]], meta: Dict[str, Any]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"meta": {**environment(), **meta}, "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10, metric: str = "median_us"
+) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Compare two result files.
+
+    Returns:
+        One row per shared benchmark (with ``ratio`` and ``regression``), the
+        benchmarks only in the baseline and those only in the current run
+    """
+    if metric not in COMPARED:
+        raise ValueError(f"metric must be one of {', '.join(COMPARED)}")
+    old, new = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name][metric], new[name][metric]
+        ratio = after / before if before else float("inf")
+        rows.append({
+            "name": name,
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows, sorted(old.keys() - new.keys()), sorted(new.keys() - old.keys())
+
+
+def print_comparison(rows: List[Dict[str, Any]], missing: List[str], added: List[str], threshold: float, out=sys.stdout) -> None:
+    width = max([len(row["name"]) for row in rows] + [len(name) for name in missing + added] + [9])
+    print(f"{'benchmark':<{width}} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<{width}} {row['baseline']:>10.1f}us {row['current']:>10.1f}us "
+            f"{row['ratio'] - 1:>+8.1%}{flag}",
+            file=out,
+        )
+    for name in missing:
+        print(f"{name:<{width}} missing from current run", file=out)
+    for name in added:
+        print(f"{name:<{width}} new (no baseline)", file=out)
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}", file=out)
@@ -0,0 +1,107 @@
+"""
+HDR-style latency histogram.
+
+Values (integer microseconds) are recorded into log-linear buckets: exact below
+``2**precision_bits`` and with a fixed relative error (under 1% at the default
+precision) above, so a histogram covering microseconds to minutes stays a few
+hundred counters. Recording is O(1) and histograms from several workers or runs
+can be merged before percentiles are read.
+"""
+from typing import Any, Dict, Iterator, Tuple
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integer values."""
+
+    __slots__ = ("precision_bits", "counts", "count", "total", "min", "max")
+
+    def __init__(self, precision_bits: int = 8):
+        self.precision_bits = precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        half = 1 << (self.precision_bits - 1)
+        return (1 << self.precision_bits) + (shift - 1) * half + (value >> shift) - half
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value that map to ``index``."""
+        exact = 1 << self.precision_bits
+        if index < exact:
+            return index, index
+        half = 1 << (self.precision_bits - 1)
+        shift, offset = divmod(index - exact, half)
+        shift += 1
+        low = (offset + half) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "Histogram") -> None:
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if not other.count:
+            return
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.min = min(self.min, other.min) if self.count else other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def buckets(self) -> Iterator[Tuple[int, int, int]]:
+        """(low, high, count) for every non-empty bucket, in value order."""
+        for index in sorted(self.counts):
+            low, high = self._bounds(index)
+            yield low, high, self.counts[index]
+
+    def percentile(self, percent: float) -> int:
+        """Value at ``percent`` (0-100): the highest value equivalent to the bucket it falls in."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for _, high, count in self.buckets():
+            seen += count
+            if seen >= rank:
+                return min(high, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision_bits": self.precision_bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        histogram = cls(data["precision_bits"])
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
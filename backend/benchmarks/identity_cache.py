@@ -0,0 +1,125 @@
+"""
+Lookup latency with and without the identity cache.
+
+Times the lookups the cache serves (``get_project``, ``get_profile``,
+``get_profile_by_email`` and ``BaseRepository.get``), each with a fresh
+session per call as a request would. Keys are drawn from a hot set of
+``--hot`` rows. Each lookup runs once with the cache disabled and once with
+it enabled and warmed, and reports the median per call and the hit ratio.
+
+The JSON output (``--output``) carries a ``results`` section in the benchmark
+format, so ``python -m benchmarks compare`` can diff two branches.
+
+Run with: python -m benchmarks.identity_cache [--sizes 100000] [--calls 20000] [--hot 1000] [--output identity_cache.json]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+
+configure_environment()
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.crud.profile import get_profile, get_profile_by_email  # noqa: E402
+from app.crud.project import get_project  # noqa: E402
+from app.db.identity_cache import configure_identity_cache, disable_identity_cache  # noqa: E402
+from app.db.models.profile import Profile  # noqa: E402
+from app.db.models.project import Project  # noqa: E402
+from app.repositories import BaseRepository  # noqa: E402
+
+_BATCH = 100
+
+
+def _median_us(SessionLocal, lookup: Callable[[Any, Any], Any], keys: List[Any]) -> float:
+    timings = []
+    for start in range(0, len(keys), _BATCH):
+        batch = keys[start:start + _BATCH]
+        started = time.perf_counter()
+        for key in batch:
+            with SessionLocal() as db:
+                lookup(db, key)
+        timings.append((time.perf_counter() - started) / len(batch))
+    return statistics.median(timings) * 1e6
+
+
+def run(path: Path, calls: int, hot: int, seed: int = 42) -> Dict[str, Dict[str, float]]:
+    engine = create_engine(f"sqlite:///{path}")
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    rng = random.Random(seed)
+    try:
+        with SessionLocal() as db:
+            project_ids = list(db.scalars(select(Project.id).order_by(Project.id).limit(hot)))
+            profiles = list(db.execute(select(Profile.id, Profile.email).order_by(Profile.id).limit(hot)))
+        repository = BaseRepository(Project)
+        lookups = {
+            "get_project": (get_project, project_ids),
+            "get_profile": (get_profile, [profile_id for profile_id, _ in profiles]),
+            "get_profile_by_email": (get_profile_by_email, [email.upper() for _, email in profiles]),
+            "repository.get": (repository.get, project_ids),
+        }
+        results = {}
+        for name, (lookup, population) in lookups.items():
+            keys = [rng.choice(population) for _ in range(calls)]
+            disable_identity_cache()
+            uncached = _median_us(SessionLocal, lookup, keys)
+            cache = configure_identity_cache(max_entries=max(hot, 1) * 2, ttl=3600)
+            try:
+                _median_us(SessionLocal, lookup, population)
+                warm = dict(next(iter(cache.stats()["tables"].values())))
+                cached = _median_us(SessionLocal, lookup, keys)
+                stats = next(iter(cache.stats()["tables"].values()))
+            finally:
+                disable_identity_cache()
+            hits = stats["hits"] - warm["hits"]
+            results[f"identity_cache/{name}.uncached"] = {"ops": calls, "median_us": uncached}
+            results[f"identity_cache/{name}.cached"] = {
+                "ops": calls, "median_us": cached, "hit_ratio": hits / max(1, hits + stats["misses"] - warm["misses"]),
+            }
+        return results
+    finally:
+        engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.identity_cache", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000], help="Projects in the generated datasets")
+    parser.add_argument("--calls", type=int, default=20000, help="Timed lookups per case")
+    parser.add_argument("--hot", type=int, default=1000, help="Rows the lookups are drawn from")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    from benchmarks.cases import dataset
+
+    results: Dict[str, Dict[str, float]] = {}
+    for size in args.sizes:
+        timings = run(dataset(size, args.seed), args.calls, args.hot, args.seed)
+        print(f"{size} projects, {args.hot} hot rows, median per lookup:")
+        for name in ("get_project", "get_profile", "get_profile_by_email", "repository.get"):
+            uncached = timings[f"identity_cache/{name}.uncached"]
+            cached = timings[f"identity_cache/{name}.cached"]
+            print(
+                f"  {name:<22} uncached {uncached['median_us']:>7.1f} us  cached {cached['median_us']:>7.1f} us"
+                f"  ({uncached['median_us'] / cached['median_us']:.2f}x, {cached['hit_ratio']:.0%} hits)"
+            )
+        results.update({f"{name}[size={size}]": stats for name, stats in timings.items()})
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**environment(), "sizes": args.sizes, "calls": args.calls, "hot": args.hot, "seed": args.seed}
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, sort_keys=True) + "\n")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+Load generator.
+
+Drives the application with a weighted mix of requests from a number of
+concurrent clients for a fixed duration, then reports throughput, error
+counts and p50/p95/p99/max latency per endpoint from HDR-style histograms.
+
+Targets:
+- in-process (default): ``app.main:app`` through httpx's ASGI transport, with
+  its startup handlers run first; no sockets involved
+- ``--serve``: the same app served by uvicorn on a local socket in this process
+- ``--url``: an instance that is already running
+
+In-process targets use a copy of a generated dataset (``--dataset-size``) or
+``--database-url``, so write requests never touch the application database.
+The JSON report (``--output``) carries a ``results`` section in the benchmark
+format, so ``python -m benchmarks compare`` can diff two branches.
+
+Run with: python -m benchmarks.load [--concurrency 32] [--duration 30] [--mix list=50,detail=35,search=10,write=5] [--output report.json]
+"""
+import argparse
+import asyncio
+import bisect
+import contextlib
+import json
+import logging
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+from benchmarks.histogram import Histogram  # noqa: E402
+
+PROJECTS = "/api/v1/projects/"
+
+# Request: (method, path, JSON body)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class LoadState:
+    """Inputs shared by the clients: known project ids and skill popularity."""
+
+    def __init__(self, project_ids: List[int]):
+        from scripts.generate_dataset import SKILLS, zipf_cum_weights
+
+        self.project_ids = project_ids or [1]
+        self.skills = SKILLS
+        self.skill_weights = zipf_cum_weights(1.1)
+        self.writes = 0
+
+
+def list_request(rng: random.Random, state: LoadState) -> Request:
+    return "GET", f"{PROJECTS}?skip={rng.randrange(0, 1000, 100)}&limit=100", None
+
+
+def detail_request(rng: random.Random, state: LoadState) -> Request:
+    return "GET", f"{PROJECTS}{rng.choice(state.project_ids)}", None
+
+
+def search_request(rng: random.Random, state: LoadState) -> Request:
+    skill = state.skills[bisect.bisect(state.skill_weights, rng.random() * state.skill_weights[-1])]
+    return "GET", f"{PROJECTS}?skill={skill}&limit=100", None
+
+
+def write_request(rng: random.Random, state: LoadState) -> Request:
+    state.writes += 1
+    return "POST", PROJECTS, {
+        "title": f"Load test project {state.writes}",
+        "description": "Created by the load generator.",
+        "skills": rng.sample(state.skills[:20], 3),
+        "status": "draft",
+    }
+
+
+SCENARIOS: Dict[str, Tuple[str, Callable[[random.Random, LoadState], Request]]] = {
+    "list": (f"GET {PROJECTS}", list_request),
+    "detail": (f"GET {PROJECTS}{{id}}", detail_request),
+    "search": (f"GET {PROJECTS}?skill=", search_request),
+    "write": (f"POST {PROJECTS}", write_request),
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse ``name=weight,...`` into normalized weights."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in mix.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("The request mix needs at least one positive weight")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+class EndpointStats:
+    __slots__ = ("histogram", "errors", "statuses")
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, status: str, latency_us: int, error: bool) -> None:
+        self.histogram.record(latency_us)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if error:
+            self.errors += 1
+
+
+async def client_loop(
+    client, mix: Dict[str, float], state: LoadState, stats: Dict[str, EndpointStats],
+    rng: random.Random, record_from: float, deadline: float,
+) -> None:
+    names = list(mix)
+    cum_weights = []
+    total = 0.0
+    for name in names:
+        total += mix[name]
+        cum_weights.append(total)
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            return
+        name = names[min(len(names) - 1, bisect.bisect(cum_weights, rng.random() * total))]
+        method, path, body = SCENARIOS[name][1](rng, state)
+        try:
+            response = await client.request(method, path, json=body)
+            status, error = str(response.status_code), response.status_code >= 400
+        except Exception as e:
+            status, error = f"exception:{type(e).__name__}", True
+        if started >= record_from:
+            stats[name].record(status, int((time.perf_counter() - started) * 1e6), error)
+
+
+async def generate_load(
+    client, mix: Dict[str, float], concurrency: int, duration: float, warmup: float = 0.0, seed: int = 42,
+) -> Tuple[Dict[str, EndpointStats], float]:
+    """Run ``concurrency`` clients for ``warmup + duration`` seconds and return per-scenario stats."""
+    response = await client.get(f"{PROJECTS}?limit=100")
+    project_ids = [item["id"] for item in response.json()] if response.status_code == 200 else []
+    state = LoadState(project_ids)
+    stats = {name: EndpointStats() for name in mix}
+
+    record_from = time.perf_counter() + warmup
+    deadline = record_from + duration
+    await asyncio.gather(*(
+        client_loop(client, mix, state, stats, random.Random(f"{seed}:{index}"), record_from, deadline)
+        for index in range(concurrency)
+    ))
+    return stats, duration
+
+
+def latency_ms(histogram: Histogram) -> Dict[str, float]:
+    return {
+        "p50": histogram.percentile(50) / 1000,
+        "p95": histogram.percentile(95) / 1000,
+        "p99": histogram.percentile(99) / 1000,
+        "max": histogram.max / 1000,
+        "mean": histogram.mean / 1000,
+    }
+
+
+def build_report(stats: Dict[str, EndpointStats], elapsed: float, meta: Dict[str, Any]) -> Dict[str, Any]:
+    total = Histogram()
+    endpoints, results = {}, {}
+    for name, endpoint in stats.items():
+        histogram = endpoint.histogram
+        total.merge(histogram)
+        endpoints[name] = {
+            "route": SCENARIOS[name][0],
+            "requests": histogram.count,
+            "errors": endpoint.errors,
+            "statuses": dict(sorted(endpoint.statuses.items())),
+            "throughput_rps": histogram.count / elapsed if elapsed else 0.0,
+            "latency_ms": latency_ms(histogram),
+            "histogram": histogram.to_dict(),
+        }
+        results[f"load/{name}"] = {
+            "ops": histogram.count,
+            "median_us": float(histogram.percentile(50)),
+            "p95_us": float(histogram.percentile(95)),
+            "p99_us": float(histogram.percentile(99)),
+            "max_us": float(histogram.max),
+        }
+    return {
+        "meta": {**environment(), **meta},
+        "totals": {
+            "requests": total.count,
+            "errors": sum(endpoint.errors for endpoint in stats.values()),
+            "throughput_rps": total.count / elapsed if elapsed else 0.0,
+            "latency_ms": latency_ms(total),
+        },
+        "endpoints": endpoints,
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any], out=sys.stdout) -> None:
+    print(f"{'endpoint':<40} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}", file=out)
+    rows = [(f"{name} ({data['route']})", data) for name, data in report["endpoints"].items()]
+    rows.append(("total", report["totals"]))
+    for label, data in rows:
+        latency = data["latency_ms"]
+        print(
+            f"{label:<40} {data['requests']:>9} {data['errors']:>7} {data['throughput_rps']:>9.1f} "
+            f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} {latency['max']:>8.2f}",
+            file=out,
+        )
+    for name, data in report["endpoints"].items():
+        failures = {status: count for status, count in data["statuses"].items() if not status.startswith(("1", "2", "3"))}
+        if failures:
+            print(f"  {name} errors: {failures}", file=out)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def open_target(args: argparse.Namespace, limits=None) -> AsyncIterator[Tuple[Any, str]]:
+    """
+    Yield an httpx client for the target chosen by ``--url``/``--serve``, and its label.
+
+    In-process targets import ``app.main``, so call ``prepare_database`` first.
+    """
+    import httpx
+
+    limits = limits or httpx.Limits()
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+            yield client, args.url
+        return
+
+    from app.main import app
+
+    if args.serve:
+        import uvicorn
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            if serving.done():
+                serving.result()
+            await asyncio.sleep(0.05)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=args.timeout) as client:
+                yield client, f"socket http://127.0.0.1:{port}"
+        finally:
+            server.should_exit = True
+            await serving
+        return
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=args.timeout) as client:
+            yield client, "asgi app.main:app"
+    finally:
+        await app.router.shutdown()
+
+
+def prepare_database(args: argparse.Namespace, tmp: str) -> None:
+    """Point in-process targets at ``--database-url`` or at a copy of the generated dataset in ``tmp``."""
+    if args.url:
+        return
+    database_url = args.database_url
+    if database_url is None:
+        copy = Path(tmp) / "dataset.db"
+        database_url = f"sqlite:///{copy}"
+    configure_environment(database_url)
+    if args.database_url is None:
+        from benchmarks.cases import dataset
+
+        shutil.copyfile(dataset(args.dataset_size, args.seed), copy)
+    # Per-request INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    meta = {
+        "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+        "mix": mix, "seed": args.seed,
+    }
+    async with open_target(args, limits) as (client, target):
+        meta["target"] = target
+        stats, elapsed = await generate_load(client, mix, args.concurrency, args.duration, args.warmup, args.seed)
+    return build_report(stats, elapsed, meta)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to record for")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of unrecorded load first")
+    parser.add_argument("--mix", default="list=50,detail=35,search=10,write=5", help="Weighted scenarios: " + ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default=None, help="Load a running instance instead of the in-process app")
+    target.add_argument("--serve", action="store_true", help="Serve the app with uvicorn on a local socket in this process")
+    parser.add_argument("--dataset-size", type=int, default=10000, help="Projects in the generated dataset copy")
+    parser.add_argument("--database-url", default=None, help="Use this database instead of a dataset copy")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="loadgen-") as tmp:
+        prepare_database(args, tmp)
+        report = asyncio.run(run(args))
+
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nreport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
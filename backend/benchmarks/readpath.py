@@ -0,0 +1,147 @@
+"""
+ORM vs Core read path for list pages.
+
+For each list query, loads pages of ``--page`` rows (1000 by default) through
+the ORM (``get_projects``/``get_profiles``: full instances in the session) and
+through the read-only Core path (``get_project_records``/
+``get_profile_records``: ``__slots__`` records), converts them with
+``to_dict`` as the list routes do, and reports per page:
+
+- CPU time (``time.process_time``), median and p95 over ``--repeat`` pages
+- peak traced memory (``tracemalloc``) while loading and converting one page,
+  measured in separate passes so tracing does not skew the CPU times
+
+Pages are drawn from the first ten, so SQLite's OFFSET scan (the same for
+both paths) does not hide the cost of materializing the rows.
+
+The JSON output (``--output``) carries a ``results`` section in the benchmark
+format, so ``python -m benchmarks compare`` can diff two branches.
+
+Run with: python -m benchmarks.readpath [--size 100000] [--page 1000] [--repeat 20] [--output readpath.json]
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+
+configure_environment()
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.crud.profile import get_profile_records, get_profiles  # noqa: E402
+from app.crud.project import get_project_records, get_projects  # noqa: E402
+from app.db.models.profile import Profile  # noqa: E402
+from app.db.models.project import Project  # noqa: E402
+
+# name -> (model, loader(db, skip, limit))
+PATHS: Dict[str, Tuple[Any, Callable[[Session, int, int], List[Any]]]] = {
+    "projects.orm": (Project, lambda db, skip, limit: get_projects(db, skip=skip, limit=limit)),
+    "projects.core": (Project, lambda db, skip, limit: get_project_records(db, skip=skip, limit=limit)),
+    "profiles.orm": (Profile, lambda db, skip, limit: get_profiles(db, skip=skip, limit=limit)),
+    "profiles.core": (Profile, lambda db, skip, limit: get_profile_records(db, skip=skip, limit=limit)),
+}
+
+
+def load_page(SessionLocal, loader, skip: int, limit: int) -> int:
+    with SessionLocal() as db:
+        rows = [row.to_dict() for row in loader(db, skip, limit)]
+    return len(rows)
+
+
+def measure_path(SessionLocal, loader, offsets: List[int], page: int) -> Dict[str, float]:
+    load_page(SessionLocal, loader, offsets[0], page)  # Warm statement caches
+
+    cpu = []
+    for skip in offsets:
+        gc.collect()
+        started = time.process_time()
+        load_page(SessionLocal, loader, skip, page)
+        cpu.append(time.process_time() - started)
+
+    peaks = []
+    for skip in offsets[:5]:
+        gc.collect()
+        tracemalloc.start()
+        load_page(SessionLocal, loader, skip, page)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    cpu.sort()
+    return {
+        "ops": len(cpu),
+        "median_us": statistics.median(cpu) * 1e6,
+        "p95_us": cpu[min(len(cpu) - 1, int(len(cpu) * 0.95))] * 1e6,
+        "peak_kib": statistics.median(peaks) / 1024,
+    }
+
+
+def run(path: Path, page: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    results = {}
+    try:
+        for name, (model, loader) in PATHS.items():
+            with SessionLocal() as db:
+                total = db.execute(select(func.count()).select_from(model)).scalar()
+            # Pages near the start: deep OFFSET scans cost both paths the same and would drown the difference
+            pages = max(1, min(10, total // page))
+            offsets = [(index * 7919 % pages) * page for index in range(repeat)]
+            results[f"readpath/{name}[page={page}]"] = measure_path(SessionLocal, loader, offsets, page)
+    finally:
+        engine.dispose()
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, float]], out=sys.stdout) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'path':<{width}} {'cpu median':>12} {'cpu p95':>12} {'peak memory':>12}", file=out)
+    for name, stats in results.items():
+        print(
+            f"{name:<{width}} {stats['median_us'] / 1000:>10.2f}ms {stats['p95_us'] / 1000:>10.2f}ms "
+            f"{stats['peak_kib']:>9.0f}KiB",
+            file=out,
+        )
+    for resource in ("projects", "profiles"):
+        orm = next((stats for name, stats in results.items() if name.startswith(f"readpath/{resource}.orm")), None)
+        core = next((stats for name, stats in results.items() if name.startswith(f"readpath/{resource}.core")), None)
+        if orm and core:
+            print(
+                f"{resource}: Core path uses {core['median_us'] / orm['median_us']:.0%} of the ORM CPU time "
+                f"and {core['peak_kib'] / orm['peak_kib']:.0%} of its peak memory",
+                file=out,
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.readpath", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000, help="Projects in the generated dataset (profiles: size/100)")
+    parser.add_argument("--page", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Pages timed per path")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    from benchmarks.cases import dataset
+
+    results = run(dataset(args.size, args.seed), args.page, args.repeat)
+    print_results(results)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**environment(), "size": args.size, "page": args.page, "repeat": args.repeat, "seed": args.seed}
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, sort_keys=True) + "\n")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Access-log replay.
+
+Re-issues the requests recorded in the API access log against a local
+instance, keeping their original inter-arrival times (scaled by ``--speed``),
+and compares the replayed latency percentiles, errors and status codes with
+the recorded ones per endpoint. Use it to see how a change behaves under the
+real traffic shape rather than a synthetic mix.
+
+Log formats (several files, e.g. rotated ``api.log.1``, are merged by time):
+- the text log written by ``app.main.log_requests``
+  (``... - Request processed: GET http://host/path?q=1 Status: 200 Time: 12.34ms``)
+- JSON lines with ``timestamp``, ``method``, ``path`` and optionally ``query``
+  or ``query_params``, ``status``/``status_code`` and
+  ``duration_ms``/``response_time_ms``, at the top level or under ``props``
+
+The logs carry no request bodies, so only body-less methods are replayed by
+default (``--methods``). The replay is open-loop: a request is sent when its
+turn comes, whether or not earlier ones have finished, so a slower build
+queues up as it would in production. Targets and database handling are those
+of ``benchmarks.load``; replay against a copy of a database with the logged
+ids (``--database-url``) for the status codes to line up.
+
+Run with: python -m benchmarks.replay logs/api.log [--speed 2] [--limit 10000] [--output report.json]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import environment  # noqa: E402
+from benchmarks.histogram import Histogram  # noqa: E402
+from benchmarks.load import EndpointStats, latency_ms, open_target, prepare_database  # noqa: E402
+
+TEXT_LINE = re.compile(
+    r"^(?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - .*?"
+    r"Request processed: (?P<method>[A-Z]+) (?P<url>\S+) Status: (?P<status>\d{3}) Time: (?P<duration>[\d.]+)ms"
+)
+
+# Path segments that identify a resource rather than a route
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{32,36}|[^/@]+@[^/@]+)$")
+
+
+class LoggedRequest:
+    """One completed request from the access log."""
+
+    __slots__ = ("started", "method", "target", "status", "duration_ms")
+
+    def __init__(self, started: float, method: str, target: str, status: Optional[int], duration_ms: Optional[float]):
+        self.started = started
+        self.method = method
+        self.target = target
+        self.status = status
+        self.duration_ms = duration_ms
+
+    @property
+    def endpoint(self) -> str:
+        return endpoint_label(self.method, self.target)
+
+
+def endpoint_label(method: str, target: str) -> str:
+    """``GET /api/v1/projects/{id}`` for ``GET /api/v1/projects/42?x=1``."""
+    path = urlsplit(target).path
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def _target(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "") or "/"
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value)
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S,%f").timestamp()
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_json_line(line: str) -> Optional[LoggedRequest]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    fields = {**record, **record.get("props", {})} if isinstance(record.get("props"), dict) else record
+    method = fields.get("method")
+    url = fields.get("url") or fields.get("path")
+    timestamp = fields.get("timestamp", fields.get("time", fields.get("asctime")))
+    if not method or not url or timestamp is None:
+        return None
+    target = _target(url)
+    query = fields.get("query", fields.get("query_params"))
+    if query and "?" not in target:
+        target += "?" + (urlencode(query, doseq=True) if isinstance(query, dict) else str(query).lstrip("?"))
+    status = fields.get("status", fields.get("status_code"))
+    duration = fields.get("duration_ms", fields.get("response_time_ms"))
+    try:
+        started = _timestamp(timestamp)
+    except ValueError:
+        return None
+    duration = float(duration) if duration is not None else None
+    # Loggers stamp the record when the request completes
+    if duration is not None and status is not None:
+        started -= duration / 1000
+    return LoggedRequest(started, method.upper(), target, int(status) if status is not None else None, duration)
+
+
+def parse_line(line: str) -> Optional[LoggedRequest]:
+    """The request recorded on ``line``, or ``None`` for any other log line."""
+    line = line.strip()
+    if line.startswith("{"):
+        return parse_json_line(line)
+    match = TEXT_LINE.match(line)
+    if not match:
+        return None
+    duration = float(match["duration"])
+    completed = datetime.strptime(match["timestamp"], "%Y-%m-%d %H:%M:%S,%f").timestamp()
+    return LoggedRequest(completed - duration / 1000, match["method"], _target(match["url"]), int(match["status"]), duration)
+
+
+def read_log(
+    paths: Iterable[Path], methods: Iterable[str] = ("GET", "HEAD"), exclude: Iterable[str] = (),
+    since: Optional[float] = None, limit: Optional[int] = None,
+) -> Tuple[List[LoggedRequest], Dict[str, int]]:
+    """
+    Requests from ``paths`` in start order, plus counts of what was skipped.
+
+    ``exclude`` holds path prefixes to leave out; ``since`` drops requests that
+    started earlier (epoch seconds).
+    """
+    methods, exclude = {m.upper() for m in methods}, tuple(exclude)
+    requests: List[LoggedRequest] = []
+    skipped = {"method": 0, "excluded": 0}
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                request = parse_line(line)
+                if request is None or (since is not None and request.started < since):
+                    continue
+                if request.method not in methods:
+                    skipped["method"] += 1
+                elif exclude and urlsplit(request.target).path.startswith(exclude):
+                    skipped["excluded"] += 1
+                else:
+                    requests.append(request)
+    requests.sort(key=lambda request: request.started)
+    if limit is not None:
+        skipped["limit"] = max(0, len(requests) - limit)
+        requests = requests[:limit]
+    return requests, skipped
+
+
+class ReplayResult:
+    """Recorded and replayed statistics per endpoint, and how well the schedule was kept."""
+
+    def __init__(self):
+        self.original: Dict[str, EndpointStats] = {}
+        self.replayed: Dict[str, EndpointStats] = {}
+        self.mismatches: Dict[str, int] = {}
+        self.lag = Histogram()
+        self.elapsed = 0.0
+        self.span = 0.0
+
+
+async def replay(client, requests: List[LoggedRequest], speed: float = 1.0, max_in_flight: int = 1000) -> ReplayResult:
+    """
+    Send ``requests`` with their recorded spacing divided by ``speed``.
+
+    ``max_in_flight`` bounds the open requests so a stalled target cannot
+    exhaust the client; waiting for a slot shows up as schedule lag.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    result = ReplayResult()
+    if not requests:
+        return result
+    for request in requests:
+        endpoint = request.endpoint
+        if endpoint not in result.original:
+            result.original[endpoint] = EndpointStats()
+            result.replayed[endpoint] = EndpointStats()
+            result.mismatches[endpoint] = 0
+        if request.status is not None and request.duration_ms is not None:
+            result.original[endpoint].record(str(request.status), int(request.duration_ms * 1000), request.status >= 400)
+
+    slots = asyncio.Semaphore(max_in_flight)
+
+    async def send(request: LoggedRequest) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(request.method, request.target)
+            status, error = str(response.status_code), response.status_code >= 400
+        except Exception as e:
+            status, error = f"exception:{type(e).__name__}", True
+        finally:
+            slots.release()
+        endpoint = request.endpoint
+        result.replayed[endpoint].record(status, int((time.perf_counter() - started) * 1e6), error)
+        if request.status is not None and status != str(request.status):
+            result.mismatches[endpoint] += 1
+
+    first = requests[0].started
+    result.span = (requests[-1].started - first) / speed
+    tasks = []
+    begin = time.perf_counter()
+    for request in requests:
+        due = begin + (request.started - first) / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        result.lag.record(int(max(0.0, time.perf_counter() - due) * 1e6))
+        tasks.append(asyncio.ensure_future(send(request)))
+    await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - begin
+    return result
+
+
+def _summary(stats: EndpointStats) -> Dict[str, Any]:
+    return {
+        "requests": stats.histogram.count,
+        "errors": stats.errors,
+        "statuses": dict(sorted(stats.statuses.items())),
+        "latency_ms": latency_ms(stats.histogram),
+    }
+
+
+def build_report(result: ReplayResult, meta: Dict[str, Any]) -> Dict[str, Any]:
+    original_total, replayed_total = Histogram(), Histogram()
+    endpoints, results = {}, {}
+    for endpoint in sorted(result.replayed, key=lambda name: -result.replayed[name].histogram.count):
+        original, replayed = result.original[endpoint], result.replayed[endpoint]
+        original_total.merge(original.histogram)
+        replayed_total.merge(replayed.histogram)
+        endpoints[endpoint] = {
+            "original": _summary(original),
+            "replayed": _summary(replayed),
+            "status_mismatches": result.mismatches[endpoint],
+        }
+        histogram = replayed.histogram
+        results[f"replay/{endpoint}"] = {
+            "ops": histogram.count,
+            "median_us": float(histogram.percentile(50)),
+            "p95_us": float(histogram.percentile(95)),
+            "p99_us": float(histogram.percentile(99)),
+            "max_us": float(histogram.max),
+        }
+    return {
+        "meta": {**environment(), **meta},
+        "schedule": {
+            "recorded_span_s": result.span * meta.get("speed", 1.0),
+            "replay_span_s": result.span,
+            "elapsed_s": result.elapsed,
+            "lag_ms": latency_ms(result.lag),
+        },
+        "totals": {
+            "original": {
+                "requests": original_total.count,
+                "errors": sum(stats.errors for stats in result.original.values()),
+                "latency_ms": latency_ms(original_total),
+            },
+            "replayed": {
+                "requests": replayed_total.count,
+                "errors": sum(stats.errors for stats in result.replayed.values()),
+                "latency_ms": latency_ms(replayed_total),
+            },
+            "status_mismatches": sum(result.mismatches.values()),
+        },
+        "endpoints": endpoints,
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any], out=sys.stdout) -> None:
+    width = max([len(name) for name in report["endpoints"]] + [8])
+    print(
+        f"{'endpoint':<{width}} {'':>8} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+        file=out,
+    )
+    rows = list(report["endpoints"].items()) + [("total", report["totals"])]
+    for name, data in rows:
+        for which in ("original", "replayed"):
+            summary, latency = data[which], data[which]["latency_ms"]
+            print(
+                f"{name if which == 'original' else '':<{width}} {which:>8} {summary['requests']:>9} {summary['errors']:>7} "
+                f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} {latency['max']:>8.2f}",
+                file=out,
+            )
+        original, replayed = data["original"]["latency_ms"]["p95"], data["replayed"]["latency_ms"]["p95"]
+        if original:
+            print(f"{'':<{width}} {'p95 change':>18} {replayed / original - 1:>+7.1%}", file=out)
+    for name, data in report["endpoints"].items():
+        if data["status_mismatches"]:
+            print(
+                f"  {name}: {data['status_mismatches']} status mismatch(es); "
+                f"recorded {data['original']['statuses']}, replayed {data['replayed']['statuses']}",
+                file=out,
+            )
+    schedule = report["schedule"]
+    print(
+        f"\nreplayed {schedule['recorded_span_s']:.1f}s of traffic in {schedule['elapsed_s']:.1f}s "
+        f"(schedule lag p99 {schedule['lag_ms']['p99']:.2f}ms, max {schedule['lag_ms']['max']:.2f}ms)",
+        file=out,
+    )
+
+
+async def run(args: argparse.Namespace, requests: List[LoggedRequest]) -> ReplayResult:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=min(args.max_in_flight, 100))
+    async with open_target(args, limits) as (client, target):
+        args.target = target
+        return await replay(client, requests, args.speed, args.max_in_flight)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("logs", type=Path, nargs="+", help="Access logs, text or JSON lines")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier; 2 halves the gaps between requests")
+    parser.add_argument("--methods", default="GET,HEAD", help="Comma-separated methods to replay")
+    parser.add_argument("--exclude", action="append", default=[], help="Path prefix to leave out (repeatable)")
+    parser.add_argument("--since", default=None, help="Skip requests before this timestamp (ISO 8601)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many requests")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open requests before the schedule waits")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default=None, help="Replay against a running instance instead of the in-process app")
+    target.add_argument("--serve", action="store_true", help="Serve the app with uvicorn on a local socket in this process")
+    parser.add_argument("--dataset-size", type=int, default=10000, help="Projects in the generated dataset copy")
+    parser.add_argument("--database-url", default=None, help="Use this database instead of a dataset copy")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the generated dataset")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    since = _timestamp(args.since) if args.since else None
+    requests, skipped = read_log(args.logs, args.methods.split(","), args.exclude, since, args.limit)
+    if not requests:
+        print("no replayable requests found in the log", file=sys.stderr)
+        return 1
+    print(f"replaying {len(requests)} requests at {args.speed}x (skipped: {skipped})", flush=True)
+
+    with tempfile.TemporaryDirectory(prefix="replay-") as tmp:
+        prepare_database(args, tmp)
+        result = asyncio.run(run(args, requests))
+
+    report = build_report(result, {
+        "target": args.target, "logs": [str(path) for path in args.logs], "speed": args.speed,
+        "methods": args.methods, "skipped": skipped,
+    })
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nreport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
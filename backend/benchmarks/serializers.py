@@ -0,0 +1,171 @@
+"""
+Per-row cost of the generated model serializers vs the methods they replaced.
+
+Loads every project and profile of the generated dataset, both as ORM
+instances and as the ``__slots__`` records the list routes use, and times, per
+row (with the garbage collector paused, as ``timeit`` does):
+
+- ``legacy``: the hand-written ``Project.to_dict``/``Profile.to_dict`` they
+  replaced, and ``reflective``: the old ``Base.to_dict`` (ORM instances only;
+  both copied below)
+- ``to_dict``: the generated dict serializer
+- ``legacy+dumps`` vs ``to_json``: a JSON array of all rows, built with
+  ``json.dumps`` over the legacy dicts vs joined pre-encoded fragments
+
+The JSON output (``--output``) carries a ``results`` section in the benchmark
+format, so ``python -m benchmarks compare`` can diff two branches.
+
+Run with: python -m benchmarks.serializers [--sizes 100000] [--repeat 5] [--output serializers.json]
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+
+configure_environment()
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.models.profile import Profile  # noqa: E402
+from app.db.models.project import Project  # noqa: E402
+from app.db.records import select_records  # noqa: E402
+from app.db.serializers import encode_many  # noqa: E402
+
+# Same settings as FastAPI's JSONResponse
+_dumps = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+def legacy_project_to_dict(self) -> Dict[str, Any]:
+    return {
+        "id": self.id,
+        "title": self.title,
+        "description": self.description,
+        "skills": self.skills,
+        "github_url": self.github_url,
+        "demo_url": self.demo_url,
+        "image_url": self.image_url,
+        "is_featured": self.is_featured,
+        "status": self.status,
+        "metadata": self.project_metadata,
+        "created_at": self.created_at.isoformat() if self.created_at else None,
+        "updated_at": self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def legacy_profile_to_dict(self) -> Dict[str, Any]:
+    return {
+        "id": self.id,
+        "name": self.name,
+        "email": self.email,
+        "title": self.title,
+        "location": self.location,
+        "about": self.about,
+        "github_url": self.github_url,
+        "linkedin_url": self.linkedin_url,
+        "twitter_url": self.twitter_url,
+        "profile_picture_url": self.profile_picture_url,
+        "created_at": self.created_at.isoformat() if self.created_at else None,
+        "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        "profile_metadata": self.profile_metadata or {},
+        "metadata": self.profile_metadata or {}
+    }
+
+
+def legacy_base_to_dict(self) -> Dict[str, Any]:
+    return {
+        c.name: getattr(self, c.name) for c in self.__table__.columns
+    }
+
+
+def _median_ns_per_row(fn: Callable[[], Any], rows: int, repeat: int) -> float:
+    fn()
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return statistics.median(timings) * 1e9 / rows
+
+
+def measure(name: str, rows: List[Any], legacy: Callable[[Any], Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, float]]:
+    to_dict, to_json = rows[0].to_dict.__func__, rows[0].to_json.__func__
+    assert [json.loads(to_json(row)) for row in rows[:100]] == [json.loads(_dumps(legacy(row))) for row in rows[:100]]
+    cases = {
+        "legacy": lambda: [legacy(row) for row in rows],
+        "to_dict": lambda: [to_dict(row) for row in rows],
+        "legacy+dumps": lambda: _dumps([legacy(row) for row in rows]).encode("utf-8"),
+        "to_json": lambda: encode_many(rows, to_json),
+    }
+    if hasattr(rows[0], "__table__"):
+        cases["reflective"] = lambda: [legacy_base_to_dict(row) for row in rows]
+    return {
+        f"serializers/{name}.{case}": {"ops": repeat, "median_ns_per_row": _median_ns_per_row(fn, len(rows), repeat)}
+        for case, fn in cases.items()
+    }
+
+
+def run(path: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with sessionmaker(bind=engine)() as db:
+            results = {}
+            for name, model, legacy in (
+                ("project", Project, legacy_project_to_dict), ("profile", Profile, legacy_profile_to_dict),
+            ):
+                results.update(measure(name, db.scalars(select(model)).all(), legacy, repeat))
+                results.update(measure(f"{name}_record", select_records(db, model), legacy, repeat))
+                db.expunge_all()
+        return results
+    finally:
+        engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serializers", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000], help="Projects in the generated datasets")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over all rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    from benchmarks.cases import dataset
+
+    results: Dict[str, Dict[str, float]] = {}
+    for size in args.sizes:
+        timings = run(dataset(size, args.seed), args.repeat)
+        print(f"{size} projects, ns per row:")
+        for model in ("project", "project_record", "profile", "profile_record"):
+            row = {
+                case: f"{timings[f'serializers/{model}.{case}']['median_ns_per_row']:>6.0f}"
+                if f"serializers/{model}.{case}" in timings else f"{'-':>6}"
+                for case in ("legacy", "reflective", "to_dict", "legacy+dumps", "to_json")
+            }
+            print(
+                f"  {model:<15} legacy {row['legacy']}  reflective {row['reflective']}  to_dict {row['to_dict']}"
+                f"  |  legacy+dumps {row['legacy+dumps']}  to_json {row['to_json']}"
+            )
+        results.update({f"{name}[size={size}]": stats for name, stats in timings.items()})
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**environment(), "sizes": args.sizes, "repeat": args.repeat, "seed": args.seed}
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, sort_keys=True) + "\n")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Request throughput with the lazy ``get_db`` vs an eager per-request session.
+
+Runs a cache-hit-heavy workload through a small ASGI app: the route answers
+``--hit-ratio`` of its requests from an in-memory dict and queries SQLite for
+the rest, like the catalog or snapshot paths of the project routes. The
+engine has a single pooled connection and a short pool timeout. Each
+workload runs twice, once with ``app.db.session.get_db`` and once with the
+previous dependency, which created a session in a threadpool thread for every
+request and closed it in another. Failed requests (e.g. pool timeouts) are
+counted as errors.
+
+Run with: python -m benchmarks.sessions [--requests 5000] [--concurrency 50] [--hit-ratio 0.9 0.99] [--pool-timeout 2] [--output sessions.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import configure_environment, environment  # noqa: E402
+
+configure_environment()
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.db import session as db_session  # noqa: E402
+from app.db.pool import InstrumentedQueuePool  # noqa: E402
+
+
+def build_app(SessionLocal, hit_ratio: float) -> FastAPI:
+    app = FastAPI()
+    cached = {"projects": [{"id": i, "title": f"Project {i}"} for i in range(20)]}
+    every = max(1, round(1 / (1 - hit_ratio))) if hit_ratio < 1 else 0
+
+    @app.get("/projects/{number}")
+    def read(number: int, db: Session = Depends(db_session.get_db)):
+        if every and number % every == 0:
+            return {"projects": [{"id": row[0]} for row in db.execute(text("SELECT 1 UNION ALL SELECT 2"))]}
+        return cached
+
+    def eager_get_db() -> Iterator[Session]:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.state.eager_get_db = eager_get_db
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> Tuple[float, int]:
+    """Requests per second and the number of failed requests."""
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        numbers = iter(range(requests))
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            for number in numbers:
+                response = await client.get(f"/projects/{number}")
+                errors += response.status_code != 200
+
+        await client.get("/projects/1")
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started), errors
+
+
+def run(path: Path, hit_ratio: float, requests: int, concurrency: int, pool_timeout: float) -> Dict[str, Dict[str, float]]:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=pool_timeout,
+    )
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    original = db_session.SessionLocal
+    db_session.SessionLocal = SessionLocal
+    try:
+        results = {}
+        for name in ("eager", "lazy"):
+            app = build_app(SessionLocal, hit_ratio)
+            if name == "eager":
+                app.dependency_overrides[db_session.get_db] = app.state.eager_get_db
+            checkouts = engine.pool.stats()["checkouts"]
+            throughput, errors = asyncio.run(drive(app, requests, concurrency))
+            results[f"sessions/hits={hit_ratio}.{name}"] = {
+                "ops": requests,
+                "requests_per_s": throughput,
+                "median_us": 1e6 / throughput,
+                "checkouts": engine.pool.stats()["checkouts"] - checkouts,
+                "errors": errors,
+            }
+        return results
+    finally:
+        db_session.SessionLocal = original
+        engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.sessions", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--hit-ratio", type=float, nargs="+", default=[0.9, 0.99], help="Share of requests served from cache")
+    parser.add_argument("--pool-timeout", type=float, default=2.0, help="Seconds to wait for the pooled connection")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results here")
+    args = parser.parse_args(argv)
+
+    # Per-request INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    path = Path(__file__).parent / "results" / "sessions.db"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Dict[str, float]] = {}
+    for hit_ratio in args.hit_ratio:
+        timings = run(path, hit_ratio, args.requests, args.concurrency, args.pool_timeout)
+        eager = timings[f"sessions/hits={hit_ratio}.eager"]
+        lazy = timings[f"sessions/hits={hit_ratio}.lazy"]
+        print(
+            f"{hit_ratio:.0%} cache hits: eager {eager['requests_per_s']:>8.0f} req/s  "
+            f"lazy {lazy['requests_per_s']:>8.0f} req/s  ({lazy['requests_per_s'] / eager['requests_per_s']:.2f}x, "
+            f"{eager['errors']} vs {lazy['errors']} errors)"
+        )
+        results.update(timings)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**environment(), "requests": args.requests, "concurrency": args.concurrency, "pool_timeout": args.pool_timeout}
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, sort_keys=True) + "\n")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
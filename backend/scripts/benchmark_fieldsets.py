@@ -0,0 +1,109 @@
+"""
+Compare full and sparse (?fields=) project list responses on a 10k-project dataset.
+
+Builds a throwaway SQLite database, then requests every page of the project
+list with and without a field selection and reports payload size and latency.
+
+Run with: python -m scripts.benchmark_fieldsets [--projects 10000] [--rounds 3]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.routes import projects
+from app.db.base_class import Base
+from app.db.models.project import Project
+from app.db.session import get_db
+
+PAGE_SIZE = 100
+
+VARIANTS = {
+    "full": {},
+    "fields=id,title,skills,image_url": {"fields": "id,title,skills,image_url"},
+    "fields=id,title": {"fields": "id,title"},
+}
+
+
+def build_app(database_path: str, project_count: int) -> TestClient:
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Project.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+
+    db = SessionLocal()
+    db.bulk_insert_mappings(Project, [
+        {
+            "title": f"Project {i}",
+            "description": ("A realistic project description. " * 40)[: 400 + (i * 37) % 1600],
+            "skills": ["python", "fastapi", "react", "postgresql"][: 1 + i % 4],
+            "github_url": f"https://github.com/example/project-{i}",
+            "image_url": f"https://images.example.com/project-{i}.png",
+            "is_featured": i % 10 == 0,
+            "status": "active",
+            "project_metadata": {"year": 2020 + i % 5, "stars": i % 500, "tags": ["demo", "portfolio"]},
+        }
+        for i in range(project_count)
+    ])
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.include_router(projects.router, prefix="/projects")
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def run(project_count: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        client = build_app(str(Path(tmp) / "bench.db"), project_count)
+        # Snapshots are not configured here, so every page is served from the database
+        offsets = range(0, project_count, PAGE_SIZE)
+
+        print(f"{project_count} projects, {len(offsets)} pages of {PAGE_SIZE}, {rounds} rounds\n")
+        print(f"{'variant':<36} {'bytes/page':>12} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9}")
+        baseline = None
+        for name, params in VARIANTS.items():
+            sizes, latencies = [], []
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for skip in offsets:
+                    t0 = time.perf_counter()
+                    response = client.get("/projects/", params={"skip": skip, "limit": PAGE_SIZE, **params})
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    response.raise_for_status()
+                    sizes.append(len(response.content))
+            total = time.perf_counter() - started
+            size = statistics.mean(sizes)
+            baseline = baseline or (size, total)
+            latencies.sort()
+            print(
+                f"{name:<36} {size:>12,.0f} {statistics.median(latencies):>9.2f} "
+                f"{latencies[int(len(latencies) * 0.95)]:>9.2f} {total:>9.2f}"
+                f"   ({size / baseline[0]:.0%} size, {total / baseline[1]:.0%} time)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run(args.projects, args.rounds)
@@ -0,0 +1,131 @@
+"""
+Compare server throughput with one worker and with N workers.
+
+Starts ``server.py`` for each worker count on a free port, drives it with
+keep-alive HTTP clients running in separate processes (so the load generator
+does not share a GIL with itself) and reports requests per second, latency and
+per-worker memory.
+
+Run with: python -m scripts.benchmark_workers [--workers 1 4] [--duration 10] [--path /api/v1/health/]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def client(port: int, path: str, duration: float, results) -> None:
+    latencies = []
+    errors = 0
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, errors))
+
+
+def wait_until_up(port: int, path: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def run(workers: int, path: str, duration: float, clients: int) -> dict:
+    port = free_port()
+    env = {**os.environ, "RATE_LIMIT_ENABLED": "false", "SNAPSHOTS_ENABLED": "false"}
+    # Request logs go to a file; an unread pipe would fill up and stall the workers
+    log = tempfile.TemporaryFile(mode="w+")
+    server = subprocess.Popen(
+        [sys.executable, "server.py", "--workers", str(workers), "--port", str(port), "--host", "127.0.0.1"],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        wait_until_up(port, path)
+        time.sleep(1)  # let every worker finish booting
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=client, args=(port, path, duration, results))
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        latencies, errors = [], 0
+        for _ in processes:
+            batch, batch_errors = results.get()
+            latencies.extend(batch)
+            errors += batch_errors
+        for process in processes:
+            process.join()
+
+        server.send_signal(signal.SIGUSR1)
+        time.sleep(0.5)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    log.seek(0)
+    memory = [line.split("Memory: ", 1)[1].strip() for line in log if "Memory: " in line]
+    log.close()
+    latencies.sort()
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        "memory": memory[-1] if memory else "n/a",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/api/v1/health/")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive clients (one process each)")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, GET {args.path}, {args.duration:.0f}s, {args.clients} clients\n")
+    baseline = None
+    for count in dict.fromkeys(args.workers):
+        result = run(count, args.path, args.duration, args.clients)
+        baseline = baseline or result["rps"]
+        print(
+            f"workers={result['workers']:<3} {result['rps']:>9.0f} req/s ({result['rps'] / baseline:.2f}x)  "
+            f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms errors={result['errors']}"
+        )
+        print(f"  {result['memory']}")
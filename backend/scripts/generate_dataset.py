@@ -0,0 +1,371 @@
+"""
+Generate a large synthetic dataset of profiles and projects for load testing.
+
+Rows are generated in chunks by a pool of worker processes and written by the
+parent with executemany inserts inside large transactions. Every chunk seeds
+its own random generator from (--seed, table, chunk number), so the same
+arguments always produce the same rows whatever the number of workers.
+
+Skills follow a Zipf distribution over a fixed vocabulary (a handful appear in
+most projects, the long tail in very few), description and bio lengths are
+log-normal, and the metadata JSON varies in shape from row to row.
+
+Run with: python -m scripts.generate_dataset --profiles 100000 --projects 2000000 [--seed 42] [--workers 4]
+"""
+import argparse
+import bisect
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import column, create_engine, event, func, insert, select, table
+from sqlalchemy.engine import Engine
+
+SKILLS = [
+    "python", "javascript", "typescript", "react", "sql", "docker", "git", "fastapi", "node.js", "postgresql",
+    "aws", "html", "css", "java", "linux", "django", "kubernetes", "go", "redis", "flask",
+    "machine learning", "pandas", "next.js", "graphql", "mongodb", "c++", "rust", "vue", "terraform", "numpy",
+    "tailwindcss", "sqlalchemy", "pytorch", "tensorflow", "rest", "ci/cd", "gcp", "azure", "kafka", "spark",
+    "c#", ".net", "angular", "svelte", "kotlin", "swift", "flutter", "react native", "php", "laravel",
+    "ruby", "rails", "scala", "elixir", "haskell", "celery", "rabbitmq", "elasticsearch", "nginx", "ansible",
+    "airflow", "dbt", "snowflake", "bigquery", "mysql", "sqlite", "websockets", "grpc", "oauth", "jwt",
+    "pytest", "jest", "cypress", "playwright", "selenium", "storybook", "webpack", "vite", "babel", "sass",
+    "figma", "three.js", "d3.js", "opencv", "scikit-learn", "langchain", "rag", "llm", "nlp", "computer vision",
+    "streamlit", "gradio", "jupyter", "matplotlib", "plotly", "prometheus", "grafana", "opentelemetry", "sentry", "datadog",
+    "helm", "argo cd", "github actions", "gitlab ci", "jenkins", "serverless", "lambda", "cloudflare", "vercel", "render",
+    "supabase", "firebase", "prisma", "trpc", "zod", "redux", "mobx", "rxjs", "electron", "tauri",
+    "webassembly", "solidity", "web3", "unity", "godot", "arduino", "raspberry pi", "mqtt", "embedded c", "fpga",
+]
+
+WORDS = (
+    "api backend frontend service platform dashboard pipeline model dataset cache queue worker scheduler "
+    "integration deployment container cluster endpoint client server request response latency throughput "
+    "user account profile project portfolio search filter pagination analytics report metric alert log "
+    "feature release migration schema database index query transaction replica shard storage upload image "
+    "video stream realtime notification email payment checkout cart inventory order invoice subscription "
+    "authentication authorization session token role permission audit security encryption backup recovery "
+    "test coverage benchmark profiling optimization refactor module package library framework plugin "
+    "extension component layout theme responsive accessible mobile desktop web cloud edge serverless "
+    "scalable reliable fast simple modern lightweight open source experimental production internal public "
+    "built with using supports provides handles includes features designed for and with the a of to in on"
+).split()
+
+TAGS = ["web", "api", "cli", "ml", "data", "devops", "mobile", "game", "iot", "security", "oss", "hackathon", "learning", "side-project"]
+LICENSES = ["MIT", "Apache-2.0", "GPL-3.0", "BSD-3-Clause", "MPL-2.0", "Unlicense"]
+STATUSES = ["active"] * 8 + ["archived"] * 1 + ["draft"] * 1
+
+FIRST_NAMES = [
+    "aarav", "aditi", "alex", "amara", "ana", "arjun", "ben", "chen", "chloe", "daniel", "divya", "elena",
+    "emma", "fatima", "gabriel", "hana", "hiro", "isha", "ivan", "jamal", "julia", "kai", "karan", "lena",
+    "liam", "lucas", "maya", "mei", "mohammed", "nina", "noah", "olivia", "omar", "priya", "rahul", "sara",
+    "sofia", "tariq", "wei", "yusuf", "zara", "zoe",
+]
+LAST_NAMES = [
+    "agarwal", "ahmed", "brown", "chen", "costa", "das", "davis", "fernandez", "garcia", "gupta", "hansen",
+    "ito", "jones", "khan", "kim", "kumar", "lee", "li", "martin", "meyer", "miller", "mueller", "nguyen",
+    "novak", "okafor", "patel", "raj", "rossi", "sato", "schmidt", "sharma", "silva", "singh", "smith",
+    "tanaka", "wang", "williams", "wilson", "yadav", "zhang",
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Full Stack Developer", "Backend Developer",
+    "Frontend Developer", "Data Scientist", "Machine Learning Engineer", "DevOps Engineer", "Site Reliability Engineer",
+    "Mobile Developer", "Data Engineer", "Engineering Manager", "Student", "Freelance Developer", "Staff Engineer",
+]
+LOCATIONS = [
+    "Bengaluru, India", "Patna, India", "Delhi, India", "Mumbai, India", "Hyderabad, India", "Berlin, Germany",
+    "London, UK", "Paris, France", "Amsterdam, Netherlands", "Lisbon, Portugal", "New York, USA",
+    "San Francisco, USA", "Seattle, USA", "Austin, USA", "Toronto, Canada", "Sao Paulo, Brazil", "Lagos, Nigeria",
+    "Nairobi, Kenya", "Singapore", "Tokyo, Japan", "Seoul, South Korea", "Sydney, Australia", "Remote",
+]
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "proton.me", "yahoo.com", "example.com", "dev.io"]
+
+EPOCH = datetime(2019, 1, 1)
+SPAN_SECONDS = 6 * 365 * 24 * 3600
+
+# Columns written by the generator; untyped so pre-encoded JSON strings pass straight through
+PROJECT_COLUMNS = (
+    "id", "title", "description", "skills", "github_url", "demo_url", "image_url",
+    "is_featured", "status", "metadata", "created_at", "updated_at",
+)
+PROFILE_COLUMNS = (
+    "id", "name", "email", "title", "location", "about", "github_url", "linkedin_url",
+    "twitter_url", "profile_picture_url", "profile_metadata", "created_at", "updated_at",
+)
+TABLES = {
+    "profiles": table("profiles", *(column(name) for name in PROFILE_COLUMNS)),
+    "projects": table("projects", *(column(name) for name in PROJECT_COLUMNS)),
+}
+
+# Task: (table name, chunk number, first id, row count, seed, zipf exponent)
+Task = Tuple[str, int, int, int, int, float]
+
+_cum_weights: Dict[float, List[float]] = {}
+
+
+def zipf_cum_weights(exponent: float, size: int = len(SKILLS)) -> List[float]:
+    """Cumulative weights where rank r (from 1) has weight 1 / r**exponent."""
+    if exponent not in _cum_weights:
+        _cum_weights[exponent] = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+    return _cum_weights[exponent]
+
+
+def lognormal_length(rng: random.Random, median: int, sigma: float, low: int, high: int) -> int:
+    return max(low, min(high, int(rng.lognormvariate(math.log(median), sigma))))
+
+
+def text_of_length(rng: random.Random, length: int) -> str:
+    """Sentences of vocabulary words, about ``length`` characters long."""
+    sentences = []
+    size = 0
+    while size < length:
+        words = rng.choices(WORDS, k=rng.randint(6, 18))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)[:length].rstrip()
+
+
+def timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f") + "+00:00"
+
+
+def zipf_skills(rng: random.Random, cum_weights: Sequence[float]) -> List[str]:
+    total = cum_weights[-1]
+    count = min(len(SKILLS), max(1, int(rng.gammavariate(2.0, 2.0))))
+    picked: List[str] = []
+    for _ in range(count * 3):
+        skill = SKILLS[bisect.bisect(cum_weights, rng.random() * total)]
+        if skill not in picked:
+            picked.append(skill)
+            if len(picked) == count:
+                break
+    return picked
+
+
+def generate_projects(rng: random.Random, start_id: int, count: int, zipf: float) -> List[Dict[str, Any]]:
+    cum_weights = zipf_cum_weights(zipf)
+    rows = []
+    for project_id in range(start_id, start_id + count):
+        skills = zipf_skills(rng, cum_weights)
+        owner = f"{rng.choice(FIRST_NAMES)}{rng.choice(LAST_NAMES)}{rng.randrange(100)}"
+        slug = f"{skills[0].replace(' ', '-').replace('/', '-').replace('.', '')}-{rng.choice(WORDS)}-{project_id}"
+        created = timestamp(rng)
+        metadata: Dict[str, Any] = {
+            "year": created.year,
+            "stars": min(int(rng.paretovariate(1.1)) - 1, 250000),
+            "tech_stack": skills[: rng.randint(1, len(skills))],
+            "tags": rng.sample(TAGS, rng.randint(0, 4)),
+        }
+        if rng.random() < 0.4:
+            metadata["license"] = rng.choice(LICENSES)
+        if rng.random() < 0.2:
+            metadata["contributors"] = [
+                f"{rng.choice(FIRST_NAMES)}{rng.choice(LAST_NAMES)}" for _ in range(rng.randint(1, 12))
+            ]
+        if rng.random() < 0.1:
+            metadata["links"] = {"docs": f"https://docs.example.com/{slug}", "issues": f"https://github.com/{owner}/{slug}/issues"}
+        rows.append({
+            "id": project_id,
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).title()[:200],
+            "description": text_of_length(rng, lognormal_length(rng, 280, 0.8, 20, 8000)) if rng.random() < 0.95 else None,
+            "skills": json.dumps(skills),
+            "github_url": f"https://github.com/{owner}/{slug}" if rng.random() < 0.85 else None,
+            "demo_url": f"https://{slug}.example.app" if rng.random() < 0.4 else None,
+            "image_url": f"https://images.example.com/projects/{project_id}.png" if rng.random() < 0.7 else None,
+            "is_featured": rng.random() < 0.05,
+            "status": rng.choice(STATUSES),
+            "metadata": json.dumps(metadata, separators=(",", ":")),
+            "created_at": format_timestamp(created),
+            "updated_at": format_timestamp(created + timedelta(days=rng.randrange(400))) if rng.random() < 0.6 else None,
+        })
+    return rows
+
+
+def generate_profiles(rng: random.Random, start_id: int, count: int, zipf: float) -> List[Dict[str, Any]]:
+    cum_weights = zipf_cum_weights(zipf)
+    rows = []
+    for profile_id in range(start_id, start_id + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = f"{first}{last}{profile_id}"
+        created = timestamp(rng)
+        metadata: Dict[str, Any] = {"skills": zipf_skills(rng, cum_weights), "open_to_work": rng.random() < 0.3}
+        if rng.random() < 0.5:
+            metadata["years_experience"] = rng.randint(0, 25)
+        if rng.random() < 0.2:
+            metadata["languages"] = rng.sample(["English", "Hindi", "German", "Spanish", "French", "Japanese"], rng.randint(1, 3))
+        rows.append({
+            "id": profile_id,
+            "name": f"{first.title()} {last.title()}",
+            "email": f"{first}.{last}.{profile_id}@{rng.choice(EMAIL_DOMAINS)}",
+            "title": rng.choice(TITLES),
+            "location": rng.choice(LOCATIONS),
+            "about": text_of_length(rng, lognormal_length(rng, 600, 0.7, 40, 10000)),
+            "github_url": f"https://github.com/{handle}",
+            "linkedin_url": f"https://www.linkedin.com/in/{first}-{last}-{profile_id}/" if rng.random() < 0.7 else None,
+            "twitter_url": f"https://twitter.com/{handle}" if rng.random() < 0.3 else None,
+            "profile_picture_url": f"https://images.example.com/avatars/{profile_id}.jpg" if rng.random() < 0.6 else None,
+            "profile_metadata": json.dumps(metadata, separators=(",", ":")),
+            "created_at": format_timestamp(created),
+            "updated_at": format_timestamp(created + timedelta(days=rng.randrange(400))),
+        })
+    return rows
+
+
+GENERATORS = {"profiles": generate_profiles, "projects": generate_projects}
+
+
+def generate_chunk(task: Task) -> Tuple[str, List[Dict[str, Any]]]:
+    """Generate one chunk of rows; the result depends only on the task."""
+    name, index, start_id, count, seed, zipf = task
+    rng = random.Random(f"{seed}:{name}:{index}")
+    return name, GENERATORS[name](rng, start_id, count, zipf)
+
+
+def plan(name: str, total: int, start_id: int, chunk_size: int, seed: int, zipf: float) -> Iterator[Task]:
+    for index, offset in enumerate(range(0, total, chunk_size)):
+        yield name, index, start_id + offset, min(chunk_size, total - offset), seed, zipf
+
+
+def generated_chunks(tasks: Iterable[Task], workers: int) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Yield generated chunks in task order, keeping at most two per worker in flight."""
+    if workers <= 1:
+        yield from map(generate_chunk, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(generate_chunk, (task,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def next_id(engine: Engine, name: str) -> int:
+    with engine.connect() as connection:
+        return (connection.execute(select(func.max(TABLES[name].c.id))).scalar() or 0) + 1
+
+
+def create_dataset_engine(database_url: str) -> Engine:
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def fast_bulk_load(dbapi_connection, connection_record):
+            # Bulk-load settings: a crash mid-run loses the run, not committed data elsewhere
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA cache_size=-200000")
+            cursor.close()
+    return engine
+
+
+def generate(
+    database_url: str,
+    profiles: int,
+    projects: int,
+    seed: int = 42,
+    workers: int = 1,
+    chunk_size: int = 20000,
+    batch_size: int = 5000,
+    commit_every: int = 200000,
+    zipf: float = 1.1,
+    reset: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Generate and insert the dataset.
+
+    Args:
+        database_url: Target database; tables are created if missing
+        profiles: Number of profiles to add
+        projects: Number of projects to add
+        seed: Seed for all random choices
+        workers: Processes generating rows (1 generates in-process)
+        chunk_size: Rows generated per task
+        batch_size: Rows per executemany call
+        commit_every: Rows per transaction
+        zipf: Zipf exponent for skill popularity
+        reset: Delete existing profiles and projects first
+
+    Returns:
+        Per-table row counts, elapsed seconds and rows per second
+    """
+    from app.db import change_log  # noqa: F401
+    from app.db.base_class import Base
+    from app.db.fingerprint import ensure_schema
+    from app.db.models import profile, project  # noqa: F401
+
+    engine = create_dataset_engine(database_url)
+    ensure_schema(engine, Base.metadata)
+    if reset:
+        with engine.begin() as connection:
+            for target in TABLES.values():
+                connection.execute(target.delete())
+
+    stats: Dict[str, Dict[str, float]] = {}
+    for name, total in (("profiles", profiles), ("projects", projects)):
+        if total <= 0:
+            continue
+        started = time.perf_counter()
+        statement = insert(TABLES[name])
+        tasks = plan(name, total, next_id(engine, name), chunk_size, seed, zipf)
+        written = uncommitted = 0
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            for _, rows in generated_chunks(tasks, workers):
+                for offset in range(0, len(rows), batch_size):
+                    connection.execute(statement, rows[offset:offset + batch_size])
+                written += len(rows)
+                uncommitted += len(rows)
+                if uncommitted >= commit_every:
+                    transaction.commit()
+                    transaction = connection.begin()
+                    uncommitted = 0
+                    print(f"  {name}: {written:,}/{total:,}", flush=True)
+            transaction.commit()
+        elapsed = time.perf_counter() - started
+        stats[name] = {"rows": written, "seconds": elapsed, "rows_per_second": written / elapsed}
+    engine.dispose()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Defaults to the application's DATABASE_URL")
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Rows generated per worker task")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per executemany call")
+    parser.add_argument("--commit-every", type=int, default=200000, help="Rows per transaction")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for skill popularity")
+    parser.add_argument("--reset", action="store_true", help="Delete existing profiles and projects first")
+    args = parser.parse_args()
+
+    if args.database_url is None:
+        from app.core.config import settings
+        args.database_url = settings.DATABASE_URL
+
+    results = generate(
+        args.database_url, args.profiles, args.projects, seed=args.seed, workers=args.workers,
+        chunk_size=args.chunk_size, batch_size=args.batch_size, commit_every=args.commit_every,
+        zipf=args.zipf, reset=args.reset,
+    )
+    for name, result in results.items():
+        print(f"{name:<9} {result['rows']:>12,.0f} rows in {result['seconds']:.1f}s ({result['rows_per_second']:,.0f} rows/s)")
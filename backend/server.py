@@ -0,0 +1,400 @@
+"""
+Production server: a pre-forking master process in front of uvicorn workers.
+
+The master imports ``app.main:app`` once, runs a full collection and calls
+``gc.freeze()`` so the imported modules, routes and schemas stay on pages
+shared copy-on-write with every worker. It then binds the listening socket and
+forks the workers, which all accept from that socket. Each worker runs
+uvicorn with uvloop and httptools when they are installed.
+
+Signals handled by the master:
+
+- ``SIGTERM`` / ``SIGINT``: graceful shutdown. Workers finish in-flight
+  requests for up to ``--graceful-timeout`` seconds.
+- ``SIGHUP``: rolling restart. Workers are replaced one at a time, and an old
+  worker is only retired after its replacement is accepting connections.
+- ``SIGTTIN`` / ``SIGTTOU``: add or remove a worker.
+- ``SIGUSR1``: log resident and private memory for every worker.
+
+Workers that die are replaced. Because the application is preloaded, a
+rolling restart recycles worker processes (and their memory) but does not
+pick up new code; deploy a new release by restarting the master.
+
+Run with: python server.py [--workers N] [--host 0.0.0.0] [--port 8000]
+"""
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+
+logger = logging.getLogger("server")
+
+# Exit code of a worker whose application failed to start
+WORKER_BOOT_ERROR = 3
+
+
+def default_workers() -> int:
+    """Worker count from WEB_CONCURRENCY, else one per CPU available to this process."""
+    configured = int(os.getenv("WEB_CONCURRENCY", "0"))
+    if configured > 0:
+        return configured
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:  # pragma: no cover - not available on macOS
+        return max(1, os.cpu_count() or 1)
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def format_bytes(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / (1024 * 1024):.1f} MiB"
+
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn server that tells the master when it is accepting connections."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+class Worker:
+    __slots__ = ("pid", "ready_fd", "ready", "started", "retire_deadline")
+
+    def __init__(self, pid: int, ready_fd: int):
+        self.pid = pid
+        self.ready_fd = ready_fd
+        self.ready = False
+        self.started = time.monotonic()
+        self.retire_deadline: Optional[float] = None
+
+
+class Master:
+    """Pre-forking process manager for uvicorn workers."""
+
+    HANDLED_SIGNALS = (
+        signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGUSR1, signal.SIGCHLD,
+    )
+
+    def __init__(
+        self,
+        app_path: str,
+        host: str,
+        port: int,
+        workers: int,
+        graceful_timeout: int = 30,
+        boot_timeout: int = 60,
+        stats_interval: int = 0,
+    ):
+        self.app_path = app_path
+        self.host = host
+        self.port = port
+        self.target = workers
+        self.graceful_timeout = graceful_timeout
+        self.boot_timeout = boot_timeout
+        self.stats_interval = stats_interval
+        self.app = None
+        self.sock: Optional[socket.socket] = None
+        self.workers: Dict[int, Worker] = {}
+        self.stopping = False
+        self._wakeup_r = self._wakeup_w = -1
+        self._boot_failures = 0
+
+    # Master setup
+
+    def preload(self) -> None:
+        """Import the application once so every worker shares its memory."""
+        started = time.perf_counter()
+        module_name, _, attribute = self.app_path.partition(":")
+        module = importlib.import_module(module_name)
+        self.app = getattr(module, attribute or "app")
+        # Create or verify the schema once, before forking, so booting workers only pay
+        # the fingerprint query; an out-of-date schema stops the server here
+        check_schema = getattr(module, "check_schema", None)
+        if check_schema is not None:
+            check_schema()
+        gc.collect()
+        # Move everything allocated so far out of the collector's reach; otherwise the
+        # first collection in each worker touches (and un-shares) every preloaded page
+        gc.freeze()
+        logger.info(
+            f"Preloaded {self.app_path} in {time.perf_counter() - started:.2f}s "
+            f"({gc.get_freeze_count()} objects frozen, loop={event_loop()}, http={http_protocol()})"
+        )
+
+    def bind(self) -> None:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.sock = sock
+        logger.info(f"Listening on http://{self.host}:{sock.getsockname()[1]}")
+
+    def install_signal_handlers(self) -> None:
+        # Signal numbers are written to a pipe and handled in the main loop
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        for fd in (self._wakeup_r, self._wakeup_w):
+            os.set_blocking(fd, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        for sig in self.HANDLED_SIGNALS:
+            signal.signal(sig, lambda signum, frame: None)
+
+    # Workers
+
+    def spawn(self) -> Worker:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            self._run_worker(ready_w)
+        os.close(ready_w)
+        worker = self.workers[pid] = Worker(pid, ready_r)
+        logger.info(f"Booting worker {pid}")
+        return worker
+
+    def _run_worker(self, ready_fd: int) -> None:
+        exit_code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            for sig in self.HANDLED_SIGNALS:
+                signal.signal(sig, signal.SIG_DFL)
+            for worker in self.workers.values():
+                os.close(worker.ready_fd)
+
+            from app.db.pool import dispose_engines
+            dispose_engines()
+
+            config = uvicorn.Config(
+                self.app,
+                loop=event_loop(),
+                http=http_protocol(),
+                lifespan="on",
+                proxy_headers=True,
+                timeout_graceful_shutdown=self.graceful_timeout,
+            )
+            server = WorkerServer(config, ready_fd)
+            server.run(sockets=[self.sock])
+            if not server.started:
+                exit_code = WORKER_BOOT_ERROR
+        except BaseException:
+            logger.exception("Worker crashed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def wait_ready(self, worker: Worker, timeout: float) -> bool:
+        """Wait until the worker accepts connections; False if it died or timed out."""
+        if worker.ready:
+            return True
+        readable, _, _ = select.select([worker.ready_fd], [], [], timeout)
+        if readable and os.read(worker.ready_fd, 1) == b"1":
+            worker.ready = True
+            self._boot_failures = 0
+        return worker.ready
+
+    def retire(self, worker: Worker) -> None:
+        if worker.retire_deadline is None:
+            worker.retire_deadline = time.monotonic() + self.graceful_timeout + 5
+            self._kill(worker.pid, signal.SIGTERM)
+
+    def _kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def active_workers(self) -> List[Worker]:
+        return [worker for worker in self.workers.values() if worker.retire_deadline is None]
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.ready_fd)
+            code = os.waitstatus_to_exitcode(status)
+            if worker.retire_deadline is not None or self.stopping:
+                logger.info(f"Worker {pid} exited ({code})")
+                continue
+            logger.warning(f"Worker {pid} died unexpectedly ({code})")
+            if not worker.ready or code == WORKER_BOOT_ERROR:
+                self._boot_failures += 1
+
+    def maintain(self) -> None:
+        """Start or retire workers so that the active count matches the target."""
+        active = self.active_workers()
+        if len(active) > self.target:
+            for worker in sorted(active, key=lambda w: w.started)[: len(active) - self.target]:
+                self.retire(worker)
+            return
+        if len(active) < self.target:
+            if self._boot_failures >= 5:
+                logger.error("Workers keep failing to boot; shutting down")
+                self.stopping = True
+                return
+            if self._boot_failures:
+                time.sleep(min(2 ** self._boot_failures, 10))
+            for _ in range(self.target - len(active)):
+                self.spawn()
+
+    def rolling_restart(self) -> None:
+        logger.info("Rolling restart")
+        for old in sorted(self.active_workers(), key=lambda w: w.started):
+            new = self.spawn()
+            if not self.wait_ready(new, self.boot_timeout):
+                logger.error(f"Replacement worker {new.pid} did not start; aborting rolling restart")
+                self.retire(new)
+                return
+            self.retire(old)
+        logger.info("Rolling restart complete")
+
+    def report_memory(self) -> None:
+        from app.core.metrics import process_memory
+        master = process_memory()
+        lines = [f"master {master['pid']}: rss={format_bytes(master['rss_bytes'])}"]
+        total_private = 0
+        for worker in sorted(self.workers.values(), key=lambda w: w.started):
+            memory = process_memory(worker.pid)
+            total_private += memory["private_bytes"] or 0
+            state = "retiring" if worker.retire_deadline is not None else ("ready" if worker.ready else "booting")
+            lines.append(
+                f"worker {worker.pid} ({state}): rss={format_bytes(memory['rss_bytes'])} "
+                f"private={format_bytes(memory['private_bytes'])}"
+            )
+        lines.append(f"workers total private={format_bytes(total_private)}")
+        logger.info("Memory: " + "; ".join(lines))
+
+    # Main loop
+
+    def handle_signal(self, sig: int) -> None:
+        if sig in (signal.SIGTERM, signal.SIGINT):
+            logger.info(f"Received {signal.Signals(sig).name}, shutting down")
+            self.stopping = True
+        elif sig == signal.SIGHUP:
+            self.rolling_restart()
+        elif sig == signal.SIGTTIN:
+            self.target += 1
+            logger.info(f"Increasing workers to {self.target}")
+        elif sig == signal.SIGTTOU:
+            self.target = max(1, self.target - 1)
+            logger.info(f"Decreasing workers to {self.target}")
+        elif sig == signal.SIGUSR1:
+            self.report_memory()
+
+    def run(self) -> int:
+        self.preload()
+        self.bind()
+        self.install_signal_handlers()
+        logger.info(f"Starting {self.target} workers (master pid {os.getpid()})")
+        for _ in range(self.target):
+            self.spawn()
+        for worker in list(self.workers.values()):
+            self.wait_ready(worker, self.boot_timeout)
+
+        next_report = time.monotonic() + self.stats_interval if self.stats_interval else None
+        while not self.stopping:
+            try:
+                readable, _, _ = select.select([self._wakeup_r], [], [], 1.0)
+            except InterruptedError:
+                readable = []
+            if readable:
+                try:
+                    signals = os.read(self._wakeup_r, 64)
+                except BlockingIOError:
+                    signals = b""
+                for sig in signals:
+                    if sig != signal.SIGCHLD:
+                        self.handle_signal(sig)
+            self.reap()
+            for worker in list(self.workers.values()):
+                if not worker.ready:
+                    self.wait_ready(worker, 0)
+                if worker.retire_deadline is not None and time.monotonic() > worker.retire_deadline:
+                    logger.warning(f"Worker {worker.pid} did not exit in time; killing it")
+                    self._kill(worker.pid, signal.SIGKILL)
+            if not self.stopping:
+                self.maintain()
+            if next_report is not None and time.monotonic() >= next_report:
+                self.report_memory()
+                next_report = time.monotonic() + self.stats_interval
+
+        return self.shutdown()
+
+    def shutdown(self) -> int:
+        for worker in self.workers.values():
+            self._kill(worker.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for worker in list(self.workers.values()):
+            logger.warning(f"Killing worker {worker.pid}")
+            self._kill(worker.pid, signal.SIGKILL)
+        self.reap()
+        if self.sock is not None:
+            self.sock.close()
+        logger.info("Shutdown complete")
+        return 1 if self._boot_failures >= 5 else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the API with preloaded, pre-forked uvicorn workers.")
+    parser.add_argument("--app", default="app.main:app", help="Application import path")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Defaults to WEB_CONCURRENCY or CPU count")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")))
+    parser.add_argument("--boot-timeout", type=int, default=60)
+    parser.add_argument("--stats-interval", type=int, default=int(os.getenv("WORKER_STATS_INTERVAL", "0")),
+                        help="Log per-worker memory every N seconds (0 disables)")
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+    from app.core.logging_config import configure_logging
+
+    configure_logging(settings.LOG_DIR or None)
+    master = Master(
+        args.app, args.host, args.port, max(1, args.workers),
+        graceful_timeout=args.graceful_timeout,
+        boot_timeout=args.boot_timeout,
+        stats_interval=args.stats_interval,
+    )
+    return master.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
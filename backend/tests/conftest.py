@@ -0,0 +1,61 @@
+import os
+import tempfile
+from typing import Any, Dict, List
+
+# Must be set before app.core.config is imported so Settings picks them up
+os.environ.setdefault("TESTING", "True")
+os.environ.setdefault("SNAPSHOT_DIR", tempfile.mkdtemp(prefix="snapshots-"))
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware import Middleware
+
+from app.db import session
+from app.db.base_class import Base
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+class Database:
+    """A throwaway SQLite database; ``statements`` records the SQL run on it."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        self.statements: List[str] = []
+        event.listen(engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def add(self, *rows: Any) -> None:
+        """Commit ``rows``, then forget the statements that took."""
+        with self.SessionLocal() as db:
+            db.add_all(rows)
+            db.commit()
+        self.statements.clear()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Database:
+    """A fresh database that the app's own ``get_db`` hands out sessions for."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Profile.__table__, Project.__table__])
+    db = Database(engine)
+    monkeypatch.setattr(session, "SessionLocal", db.SessionLocal)
+    yield db
+    engine.dispose()
+
+
+@pytest.fixture
+def make_client(database):
+    """Build a TestClient for ``routers`` ({prefix: router}) on top of ``database``."""
+
+    def make(routers: Dict[str, APIRouter], *middleware: Middleware) -> TestClient:
+        app = FastAPI(middleware=list(middleware))
+        for prefix, router in routers.items():
+            app.include_router(router, prefix=prefix)
+        return TestClient(app)
+
+    return make
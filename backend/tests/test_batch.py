@@ -0,0 +1,51 @@
+import pytest
+
+from app.api.v1.routes import batch, profile, projects
+from app.db import session
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(
+        Profile(name="Ishu Raj", email="ishu@example.com", title="Developer", location="India", about="Hi"),
+        *[Project(title=f"Project {i}", skills=["python"]) for i in range(10)],
+    )
+    return make_client({
+        "/api/v1/profile": profile.router,
+        "/api/v1/projects": projects.router,
+        "/api/v1/batch": batch.router,
+    })
+
+
+def test_multi_get_uses_one_query_and_reports_missing(client, database):
+
+    response = client.get("/api/v1/projects/", params={"ids": "9,1,42,5,1"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["id"] for p in data["items"]] == [9, 1, 5]
+    assert data["missing"] == [42]
+    assert len([s for s in database.statements if " IN " in s.upper()]) == 1
+
+    data = client.get("/api/v1/projects/", params={"ids": "2,3", "fields": "title"}).json()
+    assert data["items"] == [{"id": 2, "title": "Project 1"}, {"id": 3, "title": "Project 2"}]
+
+    assert client.get("/api/v1/projects/", params={"ids": "1,abc"}).status_code == 400
+
+
+def test_batch_shares_one_session(client):
+    started = session._session_stats["started"]
+    response = client.post("/api/v1/batch/", json={"requests": [
+        {"id": "me", "path": "/api/v1/profile/"},
+        {"id": "projects", "path": "/api/v1/projects?ids=1,2"},
+        {"path": "/api/v1/projects/999"},
+        {"path": "/docs"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert results[0]["id"] == "me" and results[0]["body"]["name"] == "Ishu Raj"
+    assert [p["id"] for p in results[1]["body"]["items"]] == [1, 2]
+    assert results[2]["status"] == 404
+    assert results[3]["status"] == 400 and results[3]["body"]["error_code"] == "invalid_path"
+    assert session._session_stats["started"] - started == 1
@@ -0,0 +1,42 @@
+from benchmarks.cases import CASES, Context, dataset
+from benchmarks.harness import compare, load_results, measure, save_results
+
+
+def test_every_case_runs_against_a_seeded_dataset(tmp_path):
+    context = Context(200, dataset(200, seed=3, directory=tmp_path, workers=1), seed=3)
+    try:
+        results = {
+            f"200/{name}": measure(factory(context), min_time=0, min_ops=2, warmup=1)
+            for name, factory in CASES
+        }
+    finally:
+        context.close()
+
+    assert len(results) == len(CASES)
+    assert all(result["ops"] >= 2 and result["median_us"] > 0 for result in results.values())
+
+    path = tmp_path / "results.json"
+    save_results(path, results, {"sizes": [200]})
+    stored = load_results(path)
+    assert stored["results"] == results
+    assert stored["meta"]["sizes"] == [200]
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {"results": {
+        "a": {"median_us": 100.0, "p95_us": 150.0},
+        "b": {"median_us": 100.0, "p95_us": 150.0},
+        "gone": {"median_us": 1.0, "p95_us": 1.0},
+    }}
+    current = {"results": {
+        "a": {"median_us": 109.0, "p95_us": 300.0},
+        "b": {"median_us": 125.0, "p95_us": 150.0},
+        "new": {"median_us": 1.0, "p95_us": 1.0},
+    }}
+
+    rows, missing, added = compare(baseline, current, threshold=0.10)
+    assert {row["name"]: row["regression"] for row in rows} == {"a": False, "b": True}
+    assert missing == ["gone"] and added == ["new"]
+
+    rows, _, _ = compare(baseline, current, threshold=0.10, metric="p95_us")
+    assert {row["name"]: row["regression"] for row in rows} == {"a": True, "b": False}
@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from app.api.v1.routes import projects
+from app.core.cache_policy import (
+    ROUTE_POLICIES, CachePolicy, CachePolicyMiddleware, LocalPurger, Purger,
+    configure_purging, disable_purging, load_purger,
+)
+from app.core.compression import CompressionMiddleware
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(Project(title="Portfolio", skills=["react"]), Project(title="Shop API", skills=["python"]))
+    return make_client(
+        {"/api/v1/projects": projects.router},
+        Middleware(CachePolicyMiddleware),
+        Middleware(CompressionMiddleware, cached_paths=["/api/v1/projects"]),
+    )
+
+
+def test_reads_get_route_policy_and_writes_purge_their_keys(client, database):
+    purger = configure_purging(LocalPurger())
+    try:
+        # The second list read is served from the response cache and is tagged all the same
+        for _ in range(2):
+            listed = client.get("/api/v1/projects/", headers={"Accept-Encoding": "gzip"})
+            assert listed.headers["cache-control"] == "public, max-age=60, s-maxage=600, stale-while-revalidate=60, stale-if-error=86400"
+            assert listed.headers["surrogate-key"] == "projects"
+            assert listed.headers["vary"] == "Accept-Encoding"
+        assert client.get("/api/v1/projects/2").headers["surrogate-key"] == "project-2"
+        missing = client.get("/api/v1/projects/99")
+        assert missing.status_code == 404 and "cache-control" not in missing.headers
+        assert purger.take() == []
+
+        created = client.post("/api/v1/projects/", json={"title": "Search", "skills": ["python"]})
+        assert created.status_code in (200, 201) and "surrogate-key" not in created.headers
+        assert client.put("/api/v1/projects/1", json={"title": "Portfolio v2"}).status_code == 200
+        database.add(Profile(name="Ada", email="ada@example.com"))
+        new_id = created.json()["id"]
+        assert purger.take() == [
+            "projects", f"project-{new_id}", "portfolio",
+            "projects", "project-1", "portfolio",
+            "profile", "portfolio",
+        ]
+    finally:
+        disable_purging()
+    client.put("/api/v1/projects/1", json={"title": "Portfolio v3"})
+    assert purger.take() == []
+
+
+def test_custom_policies_and_purger_loading():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int, response: Response):
+        if item_id == 0:
+            response.headers["Cache-Control"] = "no-store"
+        return {"id": item_id}
+
+    policies = {"/items/{item_id:int}": CachePolicy(max_age=5, vary=("Accept-Language",), surrogate_keys=("items", "item-{item_id}"))}
+    app.add_middleware(CachePolicyMiddleware, policies=policies)
+    client = TestClient(app)
+
+    tagged = client.get("/items/7")
+    assert tagged.headers["cache-control"] == "public, max-age=5"
+    assert tagged.headers["vary"] == "Accept-Language"
+    assert tagged.headers["surrogate-key"] == "items item-7"
+    # A route that chose its own Cache-Control keeps it
+    assert client.get("/items/0").headers["cache-control"] == "no-store"
+    assert "surrogate-key" not in client.get("/items/0").headers
+
+    assert load_purger("") is None
+    assert isinstance(load_purger("local"), LocalPurger)
+    assert isinstance(load_purger("app.core.cache_policy:LocalPurger"), LocalPurger)
+    with pytest.raises(TypeError):
+        Purger()
+    # Every profile route carries the projects key, like the profile list
+    assert all("projects" in policy.surrogate_keys for path, policy in ROUTE_POLICIES.items() if path.startswith("/api/v1/profile"))
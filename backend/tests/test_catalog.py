@@ -0,0 +1,92 @@
+import pytest
+
+from app.api.v1.routes import projects
+from app.core import catalog
+from app.db.change_log import disable_change_log, enable_change_log
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(
+        Project(title="Portfolio", skills=["React", "Python"], is_featured=True),
+        Project(title="Shop API", skills=["python", "postgresql"], status="archived"),
+        Project(title="Tasks", skills=["nodejs"]),
+    )
+    return make_client({"/projects": projects.router})
+
+
+def test_reads_are_served_from_memory_and_writes_swap_in_a_new_snapshot(client, database):
+    SessionLocal, statements = database.SessionLocal, database.statements
+    project_catalog = catalog.configure_catalog(SessionLocal, max_bytes=10 * 1024 * 1024, ttl=0)
+    project_catalog.load()
+    try:
+        statements.clear()
+        assert [p["title"] for p in client.get("/projects/").json()] == ["Portfolio", "Shop API", "Tasks"]
+        assert [p["title"] for p in client.get("/projects/", params={"skill": "PYTH"}).json()] == ["Portfolio", "Shop API"]
+        assert [p["id"] for p in client.get("/projects/", params={"skill": "python", "skip": 1}).json()] == [2]
+        assert [p["id"] for p in client.get("/projects/", params={"featured": False, "status": "active"}).json()] == [3]
+        assert client.get("/projects/", params={"fields": "title", "limit": 1}).json() == [{"id": 1, "title": "Portfolio"}]
+        assert client.get("/projects/2").json()["skills"] == ["python", "postgresql"]
+        assert client.get("/projects/99").status_code == 404
+        assert statements == []
+
+        before = catalog.get_catalog()
+        created = client.post("/projects/", json={"title": "Search", "skills": ["Python"], "metadata": {"a": 1}})
+        assert created.status_code == 201
+        new_id = created.json()["id"]
+        assert client.put("/projects/1", json={"title": "Portfolio v2"}).status_code == 200
+        assert client.delete("/projects/3").status_code == 200
+        # Commits only queue the changes; the rows are re-read off the committing thread
+        assert project_catalog.wait_idle(timeout=10)
+
+        # The old snapshot is untouched; readers holding it keep a consistent view
+        assert len(before) == 3 and before.get(1).title == "Portfolio"
+        statements.clear()
+        assert [p["title"] for p in client.get("/projects/").json()] == ["Portfolio v2", "Shop API", "Search"]
+        assert client.get(f"/projects/{new_id}").json()["metadata"] == {"a": 1}
+        assert client.get("/projects/3").status_code == 404
+        assert statements == []
+    finally:
+        catalog.disable_catalog()
+
+
+def test_catalog_over_its_memory_cap_falls_back_to_the_database(client, database):
+    SessionLocal, statements = database.SessionLocal, database.statements
+    project_catalog = catalog.configure_catalog(SessionLocal, max_bytes=1024, ttl=0)
+    try:
+        assert project_catalog.load() is None
+        assert project_catalog.stats()["over_cap"] == 1 and catalog.get_catalog() is None
+
+        statements.clear()
+        assert [p["title"] for p in client.get("/projects/", params={"skill": "python"}).json()] == ["Portfolio", "Shop API"]
+        assert statements
+    finally:
+        catalog.disable_catalog()
+
+
+def test_patched_snapshots_match_a_full_build_and_other_workers_sync_from_the_change_log(client, database):
+    SessionLocal = database.SessionLocal
+    enable_change_log(database.engine)
+    # Two workers: "this" one receives its own commits, the "other" one only sees the change log
+    this = catalog.configure_catalog(SessionLocal, max_bytes=10 * 1024 * 1024, ttl=0, sync_interval=0.01)
+    other = catalog.ProjectCatalog(SessionLocal, max_bytes=10 * 1024 * 1024, ttl=0, sync_interval=0.01)
+    try:
+        this.load()
+        other.load()
+        assert client.put("/projects/1", json={"skills": ["Go"], "is_featured": False}).status_code == 200
+        assert client.post("/projects/", json={"title": "Search", "skills": ["python"], "is_featured": True}).status_code == 201
+        assert client.delete("/projects/2").status_code == 200
+
+        assert this.wait_idle(timeout=10)
+        other.sync()
+        for snapshot in (this.current(), other.current()):
+            full = catalog.CatalogSnapshot(snapshot.ordered, snapshot.loaded_at)
+            assert [record.id for record in snapshot.ordered] == [1, 3, 4]
+            assert (snapshot.featured, snapshot.by_status, snapshot.by_skill) == (full.featured, full.by_status, full.by_skill)
+            assert snapshot.by_skill == {"go": (1,), "nodejs": (3,), "python": (4,)}
+            assert [record.title for record in snapshot.page(skill="py")] == ["Search"]
+        assert other.stats()["syncs"] == 1 and 1 <= this.stats()["updates"] <= 3
+    finally:
+        catalog.disable_catalog()
+        disable_change_log()
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import event
+
+from app.api.v1.routes import changes, projects
+from app.db.change_log import change_log_table, disable_change_log, enable_change_log, seed_change_log
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(Project(title="Portfolio", skills=["react"]), Project(title="Shop API", skills=["python"]))
+    return make_client({"/projects": projects.router, "/changes": changes.router})
+
+
+def test_feed_returns_only_rows_changed_since_a_version(client, database):
+    engine, SessionLocal = database.engine, database.SessionLocal
+    assert client.get("/changes/").status_code == 503
+    enable_change_log(engine)
+    try:
+        # Rows that predate the log are seeded as creates
+        first = client.get("/changes/", params={"since": 0}).json()
+        assert [(c["resource"], c["id"], c["op"]) for c in first["changes"]] == [("projects", 1, "create"), ("projects", 2, "create")]
+        assert first["has_more"] is False
+        # Another worker starting up (or seeding concurrently) adds nothing
+        enable_change_log(engine)
+        with engine.begin() as connection:
+            seed_change_log(connection)
+        assert client.get("/changes/", params={"since": 0}).json() == first
+        since = first["version"]
+        assert client.get("/changes/", params={"since": since}).json() == {"changes": [], "version": since, "has_more": False}
+
+        created = client.post("/projects/", json={"title": "Search", "skills": ["python"]}).json()
+        assert client.put("/projects/1", json={"title": "Portfolio v2"}).status_code == 200
+        assert client.put("/projects/1", json={"status": "archived"}).status_code == 200
+        assert client.delete("/projects/2").status_code == 200
+        with SessionLocal() as db:
+            db.add(Profile(name="Ada", email="ada@example.com"))
+            db.commit()
+            db.add(Project(title="Rolled back"))
+            db.rollback()
+
+        feed = client.get("/changes/", params={"since": since}).json()
+        # One entry per row, in version order: project 1's two updates were compacted into one
+        assert [(c["resource"], c["id"], c["op"]) for c in feed["changes"]] == [
+            ("projects", created["id"], "create"),
+            ("projects", 1, "update"),
+            ("projects", 2, "delete"),
+            ("profiles", 1, "create"),
+        ]
+        versions = [c["version"] for c in feed["changes"]]
+        assert versions == sorted(versions) and versions[0] > since and feed["version"] == versions[-1]
+        assert feed["changes"][1]["data"]["title"] == "Portfolio v2" and feed["changes"][1]["data"]["status"] == "archived"
+        assert feed["changes"][2]["data"] is None
+        assert feed["changes"][3]["data"]["email"] == "ada@example.com"
+
+        # Paging: has_more until the high-water mark catches up
+        page = client.get("/changes/", params={"since": since, "limit": 3}).json()
+        assert page["has_more"] is True and page["version"] == versions[2]
+        rest = client.get("/changes/", params={"since": page["version"], "limit": 3}).json()
+        assert [c["version"] for c in rest["changes"]] == versions[3:] and rest["has_more"] is False
+    finally:
+        disable_change_log()
+
+
+def test_feed_query_uses_the_version_index_and_versions_are_never_reused(client, database):
+    engine, SessionLocal = database.engine, database.SessionLocal
+    enable_change_log(engine)
+    try:
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, params, *args: statements.append((statement, params)))
+        client.get("/changes/", params={"since": 1})
+        statement, params = next((s, p) for s, p in statements if "FROM change_log" in s and "version >" in s)
+        with engine.connect() as connection:
+            plan = " ".join(str(row[-1]) for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params))
+        assert "INTEGER PRIMARY KEY" in plan, plan
+
+        # Updating the newest row twice deletes its entry each time; versions still only grow
+        seen = []
+        for title in ("a", "b", "c"):
+            client.put("/projects/2", json={"title": title})
+            with engine.connect() as connection:
+                seen.append(connection.execute(change_log_table.select().where(change_log_table.c.resource_id == 2)).one().version)
+        assert seen == sorted(set(seen)) and len(seen) == 3
+    finally:
+        disable_change_log()
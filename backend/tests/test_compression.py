@@ -0,0 +1,135 @@
+import threading
+import time
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.db.models.project import Project
+
+calls = {"items": 0}
+
+
+def make_items_client():
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        calls["items"] += 1
+        return [{"id": i, "description": "lorem ipsum " * 20} for i in range(20)]
+
+    @app.get("/other")
+    def other():
+        return {"text": "x" * 2000}
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cached_paths=["/items"])
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("") == "identity"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") == "identity"
+    assert negotiate_encoding("*;q=0.5") in ("br", "gzip")
+
+
+def test_uncached_response_is_compressed():
+    client = make_items_client()
+    response = client.get("/other", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == {"text": "x" * 2000}
+
+
+def test_cached_payload_rendered_once_per_change(database):
+    client = make_items_client()
+    calls["items"] = 0
+    first = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in second.headers
+    assert first.json() == second.json()
+    assert calls["items"] == 1
+
+    etag = second.headers["etag"]
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+
+    # A committed write invalidates the cached payload
+    database.add(Project(title="New", skills=[]))
+
+    client.get("/items")
+    assert calls["items"] == 2
+
+
+
+def make_swr_app(ttl, stale_ttl, stale_if_error):
+    state = {"calls": 0, "failing": False, "gate": threading.Event()}
+    state["gate"].set()
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        state["gate"].wait(5)
+        if state["failing"]:
+            raise HTTPException(status_code=503, detail="database unavailable")
+        state["calls"] += 1
+        return {"render": state["calls"]}
+
+    app.add_middleware(
+        CompressionMiddleware, cached_paths=["/items"], ttl=ttl, stale_ttl=stale_ttl, stale_if_error=stale_if_error
+    )
+    return app, state
+
+
+def cache_of(app) -> CompressionMiddleware:
+    layer = app.middleware_stack
+    while not isinstance(layer, CompressionMiddleware):
+        layer = layer.app
+    return layer
+
+
+def test_stale_entries_are_served_at_once_while_one_refresh_runs():
+    app, state = make_swr_app(ttl=0, stale_ttl=60, stale_if_error=0)
+    with TestClient(app) as client:
+        first = client.get("/items")
+        assert first.json() == {"render": 1} and "warning" not in first.headers
+        cache = cache_of(app)
+
+        # Past the soft expiry: the stale copy is served without waiting, however slow the refresh is
+        state["gate"].clear()
+        started = time.monotonic()
+        stale = [client.get("/items") for _ in range(5)]
+        assert time.monotonic() - started < 1
+        assert all(r.json() == {"render": 1} and r.headers["warning"].startswith("110") for r in stale)
+        assert "age" in stale[0].headers
+        assert cache.stats()["refreshing"] == 1 and state["calls"] == 1
+
+        state["gate"].set()
+        for _ in range(100):
+            if not cache.stats()["refreshing"]:
+                break
+            time.sleep(0.01)
+        # Exactly one background render happened, and its result is what is served next
+        assert state["calls"] == 2
+        assert client.get("/items").json() == {"render": 2}
+
+
+def test_last_good_response_is_served_while_the_origin_fails():
+    app, state = make_swr_app(ttl=0, stale_ttl=0, stale_if_error=60)
+    with TestClient(app) as client:
+        assert client.get("/items").json() == {"render": 1}
+        state["failing"] = True
+        response = client.get("/items")
+        assert response.status_code == 200 and response.json() == {"render": 1}
+        assert response.headers["warning"].startswith("111") and int(response.headers["age"]) >= 0
+        state["failing"] = False
+        response = client.get("/items")
+        assert response.json() == {"render": 2} and "warning" not in response.headers
+
+    # Beyond the stale-if-error limit the error passes through
+    app, state = make_swr_app(ttl=0, stale_ttl=0, stale_if_error=0)
+    with TestClient(app) as client:
+        assert client.get("/items").status_code == 200
+        state["failing"] = True
+        assert client.get("/items").status_code == 503
+        state["failing"] = False
+        assert client.get("/items").json() == {"render": 2}
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import tracemalloc
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.routes import events
+from app.core.events import EventBroadcaster, configure_events, disable_events, get_broadcaster
+from app.db.base_class import Base
+from app.db.change_log import change_log_table, disable_change_log, enable_change_log
+from app.db.models.project import Project
+from app.db.signals import Change
+
+
+def parse(chunk: bytes):
+    """SSE events in ``chunk`` as dicts of their fields; comments are returned as {"comment": ...}."""
+    parsed = []
+    for block in chunk.decode().strip().split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            name, _, value = line.partition(":")
+            fields[name or "comment"] = value.strip()
+        parsed.append(fields)
+    return parsed
+
+
+def test_broadcast_heartbeat_drop_and_resume():
+    async def run():
+        loop = asyncio.get_running_loop()
+        broadcaster = EventBroadcaster(loop, queue_size=3, buffer_size=4, heartbeat=0.05)
+        reader = broadcaster.stream()
+        assert parse(await reader.__anext__()) == [{"retry": "3000"}]
+        slow = broadcaster.stream()
+        await slow.__anext__()
+
+        # Published from a commit in a worker thread, delivered on the loop
+        await asyncio.to_thread(broadcaster.publish, [Change("projects", 1, "update", 7), Change("skills", 1, "create")])
+        [event] = parse(await reader.__anext__())
+        assert event["event"] == "change" and event["id"] == f"{broadcaster.epoch}-1"
+        assert json.loads(event["data"]) == {"resource": "projects", "id": 1, "op": "update", "version": 7}
+        assert parse(await asyncio.wait_for(reader.__anext__(), 1)) == [{"comment": "heartbeat"}]
+
+        # The slow subscriber never reads; a fourth queued event drops it
+        for project_id in (2, 3, 4):
+            broadcaster.publish([Change("projects", project_id, "delete")])
+            await asyncio.sleep(0)
+        assert len(parse(await reader.__anext__())) >= 1
+        await asyncio.sleep(0)
+        broadcaster.publish([Change("projects", 5, "create")])
+        await asyncio.sleep(0)
+        assert broadcaster.stats()["dropped"] == 1
+        assert [item async for item in slow] == []
+
+        # Resume from event 2: events 3..5 are replayed from the buffer
+        resumed = broadcaster.stream(f"{broadcaster.epoch}-2")
+        assert [e.get("id") for e in parse(await resumed.__anext__())] == [None] + [f"{broadcaster.epoch}-{n}" for n in (3, 4, 5)]
+        # Ids from another process or older than the buffer ask the client to resync
+        for stale in ("0abc-3", f"{broadcaster.epoch}-0", "garbage"):
+            replay = broadcaster.stream(stale)
+            assert parse(await replay.__anext__())[-1]["event"] == "reset"
+            await replay.aclose()
+
+        await reader.aclose()
+        await resumed.aclose()
+        assert broadcaster.stats()["subscribers"] == 0
+
+    asyncio.run(run())
+
+
+def test_events_route_streams_committed_changes_with_feed_versions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Project.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+    enable_change_log(engine)
+    app = FastAPI()
+    app.include_router(events.router, prefix="/events")
+
+    def commit_project():
+        with SessionLocal() as db:
+            db.add(Project(title="Streamed", skills=["python"]))
+            db.commit()
+
+    async def run():
+        configure_events(asyncio.get_running_loop(), heartbeat=0)
+        messages = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            await messages.put(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/events/", "raw_path": b"/events/", "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+        }
+        task = asyncio.create_task(app(scope, receive, send))
+        start = await asyncio.wait_for(messages.get(), 5)
+        assert start["status"] == 200 and (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+        await asyncio.wait_for(messages.get(), 5)  # retry:
+
+        await asyncio.to_thread(commit_project)
+        [event] = parse((await asyncio.wait_for(messages.get(), 5))["body"])
+        with engine.connect() as connection:
+            version = connection.execute(change_log_table.select()).one().version
+        assert json.loads(event["data"]) == {"resource": "projects", "id": 1, "op": "create", "version": version}
+
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
+        assert get_broadcaster().stats()["subscribers"] == 0
+
+    try:
+        asyncio.run(run())
+    finally:
+        disable_events()
+        disable_change_log()
+
+
+def test_idle_subscribers_are_cheap():
+    async def run():
+        broadcaster = EventBroadcaster(asyncio.get_running_loop(), heartbeat=0)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        streams = [broadcaster.stream() for _ in range(2000)]
+        for stream in streams:
+            await stream.__anext__()
+        waiting = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+        await asyncio.sleep(0)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / len(streams)
+        tracemalloc.stop()
+
+        broadcaster.publish([Change("projects", 1, "update")])
+        delivered = await asyncio.gather(*waiting)
+        assert len(set(map(id, delivered))) == 1  # Encoded once, shared by every subscriber
+        for stream in streams:
+            await stream.aclose()
+        return per_subscriber
+
+    per_subscriber = asyncio.run(run())
+    # Generator frame, subscriber and its pending future, plus the task waiting on it (~2KiB here)
+    assert per_subscriber < 3072, per_subscriber
+
+
+def test_every_worker_streams_changes_committed_by_any_worker(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'workers.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Project.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+    enable_change_log(engine)
+
+    def commit_project(title):
+        with SessionLocal() as db:
+            db.add(Project(title=title, skills=[]))
+            db.commit()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        # "this" worker receives its own commits from the hub; the "other" one only reads the log
+        this = configure_events(loop, heartbeat=0)
+        other = EventBroadcaster(loop, heartbeat=0)
+        for broadcaster in (this, other):
+            broadcaster.follow_log(SessionLocal, interval=0.05)
+        await asyncio.sleep(0.1)  # Let both read the starting version
+        streams = [this.stream(), other.stream()]
+        for stream in streams:
+            await stream.__anext__()
+
+        await asyncio.to_thread(commit_project, "First")
+        await asyncio.to_thread(commit_project, "Second")
+        for stream in streams:
+            received = []
+            while len(received) < 2:
+                received += parse(await asyncio.wait_for(stream.__anext__(), 5))
+            # Once each, in log order, with the log's versions
+            assert [json.loads(event["data"])["version"] for event in received] == [1, 2]
+            await stream.aclose()
+        other.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        disable_events()
+        disable_change_log()
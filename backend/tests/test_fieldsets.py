@@ -0,0 +1,53 @@
+import pytest
+
+from app.api.v1.routes import profile, projects
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(
+        Profile(name="Ishu Raj", email="ishu@example.com", title="Developer"),
+        *[
+            Project(title=f"Project {i}", description="x" * 1000, skills=["python"], project_metadata={"year": 2024})
+            for i in range(3)
+        ],
+    )
+    return make_client({"/profile": profile.router, "/projects": projects.router})
+
+
+def test_project_fields_are_pushed_down_to_sql(client, database):
+
+    response = client.get("/projects/", params={"fields": "title", "include": "skills"})
+    assert response.status_code == 200
+    assert response.json()[0] == {"id": 1, "title": "Project 0", "skills": ["python"]}
+    select = [s for s in database.statements if s.lstrip().upper().startswith("SELECT")][-1]
+    assert "description" not in select and "metadata" not in select
+
+    response = client.get("/projects/2", params={"fields": "id,metadata"})
+    assert response.json() == {"id": 2, "metadata": {"year": 2024}}
+
+    # A skill filter still works when skills are not part of the selection
+    response = client.get("/projects/", params={"fields": "title", "skill": "py"})
+    assert [p["title"] for p in response.json()] == ["Project 0", "Project 1", "Project 2"]
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/projects/", params={"fields": "title,password"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "invalid_fields"
+    assert response.json()["detail"]["details"]["unknown"] == ["password"]
+
+
+def test_profile_fields_and_include(client):
+    assert client.get("/profile/", params={"fields": "name"}).json() == {"id": 1, "name": "Ishu Raj"}
+
+    data = client.get("/profile/1", params={"fields": "name", "include": "location"}).json()
+    assert set(data) == {"id", "name", "location"}
+    assert [set(row) for row in client.get("/profile/all", params={"fields": "email"}).json()] == [{"id", "email"}]
+
+    # Projects are not embedded in profiles; they are paginated under /projects
+    response = client.get("/profile/1", params={"include": "projects"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["details"]["unknown"] == ["projects"]
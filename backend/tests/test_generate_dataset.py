@@ -0,0 +1,54 @@
+import json
+import sqlite3
+from collections import Counter
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.schemas.profile import ProfileInDBBase
+from app.schemas.project import Project as ProjectSchema
+from scripts.generate_dataset import SKILLS, generate, generate_chunk
+
+
+def dump(path):
+    connection = sqlite3.connect(path)
+    try:
+        return {
+            name: connection.execute(f"SELECT * FROM {name} ORDER BY id").fetchall()
+            for name in ("profiles", "projects")
+        }
+    finally:
+        connection.close()
+
+
+def test_generation_is_deterministic_across_worker_counts(tmp_path):
+    single, pooled = tmp_path / "single.db", tmp_path / "pooled.db"
+    generate(f"sqlite:///{single}", profiles=300, projects=1200, seed=7, workers=1, chunk_size=250, batch_size=100)
+    generate(f"sqlite:///{pooled}", profiles=300, projects=1200, seed=7, workers=2, chunk_size=250, batch_size=100)
+
+    rows = dump(single)
+    assert len(rows["profiles"]) == 300 and len(rows["projects"]) == 1200
+    assert rows == dump(pooled)
+    assert generate_chunk(("projects", 0, 1, 50, 8, 1.1)) != generate_chunk(("projects", 0, 1, 50, 7, 1.1))
+
+    # Rows load through the ORM and validate against the response schemas
+    engine = create_engine(f"sqlite:///{single}")
+    db = sessionmaker(bind=engine)()
+    try:
+        for profile in db.query(Profile).limit(20):
+            ProfileInDBBase.model_validate(profile.to_dict())
+        for project in db.query(Project).limit(20):
+            ProjectSchema.model_validate(project.to_dict())
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_skills_are_zipf_distributed():
+    _, rows = generate_chunk(("projects", 0, 1, 5000, 42, 1.1))
+    counts = Counter(skill for row in rows for skill in json.loads(row["skills"]))
+    ranked = [counts[skill] for skill in SKILLS]
+    assert ranked[0] > 5 * ranked[19] > 0
+    assert sum(ranked[:10]) > sum(ranked[10:])
@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.metrics import collect
+from app.crud.profile import get_profile, get_profile_by_email, update_profile
+from app.crud.project import PROJECT_FIELDS, get_project
+from app.db import identity_cache
+from app.db.base_class import Base
+from app.db.identity_cache import configure_identity_cache, disable_identity_cache
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.repositories import profile_repo
+from app.schemas.profile import ProfileUpdate
+from benchmarks.cases import dataset
+from benchmarks.identity_cache import run
+
+
+@pytest.fixture
+def SessionLocal(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'identity.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Profile.__table__, Project.__table__])
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(Profile(name="Ada", email="Ada@Example.com"))
+        db.add_all([Project(title="Portfolio", skills=["react"]), Project(title="Shop", skills=["python"])])
+        db.commit()
+    factory.queries = queries
+    yield factory
+    disable_identity_cache()
+    engine.dispose()
+
+
+def test_lookups_are_served_from_the_cache_until_a_commit_writes_the_row(SessionLocal):
+    cache = configure_identity_cache(max_entries=100, ttl=60)
+    with SessionLocal() as db:
+        assert get_project(db, 1).title == "Portfolio"
+        assert profile_repo.get(db, 1).name == "Ada"
+    # Partial loads are not cached, but a cached row serves any selection
+    with SessionLocal() as db:
+        partial = get_project(db, 2, selection=PROJECT_FIELDS.parse("title", None))
+        assert partial.title == "Shop" and cache.stats()["tables"]["projects"]["puts"] == 1
+
+    SessionLocal.queries.clear()
+    with SessionLocal() as db:
+        project = get_project(db, 1, selection=PROJECT_FIELDS.parse("title", None))
+        assert project in db and project.skills == ["react"]
+        project.skills.append("mutated")
+        assert get_profile(db, 1).email == "Ada@Example.com"
+        # Unique keys are lower-cased; the repository's exact lookup still checks the case
+        assert get_profile_by_email(db, "ada@example.COM").id == 1
+        assert profile_repo.get_by_email(db, "ada@example.com") is None
+        assert profile_repo.get_by_email(db, "Ada@Example.com").id == 1
+    assert SessionLocal.queries == []
+
+    with SessionLocal() as db:
+        assert get_project(db, 1).skills == ["react"]
+        # Cached instances are persistent: updating one writes through and invalidates it
+        update_profile(db, db_obj=get_profile(db, 1), obj_in=ProfileUpdate(email="lovelace@example.com"))
+    with SessionLocal() as db:
+        assert get_profile_by_email(db, "ada@example.com") is None
+        assert get_profile(db, 1).email == "lovelace@example.com"
+        assert profile_repo.get_by_email(db, "lovelace@example.com").id == 1
+
+        # Flushed but uncommitted values are neither served to nor cached from other sessions
+        db.get(Project, 2).title = "Shop v2"
+        db.flush()
+        assert get_project(db, 2).title == "Shop v2"
+        with SessionLocal() as other:
+            assert get_project(other, 2).title == "Shop"
+        db.rollback()
+
+    # The session's own instance keeps its unflushed edits
+    with SessionLocal(autoflush=False) as db:
+        project = db.get(Project, 1)
+        project.title = "Edited"
+        assert get_project(db, 1) is project and project.title == "Edited" and project in db.dirty
+
+    stats = collect()["identity_cache"]
+    assert stats["tables"]["profiles"]["invalidations"] == 1
+    assert stats["tables"]["profiles"]["hits"] >= 5 and stats["tables"]["projects"]["misses"] >= 2
+    disable_identity_cache()
+    SessionLocal.queries.clear()
+    with SessionLocal() as db:
+        assert get_project(db, 1).title == "Portfolio"
+    assert len(SessionLocal.queries) == 1
+
+
+def test_entries_are_bounded_by_size_and_age(SessionLocal, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(identity_cache.time, "monotonic", lambda: now[0])
+    cache = configure_identity_cache(max_entries=2, ttl=30)
+    with SessionLocal() as db:
+        get_project(db, 1)
+        get_profile(db, 1)
+        get_project(db, 1)
+        get_project(db, 2)
+    assert cache.get("profiles", 1) is None and cache.get("projects", 1) is not None
+    assert cache.get_by("profiles", "email", "ada@example.com") is None
+    assert cache.stats()["tables"]["profiles"]["evictions"] == 1
+
+    now[0] += 31
+    assert cache.get("projects", 1) is None
+    assert cache.stats()["tables"]["projects"]["expirations"] == 1
+
+    # A read that overlapped a write is not cached
+    with SessionLocal() as db:
+        generation = cache.generation
+        project = db.get(Project, 1)
+        cache.invalidate([("projects", 2)])
+        assert cache.put(project, generation) is False
+        assert cache.put(project, cache.generation) is True
+
+
+def test_identity_cache_benchmark_reports_hits(tmp_path):
+    results = run(dataset(300, seed=5, directory=tmp_path, workers=1), calls=200, hot=50)
+    assert {name.rsplit(".", 1)[1] for name in results} == {"uncached", "cached"}
+    assert all(stats["median_us"] > 0 for stats in results.values())
+    assert results["identity_cache/get_profile_by_email.cached"]["hit_ratio"] == 1
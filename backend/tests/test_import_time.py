@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for importing app.main (our own modules only), in milliseconds
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "400"))
+
+# Third-party packages are imported first so the measurement only covers app code
+PRELOAD = "import fastapi, fastapi.routing, sqlalchemy.orm, pydantic_settings, email_validator, starlette.staticfiles"
+
+CHECK = """
+import os
+import app.main
+import app.db.session as session
+assert session._engine is None, "engine created at import"
+assert not os.path.exists("logs"), "log directory created at import"
+"""
+
+
+def import_time_ms(cwd, env):
+    """Cumulative `-X importtime` cost of app.main, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{PRELOAD}\n{CHECK}"],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "app.main":
+            return int(fields[1]) / 1000
+    raise AssertionError("app.main missing from -X importtime output")
+
+
+def test_app_import_is_lazy_and_within_budget(tmp_path):
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'import.db'}",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    # Warm the bytecode cache so compilation is not counted
+    import_time_ms(BACKEND_DIR, {**env, "PYTHONDONTWRITEBYTECODE": ""})
+
+    best = min(import_time_ms(tmp_path, env) for _ in range(3))
+    assert best < IMPORT_TIME_BUDGET_MS, f"importing app.main took {best:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)"
+    assert not (tmp_path / "import.db").exists()
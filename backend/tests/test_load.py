@@ -0,0 +1,48 @@
+import asyncio
+import random
+
+import httpx
+
+from app.api.v1.routes import projects
+from app.db.models.project import Project
+from benchmarks.histogram import Histogram
+from benchmarks.load import build_report, generate_load, parse_mix
+
+
+def test_histogram_percentiles_stay_within_one_percent():
+    rng = random.Random(1)
+    values = sorted(int(rng.lognormvariate(8, 1.2)) for _ in range(20000))
+    first, second = Histogram(), Histogram()
+    for index, value in enumerate(values):
+        (first if index % 2 else second).record(value)
+    first.merge(second)
+
+    assert first.count == len(values) and first.max == values[-1] and first.min == values[0]
+    for percent in (50, 95, 99):
+        exact = values[int(len(values) * percent / 100) - 1]
+        assert abs(first.percentile(percent) - exact) <= exact * 0.01
+    assert Histogram.from_dict(first.to_dict()).percentile(99) == first.percentile(99)
+
+
+def test_load_reports_each_endpoint(database, make_client):
+    database.add(*[Project(title=f"Project {i}", skills=["python", "react"][: 1 + i % 2]) for i in range(30)])
+    app = make_client({"/api/v1/projects": projects.router}).app
+    mix = parse_mix("list=2,detail=2,search=1,write=1")
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await generate_load(client, mix, concurrency=4, duration=0.5)
+
+    stats, elapsed = asyncio.run(run())
+    report = build_report(stats, elapsed, {"target": "test"})
+
+    assert set(report["endpoints"]) == {"list", "detail", "search", "write"}
+    for name, endpoint in report["endpoints"].items():
+        assert endpoint["requests"] > 0
+        assert 0 < endpoint["latency_ms"]["p50"] <= endpoint["latency_ms"]["p99"] <= endpoint["latency_ms"]["max"]
+        assert endpoint["errors"] == 0, endpoint["statuses"]
+    write = report["endpoints"]["write"]
+    assert write["statuses"] == {"201": write["requests"]}
+    assert report["totals"]["requests"] == sum(e["requests"] for e in report["endpoints"].values())
+    assert set(report["results"]) == {"load/list", "load/detail", "load/search", "load/write"}
@@ -0,0 +1,92 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.main import app
+
+
+def test_instrumented_pool_counts_checkouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    with engine.connect() as first:
+        first.execute(text("SELECT 1"))
+        with engine.connect() as second:
+            second.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+
+    stats = engine.pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["peak_checked_out"] == 2
+    assert stats["peak_overflow"] == 1
+    assert stats["wait_ms_max"] >= 0
+
+
+def test_metrics_and_health_expose_pool_stats():
+    with TestClient(app) as client:
+        metrics = client.get("/api/v1/metrics/").json()
+        assert metrics["threadpool"]["configured"] is True
+        assert "session" in metrics["db_pool"]
+        # The shared engine is sized by DB_POOL_SIZE/DB_MAX_OVERFLOW
+        assert metrics["db_pool"]["session"]["size"] == settings.DB_POOL_SIZE
+        assert metrics["db_pool"]["session"]["max_overflow"] == settings.DB_MAX_OVERFLOW
+
+        health = client.get("/api/v1/health/").json()
+        assert health["status"] == "ok"
+        assert "in_flight" in health["threadpool"]
+        assert "checked_out" in health["db_pool"]["session"]
+
+
+def test_sessions_are_created_by_the_first_query(tmp_path, monkeypatch):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from app.db import session
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'lazy.db'}", poolclass=InstrumentedQueuePool, pool_size=1,
+                           connect_args={"check_same_thread": False})
+    closed_on_loop = []
+
+    class RecordingSession(Session):
+        def close(self):
+            try:
+                asyncio.get_running_loop()
+                closed_on_loop.append(True)
+            except RuntimeError:
+                closed_on_loop.append(False)
+            super().close()
+
+    monkeypatch.setattr(session, "SessionLocal", sessionmaker(bind=engine, class_=RecordingSession))
+    lazy_app = FastAPI()
+    seen = []
+
+    @lazy_app.get("/cached")
+    def cached(db=Depends(session.get_db)):
+        seen.append(db)
+        return {"cached": True}
+
+    @lazy_app.get("/query")
+    def query(db=Depends(session.get_db)):
+        seen.append(db)
+        return {"value": db.execute(text("SELECT 1")).scalar(), "checked_out": engine.pool.stats()["checked_out"]}
+
+    client = TestClient(lazy_app)
+    assert client.get("/cached").json() == {"cached": True}
+    assert not seen[-1].started and engine.pool.stats()["checkouts"] == 0
+
+    # The connection is held while the route queries and back in the pool once the response is out
+    assert client.get("/query").json() == {"value": 1, "checked_out": 1}
+    assert seen[-1].started
+    stats = engine.pool.stats()
+    assert stats["checkouts"] == 1 and stats["checked_out"] == 0
+    # Closed in a worker thread, not on the event loop
+    assert closed_on_loop == [False]
@@ -0,0 +1,38 @@
+import pytest
+
+from app.api.v1.routes import portfolio
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(
+        Profile(name="Ishu Raj", email="ishu@example.com"),
+        *[Project(title=f"Project {i}", skills=["Python", "FastAPI"] if i % 2 else ["python"]) for i in range(150)],
+    )
+    return make_client({"/portfolio": portfolio.router})
+
+
+def test_portfolio_pages_projects_with_a_fixed_query_count(client, database):
+    response = client.get("/portfolio/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["profile"]["name"] == "Ishu Raj"
+    assert len(data["projects"]) == 100 and data["total_projects"] == 150
+    # Skill counts cover every project, not just the page
+    assert data["skills"] == [{"name": "python", "count": 150}, {"name": "fastapi", "count": 75}]
+    assert len([s for s in database.statements if s.lstrip().upper().startswith("SELECT")]) == 3
+
+    data = client.get("/portfolio/", params={"skip": 140, "limit": 20}).json()
+    assert [p["title"] for p in data["projects"]] == [f"Project {i}" for i in range(140, 150)]
+    assert client.get("/portfolio/", params={"limit": 101}).status_code == 422
+
+
+def test_portfolio_reflects_writes(client, database):
+    client.get("/portfolio/")
+    database.add(Project(title="New project", skills=["rust"]))
+
+    data = client.get("/portfolio/", params={"skip": 150}).json()
+    assert [p["title"] for p in data["projects"]] == ["New project"] and data["total_projects"] == 151
+    assert {"name": "rust", "count": 1} in data["skills"]
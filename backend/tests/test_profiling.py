@@ -0,0 +1,85 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes import debug
+from app.core.config import settings
+from app.core.profiling import ProfileStore, ProfilingMiddleware, get_profile_store
+
+TOKEN = "s3cret"
+
+
+def slow_search():
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def build_app(store: ProfileStore) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    def slow():
+        return {"total": slow_search()}
+
+    app.include_router(debug.router, prefix="/api/v1/debug")
+    app.dependency_overrides[get_profile_store] = lambda: store
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, store=store, interval=0.001)
+    return app
+
+
+def test_admin_profile_is_captured_listed_and_downloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", TOKEN)
+    store = ProfileStore(str(tmp_path), size=2)
+    client = TestClient(build_app(store))
+
+    # Normal requests are not profiled
+    response = client.get("/slow")
+    assert response.status_code == 200 and "x-profile-id" not in response.headers
+    # Asking without the admin token is ignored: the request is served, unprofiled
+    for response in (
+        client.get("/slow", headers={"X-Profile": "1"}),
+        client.get("/slow?_profile=1", headers={"X-Admin-Token": "wrong"}),
+    ):
+        assert response.status_code == 200 and "x-profile-id" not in response.headers
+    # Only the exact _profile parameter asks for a profile
+    for query in ("no_profile=1", "_profile=10", "q=_profile%3D1"):
+        assert client.get(f"/slow?{query}", headers={"X-Admin-Token": "wrong"}).status_code == 200
+    assert store.list() == []
+
+    response = client.get("/slow", headers={"X-Profile": "1", "X-Admin-Token": TOKEN})
+    assert response.status_code == 200
+    capture_id = response.headers["x-profile-id"]
+
+    admin = {"X-Admin-Token": TOKEN}
+    assert client.get("/api/v1/debug/profiles").status_code == 403
+    captures = client.get("/api/v1/debug/profiles", headers=admin).json()
+    assert [capture["id"] for capture in captures] == [capture_id]
+    assert captures[0]["path"] == "/slow" and captures[0]["status"] == 200 and captures[0]["samples"] > 0
+
+    stacks = client.get(f"/api/v1/debug/profiles/{capture_id}", headers=admin)
+    assert stacks.status_code == 200
+    lines = stacks.text.splitlines()
+    # Collapsed stacks: "root;frame;...;frame count", with the sync route sampled in a worker thread
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("worker;") and "slow_search (" in line for line in lines)
+
+    # The ring keeps the newest two captures
+    for _ in range(2):
+        client.get("/slow?_profile=1", headers=admin)
+    ids = [capture["id"] for capture in store.list()]
+    assert len(ids) == 2 and capture_id not in ids
+    assert client.get(f"/api/v1/debug/profiles/{capture_id}", headers=admin).status_code == 404
+    assert client.get("/api/v1/debug/profiles/..%2Fsecrets", headers=admin).status_code == 404
+
+
+def test_middleware_is_only_installed_with_an_admin_token(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert ProfilingMiddleware not in [middleware.cls for middleware in create_app().user_middleware]
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", TOKEN)
+    assert ProfilingMiddleware in [middleware.cls for middleware in create_app().user_middleware]
@@ -0,0 +1,55 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.profile import get_profile_records, get_profiles
+from app.crud.project import PROJECT_FIELDS, get_project_records, get_projects
+from app.db.base_class import Base
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.db.records import select_records
+from benchmarks.cases import dataset
+from benchmarks.readpath import run
+
+
+def test_records_match_the_orm_rows_without_entering_the_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'records.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Profile.__table__, Project.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        db.add(Profile(name="Ishu Raj", email="ishu@example.com", location="Delhi", about="Hi"))
+        db.add_all([
+            Project(title=f"Project {i}", skills=["python"], is_featured=i % 2 == 0, project_metadata={"i": i})
+            for i in range(5)
+        ])
+        db.commit()
+
+    with SessionLocal() as db:
+        records = get_project_records(db, skip=1, limit=3, featured=True)
+        assert len(db.identity_map) == 0
+        assert [record.to_dict() for record in records] == [p.to_dict() for p in get_projects(db, skip=1, limit=3, featured=True)]
+        assert not hasattr(records[0], "__dict__")
+
+        profile = get_profile_records(db)[0]
+        assert profile.to_dict() == get_profiles(db)[0].to_dict()
+
+        # Only the selected columns are read; the others stay unset
+        selection = PROJECT_FIELDS.parse("title", None)
+        sparse = get_project_records(db, limit=2, selection=selection)
+        assert PROJECT_FIELDS.row(sparse[0], selection) == {"id": 1, "title": "Project 0"}
+        assert not hasattr(sparse[0], "description")
+
+    # Rows come back in primary key order unless told otherwise
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with SessionLocal() as db:
+        get_profile_records(db, limit=1)
+        assert f"ORDER BY {Profile.__tablename__}.id" in statements[-1]
+        assert [record.id for record in select_records(db, Project, ["id"], order_by=[Project.id.desc()])] == [5, 4, 3, 2, 1]
+
+
+def test_readpath_benchmark_reports_cpu_and_memory(tmp_path):
+    results = run(dataset(300, seed=5, directory=tmp_path, workers=1), page=50, repeat=3)
+    assert set(results) == {
+        f"readpath/{name}[page=50]" for name in ("projects.orm", "projects.core", "profiles.orm", "profiles.core")
+    }
+    assert all(stats["ops"] == 3 and stats["median_us"] >= 0 and stats["peak_kib"] > 0 for stats in results.values())
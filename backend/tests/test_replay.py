@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.api.v1.routes import projects
+from app.db.models.project import Project
+from benchmarks.replay import build_report, endpoint_label, parse_line, read_log, replay
+
+
+def test_parses_text_and_json_access_logs(tmp_path):
+    text = tmp_path / "api.log"
+    text.write_text(
+        "2024-05-01 12:00:00,100 - app.main - INFO - Incoming request: GET http://testserver/api/v1/projects/?limit=5\n"
+        "2024-05-01 12:00:00,150 - app.main - INFO - Request processed: GET http://testserver/api/v1/projects/?limit=5 Status: 200 Time: 50.00ms\n"
+        "2024-05-01 12:00:01,000 - app.main - INFO - Request processed: POST http://testserver/api/v1/projects/ Status: 201 Time: 8.00ms\n"
+        "2024-05-01 12:00:02,000 - app - ERROR - Something else entirely\n"
+    )
+    structured = tmp_path / "api.json"
+    structured.write_text(json.dumps({
+        "timestamp": "2024-05-01T12:00:00.500", "message": "Request completed",
+        "props": {"method": "GET", "path": "/api/v1/projects/7", "status_code": 404, "response_time_ms": 2.5,
+                  "query_params": {"fields": "id,title"}},
+    }) + "\n")
+
+    first = parse_line(text.read_text().splitlines()[1])
+    assert (first.method, first.target, first.status, first.duration_ms) == ("GET", "/api/v1/projects/?limit=5", 200, 50.0)
+
+    requests, skipped = read_log([text, structured])
+    assert [request.target for request in requests] == ["/api/v1/projects/?limit=5", "/api/v1/projects/7?fields=id%2Ctitle"]
+    # Start times are the logged completion times minus the duration
+    assert abs((requests[1].started - requests[0].started) - 0.3975) < 1e-6
+    assert skipped == {"method": 1, "excluded": 0}
+    assert endpoint_label("GET", "/api/v1/projects/42?x=1") == "GET /api/v1/projects/{id}"
+
+
+def test_replay_keeps_spacing_and_compares_with_the_log(tmp_path, database, make_client):
+    database.add(*[Project(title=f"Project {i}", skills=["python"]) for i in range(5)])
+    app = make_client({"/api/v1/projects": projects.router}).app
+
+    log = tmp_path / "api.log"
+    lines = []
+    for second, target, status in [(0, "/api/v1/projects/?limit=5", 200), (1, "/api/v1/projects/1", 200),
+                                   (2, "/api/v1/projects/999", 200), (3, "/api/v1/projects/2", 200)]:
+        lines.append(
+            f"2024-05-01 12:00:0{second},010 - app.main - INFO - Request processed: "
+            f"GET http://prod{target} Status: {status} Time: 10.00ms"
+        )
+    log.write_text("\n".join(lines) + "\n")
+    requests, _ = read_log([log])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await replay(client, requests, speed=10)
+
+    started = time.perf_counter()
+    result = asyncio.run(run())
+    # Three seconds of traffic at 10x
+    assert 0.3 <= time.perf_counter() - started < 2
+
+    report = build_report(result, {"speed": 10})
+    detail = report["endpoints"]["GET /api/v1/projects/{id}"]
+    assert detail["original"]["requests"] == detail["replayed"]["requests"] == 3
+    assert detail["original"]["latency_ms"]["p50"] == 10.0
+    # The missing project is a 404 here but was a 200 in the log
+    assert detail["replayed"]["errors"] == 1 and detail["status_mismatches"] == 1
+    assert report["endpoints"]["GET /api/v1/projects/"]["replayed"]["errors"] == 0
+    assert report["totals"]["replayed"]["requests"] == 4
+    assert abs(report["schedule"]["recorded_span_s"] - 3.0) < 1e-6
+    assert set(report["results"]) == {"replay/GET /api/v1/projects/", "replay/GET /api/v1/projects/{id}"}
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine, event, inspect, text
+
+from app.db.base_class import Base
+from app.db.fingerprint import SchemaOutOfDateError, ensure_schema, read_alembic_revision, read_fingerprint
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+def make_engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'fingerprint.db'}", connect_args={"check_same_thread": False})
+
+
+def test_matching_fingerprint_skips_create_and_seed_with_one_query(tmp_path):
+    engine = make_engine(tmp_path)
+    seeded = []
+
+    def seed(db):
+        seeded.append(True)
+        db.add(Project(title="Seeded", skills=["python"]))
+
+    assert ensure_schema(engine, Base.metadata, seed=seed, revisions=["base", "head"]) is True
+    assert {Profile.__tablename__, Project.__tablename__, "schema_fingerprint"} <= set(inspect(engine).get_table_names())
+    assert read_fingerprint(engine)[1] == "head"
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    assert ensure_schema(engine, Base.metadata, seed=seed, revisions=["base", "head"]) is False
+    assert len(statements) == 1
+    assert seeded == [True]
+
+
+def test_changed_metadata_recreates_and_older_revision_fails_fast(tmp_path):
+    engine = make_engine(tmp_path)
+    metadata = MetaData()
+    Table("things", metadata, Column("id", Integer, primary_key=True))
+    assert ensure_schema(engine, metadata, revisions=["r1"]) is True
+
+    # Same revision, new table: created without a migration
+    Table("others", metadata, Column("id", Integer, primary_key=True), Column("name", String(50)))
+    assert ensure_schema(engine, metadata, revisions=["r1"]) is True
+    assert "others" in inspect(engine).get_table_names()
+
+    # The code now expects r2 but the database was last stamped at r1
+    with pytest.raises(SchemaOutOfDateError, match="r1"):
+        ensure_schema(engine, metadata, revisions=["r1", "r2"])
+
+    # A revision this code has never heard of leaves the schema alone
+    assert ensure_schema(engine, metadata, revisions=["r0"]) is False
+
+
+def test_schema_built_from_models_is_stamped_and_survives_new_revisions(tmp_path):
+    engine = make_engine(tmp_path)
+    metadata = MetaData()
+    things = Table("things", metadata, Column("id", Integer, primary_key=True), Column("name", String(50)))
+    assert ensure_schema(engine, metadata, revisions=["r1"]) is True
+    assert read_alembic_revision(engine) == "r1"
+
+    # Databases created before the stamp was written have an empty alembic_version
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM alembic_version"))
+    Index("ix_things_name", things.c.name)
+    Table("others", metadata, Column("id", Integer, primary_key=True))
+    assert ensure_schema(engine, metadata, revisions=["r1", "r2"]) is True
+    assert "others" in inspect(engine).get_table_names()
+    assert [index["name"] for index in inspect(engine).get_indexes("things")] == ["ix_things_name"]
+    assert read_alembic_revision(engine) == "r2"
+    assert ensure_schema(engine, metadata, revisions=["r1", "r2"]) is False
+
+    # Once stamped, a newer revision is left to 'alembic upgrade head', which starts from r2
+    with pytest.raises(SchemaOutOfDateError, match="r2"):
+        ensure_schema(engine, metadata, revisions=["r1", "r2", "r3"])
+
+
+def test_startup_init_seeds_a_fresh_database_once(tmp_path, monkeypatch):
+    from sqlalchemy.orm import Session
+
+    from app.db import init_db, session
+
+    engine = make_engine(tmp_path)
+    monkeypatch.setattr(session, "_engine", engine)
+    assert init_db.init_db() is True
+    with Session(engine) as db:
+        assert db.query(Profile).one().name == "Ishu Raj"
+        assert db.query(Project).count() == 6
+        db.query(Project).delete()
+        db.commit()
+    # Matching fingerprint: nothing is created or seeded again
+    assert init_db.init_db() is False
+    with Session(engine) as db:
+        assert db.query(Project).count() == 0
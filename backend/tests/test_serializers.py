@@ -0,0 +1,63 @@
+import json
+from datetime import datetime
+
+from pydantic import HttpUrl
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+from app.db.records import select_records
+from app.db.serializers import build_serializer, encode_many
+from benchmarks.cases import dataset
+from benchmarks.serializers import legacy_profile_to_dict, legacy_project_to_dict, run
+
+
+def test_generated_serializers_match_the_hand_written_methods(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'serializers.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Profile.__table__, Project.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        db.add(Profile(name='Ishu "IR" Raj', email="ishu@example.com", about="Line\nbreak {braces} é"))
+        db.add_all([
+            Project(title="Portfolio", skills=["react"], github_url="https://github.com/ishu/portfolio", project_metadata={"stars": 3}),
+            Project(title="Shop", skills=[], is_featured=True, project_metadata=None),
+        ])
+        db.commit()
+
+    with SessionLocal() as db:
+        for model, legacy in ((Project, legacy_project_to_dict), (Profile, legacy_profile_to_dict)):
+            rows = db.scalars(select(model)).all()
+            records = select_records(db, model)
+            expected = [legacy(row) for row in rows]
+            assert [row.to_dict() for row in rows] == expected
+            assert [record.to_dict() for record in records] == expected
+            assert json.loads(encode_many(records, type(records[0]).to_json)) == expected
+
+        # status is part of the contract: the project response model has always carried it
+        assert list(db.scalars(select(Project)).first().to_dict()) == [
+            "id", "title", "description", "skills", "github_url", "demo_url", "image_url",
+            "is_featured", "status", "metadata", "created_at", "updated_at",
+        ]
+
+        profile = db.scalars(select(Profile)).one()
+        assert profile.to_dict()["metadata"] == profile.to_dict()["profile_metadata"] == {}
+        assert '"about":"Line\\nbreak {braces} é"' in profile.to_json()
+
+    # Unflushed URL columns may hold Pydantic URLs assigned straight from a schema
+    project = Project(id=7, title="Draft", github_url=HttpUrl("https://github.com/ishu"), created_at=datetime(2024, 5, 1, 12, 30))
+    assert project.to_dict()["github_url"] == "https://github.com/ishu"
+    assert json.loads(project.to_json())["created_at"] == "2024-05-01T12:30:00"
+
+    serializer = build_serializer(Project, keys={"is_featured": "featured"}, exclude=("description", "project_metadata"))
+    assert [field.key for field in serializer.fields][:4] == ["id", "title", "skills", "github_url"]
+    assert json.loads(serializer.to_json(project)) == serializer.to_dict(project)
+    assert "featured" in serializer.to_dict(project) and "metadata" not in serializer.to_dict(project)
+
+
+def test_serializers_benchmark_reports_per_row_cost(tmp_path):
+    results = run(dataset(300, seed=5, directory=tmp_path, workers=1), repeat=1)
+    assert "serializers/project.reflective" in results and "serializers/profile_record.reflective" not in results
+    assert {name.rsplit(".", 1)[1] for name in results} == {"legacy", "reflective", "to_dict", "legacy+dumps", "to_json"}
+    assert all(stats["median_ns_per_row"] > 0 for stats in results.values())
@@ -0,0 +1,63 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("uvicorn")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path="/api/v1/health/"):
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=2) as response:
+                return response.status
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def test_preforked_workers_serve_restart_and_stop(tmp_path):
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'server.db'}",
+        "SNAPSHOTS_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    log = open(tmp_path / "server.log", "w+")
+    server = subprocess.Popen(
+        [sys.executable, "server.py", "--workers", "2", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    try:
+        assert get(port) == 200
+
+        server.send_signal(signal.SIGHUP)
+        server.send_signal(signal.SIGUSR1)
+        time.sleep(3)
+        assert get(port) == 200
+    finally:
+        server.send_signal(signal.SIGTERM)
+        exit_code = server.wait(timeout=60)
+
+    log.seek(0)
+    output = log.read()
+    assert exit_code == 0
+    assert "Rolling restart complete" in output
+    assert output.count("Booting worker") == 4
+    assert "private=" in output
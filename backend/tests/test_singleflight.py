@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.singleflight import CoalescingMiddleware, request_key
+
+
+def build_app(release: threading.Event, calls: list, timeout: float = 5.0):
+    app = FastAPI()
+
+    @app.get("/api/v1/projects/")
+    def read_projects(skill: str = "", page: int = 0):
+        # A sync route: runs in the threadpool while followers wait on the loop
+        calls.append((skill, page))
+        release.wait(5)
+        if skill == "broken":
+            raise HTTPException(status_code=503, detail="database unavailable")
+        if skill == "crash":
+            raise RuntimeError("boom")
+        return {"skill": skill, "page": page, "call": len(calls)}
+
+    app.add_middleware(CoalescingMiddleware, paths=["/api/v1/projects"], timeout=timeout)
+    return app
+
+
+def find_middleware(app: FastAPI) -> CoalescingMiddleware:
+    app.middleware_stack = app.build_middleware_stack()
+    layer = app.middleware_stack
+    while not isinstance(layer, CoalescingMiddleware):
+        layer = layer.app
+    return layer
+
+
+async def burst(app, urls, release, middleware, expected_followers, headers=None):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        requests = [asyncio.ensure_future(client.get(url, headers=headers)) for url in urls]
+        for _ in range(200):
+            if middleware.flights.stats()["coalesced"] >= expected_followers:
+                break
+            await asyncio.sleep(0.005)
+        release.set()
+        return await asyncio.gather(*requests)
+
+
+def test_identical_concurrent_reads_share_one_call():
+    release, calls = threading.Event(), []
+    app = build_app(release, calls)
+    middleware = find_middleware(app)
+    urls = ["/api/v1/projects/?skill=python&page=1", "/api/v1/projects?page=1&skill=python"] * 10 + ["/api/v1/projects/?skill=go"]
+
+    responses = asyncio.run(burst(app, urls, release, middleware, expected_followers=19))
+    assert sorted(calls) == [("go", 0), ("python", 1)]
+    shared = [r.json() for r in responses[:-1]]
+    assert all(r.status_code == 200 for r in responses) and all(body == shared[0] for body in shared)
+    assert responses[-1].json()["skill"] == "go"
+    assert middleware.flights.stats() == {"leaders": 2, "coalesced": 19, "timeouts": 0, "errors": 0, "in_flight": 0}
+
+    # Credentials are never shared
+    release.clear()
+    calls.clear()
+    asyncio.run(burst(app, ["/api/v1/projects/"] * 3, release, middleware, expected_followers=0, headers={"Authorization": "x"}))
+    assert len(calls) == 3
+
+
+def test_errors_propagate_and_slow_leaders_time_out():
+    assert request_key({"method": "GET", "path": "/a/", "query_string": b"b=2&a=1&a=0"}) == ("GET", "/a", (("a", "0"), ("a", "1"), ("b", "2")))
+
+    release, calls = threading.Event(), []
+    app = build_app(release, calls)
+    middleware = find_middleware(app)
+    responses = asyncio.run(burst(app, ["/api/v1/projects/?skill=broken"] * 5, release, middleware, expected_followers=4))
+    assert len(calls) == 1 and {r.status_code for r in responses} == {503}
+    assert all(r.json() == {"detail": "database unavailable"} for r in responses)
+
+    release.clear()
+    responses = asyncio.run(burst(app, ["/api/v1/projects/?skill=crash"] * 3, release, middleware, expected_followers=6))
+    assert len(calls) == 2 and {r.status_code for r in responses} == {500}
+    assert middleware.flights.stats()["errors"] == 1
+
+    # Followers stop waiting for a stuck leader and run the request themselves
+    release, calls = threading.Event(), []
+    app = build_app(release, calls, timeout=0.05)
+    middleware = find_middleware(app)
+
+    async def stuck_leader():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            leader = asyncio.ensure_future(client.get("/api/v1/projects/?skill=slow"))
+            await asyncio.sleep(0.05)
+            followers = asyncio.gather(*(client.get("/api/v1/projects/?skill=slow") for _ in range(3)))
+            await asyncio.sleep(0.3)
+            release.set()
+            return [await leader] + await followers
+
+    responses = asyncio.run(stuck_leader())
+    assert len(calls) == 4 and all(r.status_code == 200 for r in responses)
+    assert middleware.flights.stats()["timeouts"] == 3
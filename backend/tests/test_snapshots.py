@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from app.api.v1.routes import profile, projects
+from app.core import snapshots
+from app.db.models.profile import Profile
+from app.db.models.project import Project
+
+
+@pytest.fixture
+def client(database, make_client):
+    database.add(
+        Profile(name="Ishu Raj", email="ishu@example.com", title="Developer", location="India", about="Builds things"),
+        *[Project(title=f"Project {i}", skills=["python"]) for i in range(3)],
+    )
+    return make_client({"/profile": profile.router, "/projects": projects.router})
+
+
+def test_generate_writes_content_addressed_files(client, database, tmp_path):
+    SessionLocal = database.SessionLocal
+    directory = str(tmp_path / "snapshots")
+    db = SessionLocal()
+    manifest = snapshots.generate_snapshots(db, directory)
+    db.close()
+
+    assert {"profile", "projects", "projects/1", "projects/3"} <= set(manifest)
+    with open(os.path.join(directory, manifest["projects"]["file"])) as f:
+        assert [p["title"] for p in json.load(f)] == ["Project 0", "Project 1", "Project 2"]
+    assert os.path.exists(os.path.join(directory, manifest["profile"]["gzip"]))
+
+
+def test_routes_serve_snapshots_and_fall_back_to_db(client, database, tmp_path):
+    SessionLocal = database.SessionLocal
+    directory = str(tmp_path / "snapshots")
+    writer = snapshots.configure_snapshots(directory, SessionLocal)
+
+    # No snapshot yet: served from the database
+    response = client.get("/projects/1")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    db_payload = response.json()
+    db_profile = client.get("/profile/").json()
+
+    writer.generate()
+    response = client.get("/projects/1")
+    assert response.json() == db_payload
+    # Projects are not embedded in the profile, from either source
+    response = client.get("/profile/")
+    assert "etag" in response.headers and response.json() == db_profile and "projects" not in db_profile
+    response = client.get("/projects/1")
+    etag = response.headers["etag"]
+    assert client.get("/projects/1", headers={"If-None-Match": etag}).status_code == 304
+    for accept_encoding, encoding in [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("gzip; q=0", None),
+        ("br", None),
+    ]:
+        response = client.get("/projects/", headers={"Accept-Encoding": accept_encoding})
+        assert response.headers.get("content-encoding") == encoding
+
+    # A committed write regenerates the snapshots in the background
+    db = SessionLocal()
+    db.get(Project, 1).title = "Renamed"
+    db.commit()
+    db.close()
+    assert writer.wait_idle(timeout=10)
+    response = client.get("/projects/1")
+    assert response.json()["title"] == "Renamed"
+    assert response.headers["etag"] != etag
+
+
+def test_writes_regenerate_only_the_changed_snapshots(client, database, tmp_path, monkeypatch):
+    SessionLocal = database.SessionLocal
+    directory = str(tmp_path / "snapshots")
+    writer = snapshots.configure_snapshots(directory, SessionLocal)
+    writer.generate()
+    before = snapshots.read_manifest(directory)
+
+    # The v1 profile route serves the same payload from the snapshot as from the database
+    response = client.get("/profile/")
+    assert response.headers["etag"] == before["profile"]["etag"]
+    assert response.json()["title"] == "Developer"
+
+    def full_render(db):
+        raise AssertionError("full render after a write")
+    monkeypatch.setattr(snapshots, "render_snapshots", full_render)
+
+    db = SessionLocal()
+    db.get(Project, 2).title = "Renamed"
+    db.delete(db.get(Project, 3))
+    db.commit()
+    db.close()
+    assert writer.wait_idle(timeout=10)
+
+    after = snapshots.read_manifest(directory)
+    assert set(after) == set(before) - {"projects/3"}
+    assert after["projects/1"] == before["projects/1"] and after["profile"] == before["profile"]
+    assert after["projects/2"] != before["projects/2"]
+    assert [p["title"] for p in client.get("/projects/").json()] == ["Project 0", "Renamed"]
+    assert client.get("/projects/3").status_code == 404
@@ -5,8 +5,15 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.main import app
+from app.core.config import settings
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))
-    import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
+    if settings.DEBUG:
+        # Single auto-reloading process for local development
+        import uvicorn
+        port = int(os.environ.get("PORT", 8000))
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
+    else:
+        # Preloaded multi-worker server (see server.py)
+        from server import main
+        sys.exit(main())